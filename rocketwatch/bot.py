@@ -11,6 +11,7 @@ from discord.ext.commands import Bot
 from pymongo import AsyncMongoClient
 from pymongo.asynchronous.database import AsyncDatabase
 
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.command_tree import RWCommandTree
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.file import TextFile
@@ -76,6 +77,10 @@ class RocketWatch(Bot):
         await rp.async_init()
         await self._load_plugins()
 
+    async def close(self) -> None:
+        await super().close()
+        chart_renderer.shutdown()
+
     async def sync_commands(self) -> None:
         log.info("Syncing command tree...")
         await self.tree.sync()
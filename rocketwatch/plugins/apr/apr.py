@@ -1,24 +1,22 @@
 import logging
 from datetime import datetime
-from io import BytesIO
 from typing import TypedDict, cast
 
-import matplotlib.axes
-import matplotlib.pyplot as plt
-import numpy as np
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command
 from discord.ext import commands, tasks
-from matplotlib.dates import DateFormatter
-from matplotlib.ticker import FuncFormatter
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
+from rocketwatch.utils.chart_cache import ChartResponse, chart_cache
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed
 from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.shared_w3 import w3
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import plot_node_apr, plot_reth_apr
+
 log = logging.getLogger("rocketwatch.apr")
 
 
@@ -60,6 +58,7 @@ class APR(commands.Cog):
     async def task(self) -> None:
         cursor_block = (await w3.eth.get_block("latest")).get("number", 0)
         log.debug("Starting APR task at block %s", cursor_block)
+        inserted = 0
         while True:
             # get address of rocketNetworkBalances contract at cursor block
             address = await rp.uncached_get_address_by_name(
@@ -105,8 +104,12 @@ class APR(commands.Cog):
                 reth_ratio,
                 effectiveness,
             )
+            inserted += 1
             cursor_block = balance_block - 1
 
+        if inserted:
+            chart_cache.invalidate("reth_apr")
+
     @task.before_loop
     async def before_loop(self) -> None:
         await self.bot.wait_until_ready()
@@ -120,6 +123,16 @@ class APR(commands.Cog):
     async def reth_apr(self, interaction: Interaction) -> None:
         """Show the current rETH APR"""
         await interaction.response.defer(ephemeral=is_hidden(interaction))
+        response = await chart_cache.fetch(
+            "reth_apr", (), ("reth_apr", "db_upkeep"), self._build_reth_apr
+        )
+        (e,) = response.get_embeds()
+        files = response.get_files()
+        if not files:
+            return await interaction.followup.send(embed=e)
+        await interaction.followup.send(embed=e, file=files[0])
+
+    async def _build_reth_apr(self) -> ChartResponse:
         e = Embed()
         e.title = "Current rETH APR"
         e.description = "For some comparisons against other LST: [dune dashboard](https://dune.com/rp_community/lst-comparison)"
@@ -134,7 +147,7 @@ class APR(commands.Cog):
         )
         if len(datapoints) == 0:
             e.description = "No data available yet."
-            return await interaction.followup.send(embed=e)
+            return ChartResponse([e])
 
             # get average meta.NodeFee from db, weighted by meta.NodeOperatorShare
         tmp = await (
@@ -233,65 +246,10 @@ class APR(commands.Cog):
             value=f"{y_7d_virtual[-1]:.2%}",
             inline=False,
         )
-        x_arr = np.array(x)
-        fig, ax1 = plt.subplots()
-        ax2: matplotlib.axes.Axes = ax1.twinx()
-
-        ax2.plot(
-            x_arr,
-            y,
-            marker="+",
-            linestyle="",
-            label="Period Average",
-            alpha=0.6,
-            color="orange",
-        )
-        # ax2.plot(x_arr, y_virtual, marker="x", linestyle="", label="Period Average (Virtual)", alpha=0.4)
-        # ax2.plot(x_arr, y_node_operators, marker="+", linestyle="", label="Node Operator APR", alpha=0.4)
-        ax2.plot(
-            x_arr,
-            y_7d,
-            linestyle="-",
-            label=f"{y_7d_claim:.1f} Day Average",
-            color="orange",
-        )
-        ax2.plot(
-            x_arr,
-            y_7d_virtual,
-            linestyle="-",
-            label=f"{y_7d_claim:.1f} Day Average (Virtual)",
-            color="green",
-        )
-        ax1.plot(
-            x_arr,
-            y_effectiveness,
-            linestyle="--",
-            label="Effectiveness",
-            alpha=0.7,
-            color="royalblue",
+        png = await chart_renderer.render(
+            plot_reth_apr, x, y, y_7d, y_7d_virtual, y_effectiveness, y_7d_claim
         )
 
-        ax1.set_title("Observed rETH APR values")
-        ax1.set_xlabel("Date")
-        ax1.grid(True)
-        ax1.set_xlim(left=x_arr[38])
-        ax1.tick_params(axis="x", rotation=45)
-        ax1.xaxis.set_major_formatter(DateFormatter("%b %d"))
-
-        ax2.yaxis.set_major_formatter(FuncFormatter(lambda x, loc: f"{x:.1%}"))
-        ax1.yaxis.set_major_formatter(FuncFormatter(lambda x, loc: f"{x:.1%}"))
-        ax1.set_ylabel("Effectiveness")
-        ax2.set_ylabel("APR")
-        ax1.set_ylim(top=1)
-        ax1.legend(loc="upper left")
-        ax2.legend(loc="upper right")
-
-        img = BytesIO()
-        fig.tight_layout()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
-
         e.set_image(url="attachment://reth_apr.png")
 
         e.add_field(
@@ -303,7 +261,7 @@ class APR(commands.Cog):
         e.add_field(
             name="Effectiveness", value=f"{y_effectiveness[-1]:.2%}", inline=False
         )
-        await interaction.followup.send(embed=e, file=File(img, "reth_apr.png"))
+        return ChartResponse([e], [("reth_apr.png", png)])
 
     @command()
     async def node_apr(self, interaction: Interaction) -> None:
@@ -435,57 +393,18 @@ class APR(commands.Cog):
             inline=False,
         )
 
-        x_arr = np.array(x)
-        fig, ax1 = plt.subplots()
-
-        ax1.plot(
-            x_arr,
+        file = await chart_renderer.render_file(
+            plot_node_apr,
+            x,
             y_7d_node_operators_leb4,
-            linestyle="-",
-            label=f"{y_7d_claim} Day Average (leb4 {leb4_commission:.0%})",
-            color="orange",
-        )
-        ax1.plot(
-            x_arr,
             y_7d_node_operators_leb8_05,
-            linestyle="--",
-            label=f"{y_7d_claim} Day Average (leb8 5%)",
-            color="red",
-            alpha=0.7,
-        )
-        ax1.plot(
-            x_arr,
             y_7d_node_operators_leb8_14,
-            linestyle="-.",
-            label=f"{y_7d_claim:.1f} Day Average (leb8 14%)",
-            color="red",
-            alpha=0.5,
-        )
-        ax1.plot(
-            x_arr,
             y_7d_solo,
-            linestyle=":",
-            label=f"{y_7d_claim:.1f} Day Average (solo)",
-            color="black",
-            alpha=0.5,
+            y_7d_claim,
+            leb4_commission,
+            filename="no_apr.png",
         )
 
-        ax1.set_title("Observed NO APR values")
-        ax1.grid(True)
-        ax1.set_xlim(left=x_arr[38])
-        ax1.tick_params(axis="x", rotation=0)
-        ax1.set_ylim(bottom=0.02)
-        ax1.xaxis.set_major_formatter(DateFormatter("%m.%d"))
-
-        ax1.yaxis.set_major_formatter(FuncFormatter(lambda x, loc: f"{x:.1%}"))
-        ax1.legend(loc="lower left")
-
-        img = BytesIO()
-        fig.tight_layout()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
-
         e.add_field(
             name="Current Average Effective Commission:",
             value=f"{node_fee:.2%} (Observed pETH Share: {peth_share:.2%})",
@@ -494,7 +413,7 @@ class APR(commands.Cog):
 
         e.set_image(url="attachment://no_apr.png")
 
-        await interaction.followup.send(embed=e, file=File(img, "no_apr.png"))
+        await interaction.followup.send(embed=e, file=file)
 
 
 async def setup(bot: RocketWatch) -> None:
@@ -1,14 +1,17 @@
+import asyncio
 import logging
-from collections.abc import Mapping
 from http import HTTPStatus
 from typing import Any, TypedDict, cast
 
 import aiohttp
 import eth_utils
+from discord.utils import as_chunks
 from eth_typing import BlockNumber
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
+from rocketwatch.utils.beacon_cache import beacon_cache
+from rocketwatch.utils.block_cache import block_cache
 from rocketwatch.utils.block_time import ts_to_block
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.embeds import CustomColors, Embed, el_explorer_url, format_value
@@ -19,6 +22,7 @@ from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.sea_creatures import get_sea_creature_for_address
 from rocketwatch.utils.shared_w3 import bacon, w3
 from rocketwatch.utils.solidity import beacon_block_to_date, date_to_beacon_block
+from rocketwatch.utils.validator_registry import validator_registry
 
 
 class ExecutionPayload(TypedDict):
@@ -79,6 +83,7 @@ class BeaconEvents(EventPlugin):
     def __init__(self, bot: RocketWatch):
         super().__init__(bot)
         self.finality_delay_threshold = 3
+        self.batch_size = 32
 
     async def _get_new_events(self) -> list[Event]:
         from_block = BlockNumber(self.last_served_block + 1 - self.lookback_distance)
@@ -87,25 +92,24 @@ class BeaconEvents(EventPlugin):
     async def get_past_events(
         self, from_block: BlockNumber, to_block: BlockNumber
     ) -> list[Event]:
-        from_slot = max(
-            0,
-            date_to_beacon_block(
-                (await w3.eth.get_block(from_block - 1)).get("timestamp", 0)
-            )
-            + 1,
+        from_block_data, to_block_data = await asyncio.gather(
+            block_cache.get_block(BlockNumber(from_block - 1)),
+            block_cache.get_block(to_block),
         )
-        to_slot = date_to_beacon_block(
-            (await w3.eth.get_block(to_block)).get("timestamp", 0)
+        from_slot = max(
+            0, date_to_beacon_block(from_block_data.get("timestamp", 0)) + 1
         )
+        to_slot = date_to_beacon_block(to_block_data.get("timestamp", 0))
         log.info(
             f"Checking for new beacon chain events in slot range [{from_slot}, {to_slot}]"
         )
 
         events: list[Event] = []
-        for slot_number in range(from_slot, to_slot - 1):
-            events.extend(
-                await self._get_events_for_slot(slot_number, check_finality=False)
-            )
+        for slots in as_chunks(range(from_slot, to_slot - 1), self.batch_size):
+            for slot_events in await asyncio.gather(
+                *[self._get_events_for_slot(s, check_finality=False) for s in slots]
+            ):
+                events.extend(slot_events)
 
         # quite expensive and only really makes sense to check toward the head of the chain
         events.extend(await self._get_events_for_slot(to_slot, check_finality=True))
@@ -116,21 +120,15 @@ class BeaconEvents(EventPlugin):
     async def _get_events_for_slot(
         self, slot_number: int, *, check_finality: bool
     ) -> list[Event]:
-        try:
-            log.debug(f"Checking slot {slot_number}")
-            beacon_block = cast(
-                BeaconBlock,
-                (await bacon.get_block(str(slot_number)))["data"]["message"],
-            )
-        except aiohttp.ClientResponseError as e:
-            if e.status == HTTPStatus.NOT_FOUND:
-                log.debug(f"Beacon block {slot_number} not found (missed slot)")
-                if missed := await self._get_missed_proposal(slot_number):
-                    return [missed]
-                return []
-            else:
-                raise e
-
+        log.debug(f"Checking slot {slot_number}")
+        block = await beacon_cache.get_block(slot_number)
+        if block is None:
+            log.debug(f"Beacon block {slot_number} not found (missed slot)")
+            if missed := await self._get_missed_proposal(slot_number):
+                return [missed]
+            return []
+
+        beacon_block = cast(BeaconBlock, block)
         events = await self._get_slashings(beacon_block)
         if proposal_event := await self._get_proposal(beacon_block):
             events.append(proposal_event)
@@ -143,9 +141,7 @@ class BeaconEvents(EventPlugin):
         return events
 
     async def _get_proposer_for_slot(self, slot_number: int) -> int:
-        epoch = slot_number // 32
-        resp = await bacon.get_block_proposer_duties(str(epoch))
-        duties = {int(d["slot"]): int(d["validator_index"]) for d in resp["data"]}
+        duties = await beacon_cache.get_proposer_duties(slot_number // 32)
         return duties[slot_number]
 
     async def _get_missed_proposal(self, slot_number: int) -> Event | None:
@@ -155,16 +151,9 @@ class BeaconEvents(EventPlugin):
             log.exception(f"Failed to get proposer duties for slot {slot_number}")
             return None
 
-        minipool: Mapping[str, Any] | None = await self.bot.db.minipools.find_one(
-            {"validator_index": validator_index}
-        )
-        megapool: (
-            Mapping[str, Any] | None
-        ) = await self.bot.db.megapool_validators.find_one(
-            {"validator_index": validator_index}
-        )
-        rp_pool = minipool or megapool
-        if not rp_pool:
+        await validator_registry.ensure_loaded(self.bot.db)
+        node_operator = validator_registry.get_node_operator(validator_index)
+        if node_operator is None:
             return None
 
         log.info(
@@ -172,10 +161,8 @@ class BeaconEvents(EventPlugin):
         )
 
         timestamp = beacon_block_to_date(slot_number)
-        sea = await get_sea_creature_for_address(
-            w3.to_checksum_address(rp_pool["node_operator"])
-        )
-        node_op_link = await el_explorer_url(rp_pool["node_operator"], prefix=sea)
+        sea = await get_sea_creature_for_address(w3.to_checksum_address(node_operator))
+        node_op_link = await el_explorer_url(node_operator, prefix=sea)
         validator_link = await cl_explorer_url(validator_index)
 
         embed = Embed(
@@ -231,19 +218,13 @@ class BeaconEvents(EventPlugin):
         )
 
         events: list[Event] = []
+        if slashings:
+            await validator_registry.ensure_loaded(self.bot.db)
         for slash in slashings:
             validator = int(slash["validator"])
             slasher = slash["slasher"]
-            minipool: Mapping[str, Any] | None = await self.bot.db.minipools.find_one(
-                {"validator_index": validator}
-            )
-            megapool: (
-                Mapping[str, Any] | None
-            ) = await self.bot.db.megapool_validators.find_one(
-                {"validator_index": validator}
-            )
-            rp_pool = minipool or megapool
-            if rp_pool is None:
+            node_operator = validator_registry.get_node_operator(validator)
+            if node_operator is None:
                 log.info(f"Skipping slashing of unknown validator {validator}")
                 continue
 
@@ -254,9 +235,9 @@ class BeaconEvents(EventPlugin):
                 f":{timestamp}"
             )
             sea = await get_sea_creature_for_address(
-                w3.to_checksum_address(rp_pool["node_operator"])
+                w3.to_checksum_address(node_operator)
             )
-            node_op_link = await el_explorer_url(rp_pool["node_operator"], prefix=sea)
+            node_op_link = await el_explorer_url(node_operator, prefix=sea)
             validator_link = await cl_explorer_url(validator)
             slasher_link = await cl_explorer_url(slasher)
 
@@ -300,16 +281,9 @@ class BeaconEvents(EventPlugin):
             return None
 
         validator_index = int(beacon_block["proposer_index"])
-        minipool: Mapping[str, Any] | None = await self.bot.db.minipools.find_one(
-            {"validator_index": validator_index}
-        )
-        megapool: (
-            Mapping[str, Any] | None
-        ) = await self.bot.db.megapool_validators.find_one(
-            {"validator_index": validator_index}
-        )
-        rp_pool = minipool or megapool
-        if not rp_pool:
+        await validator_registry.ensure_loaded(self.bot.db)
+        node_operator = validator_registry.get_node_operator(validator_index)
+        if node_operator is None:
             # not proposed by RP validator
             return None
 
@@ -346,10 +320,8 @@ class BeaconEvents(EventPlugin):
         else:
             fee_recipient = proposal_data["feeRecipient"]
 
-        sea = await get_sea_creature_for_address(
-            w3.to_checksum_address(rp_pool["node_operator"])
-        )
-        node_op_link = await el_explorer_url(rp_pool["node_operator"], prefix=sea)
+        sea = await get_sea_creature_for_address(w3.to_checksum_address(node_operator))
+        node_op_link = await el_explorer_url(node_operator, prefix=sea)
         validator_link = await cl_explorer_url(validator_index)
         slot = int(beacon_block["slot"])
         reward_str = format_value(block_reward_eth)
@@ -423,6 +395,7 @@ class BeaconEvents(EventPlugin):
                 finality_checkpoint["data"]["finalized"]["epoch"]
             )
             finality_delay = epoch_number - last_finalized_epoch
+            beacon_cache.set_finalized_slot(last_finalized_epoch * 32)
         except aiohttp.ClientResponseError:
             log.exception("Failed to get finality checkpoints")
             return None
@@ -0,0 +1,169 @@
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+
+def _log_ticks(upper: float) -> list[float]:
+    """Monotonic colorbar tick list for a log-scale axis."""
+    upper = max(upper, 1)
+    return [t for t in (1, 10, 100, 1000) if t < upper] + [upper]
+
+
+def plot_node_tvl_vs_collateral(
+    x: list[float],
+    y: list[float],
+    c: list[int],
+    max_validators: int,
+    bonded: bool,
+    highlight: tuple[float, float] | None,
+) -> Figure:
+    fig, (ax, ax2) = plt.subplots(2)
+    fig.set_figheight(fig.get_figheight() * 2)
+
+    # create the scatter plot
+    paths = ax.scatter(x, y, c=c, alpha=0.25, norm="log")
+    polys = ax2.hexbin(x, y, gridsize=20, bins="log", xscale="log", cmap="viridis")
+    # fill the background in with the default color.
+    ax2.set_facecolor(mcolors.to_rgba(mpl.colormaps["viridis"](0), 0.9))
+    max_nodes = max(polys.get_array())
+
+    # log-scale the X-axis to account for thomas
+    ax.set_xscale("log", base=8)
+
+    # Add a legend for the color-coding on the scatter plot
+    formatToInt = "{x:.0f}"
+    cb = fig.colorbar(mappable=paths, ax=ax, format=formatToInt)
+    cb.set_label("Validator Count")
+    cb.set_ticks(_log_ticks(max_validators))
+
+    # Add a legend for the color-coding on the hex distribution
+    cb = fig.colorbar(mappable=polys, ax=ax2, format=formatToInt)
+    cb.set_label("Nodes")
+    cb.set_ticks(_log_ticks(max_nodes - 1))
+
+    # Add labels and units
+    ylabel = f"Collateral (percent {'bonded' if bonded else 'borrowed'})"
+    ax.set_ylabel(ylabel)
+    ax2.set_ylabel(ylabel)
+    ax.yaxis.set_major_formatter(formatToInt + "%")
+    ax2.yaxis.set_major_formatter(formatToInt + "%")
+    ax2.set_xlabel("Node Bond (Eth only - log scale)")
+    ax.xaxis.set_major_formatter(formatToInt)
+    ax2.xaxis.set_major_formatter(formatToInt)
+
+    # Add a red dot if the user asked to highlight their node
+    if highlight is not None:
+        ax.plot(*highlight, "ro")
+        ax2.plot(*highlight, "ro")
+
+    # Add horizontal lines showing the 10-15% range made optimal by RPIP-30
+    if not bonded:
+        ax.axhspan(10, 15, alpha=0.1, color="grey")
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_collateral_distribution(
+    distribution: list[tuple[float, int]],
+    staked_rpl: list[float],
+    color: str,
+    bonded: bool,
+) -> Figure:
+    # create figure with 2 separate y axes
+    fig, ax = plt.subplots()
+    ax2 = ax.twinx()
+
+    x_keys = [str(x) for x, _ in distribution]
+    rects = ax.bar(x_keys, [y for _, y in distribution], color=color, align="edge")
+    ax.bar_label(rects)
+
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_xlabel(f"Collateral Percent of {'Bonded' if bonded else 'Borrowed'} Eth")
+
+    ax.set_ylim(top=(ax.get_ylim()[1] * 1.1))
+    ax.yaxis.set_visible(False)
+    ax.get_xaxis().set_major_formatter(
+        FuncFormatter(
+            lambda n, _: (
+                f"{x_keys[n] if n < len(x_keys) else 0}{'+' if n == len(x_keys) - 1 else ''}%"
+            )
+        )
+    )
+
+    line = ax2.plot(x_keys, staked_rpl)
+    ax2.set_ylim(top=(ax2.get_ylim()[1] * 1.1))
+    ax2.tick_params(axis="y", colors=line[0].get_color())
+    ax2.get_yaxis().set_major_formatter(
+        FuncFormatter(lambda y, _: f"{int(y / 10**3)}k")
+    )
+
+    fig.tight_layout()
+    ax.legend(rects, ["Node Operators"], loc="upper left")
+    ax2.legend(line, ["Staked RPL"], loc="upper right")
+    return fig
+
+
+def plot_voter_share_distribution(
+    distribution: list[tuple[float, int]],
+    decimals: int,
+    color: str,
+    avg_ratio: float,
+    step_size: float,
+    target: tuple[str, float, float] | None,
+) -> Figure:
+    fig, ax = plt.subplots()
+
+    # Mark the overall average RPL per borrowed ETH
+    avg_pos = avg_ratio / step_size
+    ax.axvline(
+        avg_pos,
+        color="tab:olive",
+        linestyle="--",
+        zorder=1,
+        label=f"Average Stake ({avg_ratio:.1f})",
+    )
+
+    leb8_14_breakeven_ratio = avg_ratio / 9
+    breakeven_pos = leb8_14_breakeven_ratio / step_size
+    ax.axvline(
+        breakeven_pos,
+        color="tab:red",
+        linestyle="--",
+        zorder=1,
+        label=f"LEB8 14% Breakeven ({leb8_14_breakeven_ratio:.1f})",
+    )
+
+    # Highlight target node if provided
+    if target is not None:
+        display_name, target_ratio, target_pos = target
+        ax.axvline(
+            target_pos,
+            color="black",
+            linestyle="-",
+            zorder=3,
+            label=f"{display_name} ({target_ratio:.1f})",
+        )
+
+    x_keys = [f"{x:.{decimals}f}" for x, _ in distribution]
+    rects = ax.bar(x_keys, [y for _, y in distribution], color=color, align="edge")
+    ax.bar_label(rects)
+
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_xlabel("RPL per borrowed ETH")
+
+    ax.set_ylim(top=(ax.get_ylim()[1] * 1.1))
+    ax.set_ylabel("Validators")
+    ax.get_xaxis().set_major_formatter(
+        FuncFormatter(
+            lambda n, _: (
+                f"{x_keys[n] if n < len(x_keys) else 0}{'+' if n == len(x_keys) - 1 else ''}"
+            )
+        )
+    )
+
+    fig.tight_layout()
+    ax.legend(loc="upper right")
+    return fig
@@ -1,27 +1,30 @@
 import functools
 import logging
 import operator
-from io import BytesIO
 from typing import Any, TypedDict
 
-import matplotlib as mpl
-import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
 import numpy as np
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command, describe
 from discord.ext import commands
 from eth_typing import ChecksumAddress
-from matplotlib.ticker import FuncFormatter
 from pymongo.asynchronous.database import AsyncDatabase
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import ens, solidity
+from rocketwatch.utils.chart_cache import ChartResponse, chart_cache
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed, resolve_ens
 from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.shared_w3 import w3
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import (
+    plot_collateral_distribution,
+    plot_node_tvl_vs_collateral,
+    plot_voter_share_distribution,
+)
+
 log = logging.getLogger("rocketwatch.collateral")
 
 
@@ -38,12 +41,6 @@ def get_percentiles(
     return [(p, np.percentile(counts, p, method="nearest")) for p in percentiles]
 
 
-def _log_ticks(upper: float) -> list[float]:
-    """Monotonic colorbar tick list for a log-scale axis."""
-    upper = max(upper, 1)
-    return [t for t in (1, 10, 100, 1000) if t < upper] + [upper]
-
-
 async def collateral_distribution_raw(
     interaction: Interaction, distribution: list[tuple[float, int]]
 ) -> None:
@@ -206,72 +203,25 @@ class Collateral(commands.Cog):
             max_validators = max(max_validators, int(node["validators"]))
 
         e = Embed()
-        img = BytesIO()
-        fig, (ax, ax2) = plt.subplots(2)
-        fig.set_figheight(fig.get_figheight() * 2)
-
-        # create the scatter plot
-        paths = ax.scatter(x, y, c=c, alpha=0.25, norm="log")
-        polys = ax2.hexbin(x, y, gridsize=20, bins="log", xscale="log", cmap="viridis")
-        # fill the background in with the default color.
-        ax2.set_facecolor(mcolors.to_rgba(mpl.colormaps["viridis"](0), 0.9))
-        max_nodes = max(polys.get_array())
-
-        # log-scale the X-axis to account for thomas
-        ax.set_xscale("log", base=8)
-
-        # Add a legend for the color-coding on the scatter plot
-        formatToInt = "{x:.0f}"
-        cb = fig.colorbar(mappable=paths, ax=ax, format=formatToInt)
-        cb.set_label("Validator Count")
-        cb.set_ticks(_log_ticks(max_validators))
-
-        # Add a legend for the color-coding on the hex distribution
-        cb = fig.colorbar(mappable=polys, ax=ax2, format=formatToInt)
-        cb.set_label("Nodes")
-        cb.set_ticks(_log_ticks(max_nodes - 1))
-
-        # Add labels and units
-        ylabel = f"Collateral (percent {'bonded' if bonded else 'borrowed'})"
-        ax.set_ylabel(ylabel)
-        ax2.set_ylabel(ylabel)
-        ax.yaxis.set_major_formatter(formatToInt + "%")
-        ax2.yaxis.set_major_formatter(formatToInt + "%")
-        ax2.set_xlabel("Node Bond (Eth only - log scale)")
-        ax.xaxis.set_major_formatter(formatToInt)
-        ax2.xaxis.set_major_formatter(formatToInt)
-
-        # Add a red dot if the user asked to highlight their node
+        highlight = None
         if address is not None:
-            # Print a vline and hline through the requested node
+            # Add a red dot if the user asked to highlight their node
             try:
                 target_node = data[address]
-                ax.plot(target_node["bonded"], node_collateral(target_node), "ro")
-                ax2.plot(target_node["bonded"], node_collateral(target_node), "ro")
-                e.description = f"Showing location of {display_name}"
             except KeyError:
                 await interaction.followup.send(
                     f"{display_name} not found in data set - it must have at least one validator"
                 )
                 return
+            highlight = (target_node["bonded"], node_collateral(target_node))
+            e.description = f"Showing location of {display_name}"
 
-        # Add horizontal lines showing the 10-15% range made optimal by RPIP-30
-        if not bonded:
-            ax.axhspan(10, 15, alpha=0.1, color="grey")
-
-        fig.tight_layout()
-
-        img = BytesIO()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        fig.clear()
-        plt.close()
-
+        f = await chart_renderer.render_file(
+            plot_node_tvl_vs_collateral, x, y, c, max_validators, bonded, highlight
+        )
         e.title = "Node TVL vs Collateral Scatter Plot"
         e.set_image(url="attachment://graph.png")
-        f = File(img, filename="graph.png")
         await interaction.followup.send(embed=e, files=[f])
-        img.close()
 
     @command()
     @describe(
@@ -291,6 +241,32 @@ class Collateral(commands.Cog):
         """
         await interaction.response.defer(ephemeral=is_hidden(interaction))
 
+        # If the raw data were requested, print them and exit early
+        if raw:
+            data = await get_average_collateral_percentage_per_node(
+                self.bot.db, collateral_cap, bonded
+            )
+            distribution = [
+                (collateral, len(nodes)) for collateral, nodes in data.items()
+            ]
+            await collateral_distribution_raw(interaction, sorted(distribution)[::-1])
+            return
+
+        # node stakes only change with the upkeep task, the RPL price on chain
+        rpl_price = await rp.call("rocketNetworkPrices.getRPLPrice")
+        response = await chart_cache.fetch(
+            "collateral_distribution",
+            (collateral_cap, bonded),
+            ("db_upkeep",),
+            lambda: self._build_collateral_distribution(collateral_cap, bonded),
+            fingerprint=rpl_price,
+        )
+        (e,) = response.get_embeds()
+        await interaction.followup.send(embed=e, files=response.get_files())
+
+    async def _build_collateral_distribution(
+        self, collateral_cap: int, bonded: bool
+    ) -> ChartResponse:
         data = await get_average_collateral_percentage_per_node(
             self.bot.db, collateral_cap, bonded
         )
@@ -304,67 +280,28 @@ class Collateral(commands.Cog):
             [],
         )
 
-        # If the raw data were requested, print them and exit early
-        if raw:
-            await collateral_distribution_raw(interaction, distribution[::-1])
-            return
-
         e = Embed()
-        img = BytesIO()
-        # create figure with 2 separate y axes
-        fig, ax = plt.subplots()
-        ax2 = ax.twinx()
-
-        x_keys = [str(x) for x, _ in distribution]
-        rects = ax.bar(
-            x_keys, [y for _, y in distribution], color=str(e.color), align="edge"
-        )
-        ax.bar_label(rects)
-
-        ax.tick_params(axis="x", rotation=90)
-        ax.set_xlabel(f"Collateral Percent of {'Bonded' if bonded else 'Borrowed'} Eth")
-
-        ax.set_ylim(top=(ax.get_ylim()[1] * 1.1))
-        ax.yaxis.set_visible(False)
-        ax.get_xaxis().set_major_formatter(
-            FuncFormatter(
-                lambda n, _: (
-                    f"{x_keys[n] if n < len(x_keys) else 0}{'+' if n == len(x_keys) - 1 else ''}%"
-                )
-            )
-        )
-
         bars = {
             collateral: sum(nodes)
             for collateral, nodes in sorted(data.items(), key=lambda x: x[0])
         }
-        line = ax2.plot(x_keys, [bars.get(float(x), 0) for x in x_keys])
-        ax2.set_ylim(top=(ax2.get_ylim()[1] * 1.1))
-        ax2.tick_params(axis="y", colors=line[0].get_color())
-        ax2.get_yaxis().set_major_formatter(
-            FuncFormatter(lambda y, _: f"{int(y / 10**3)}k")
+        png = await chart_renderer.render(
+            plot_collateral_distribution,
+            distribution,
+            [bars[collateral] for collateral, _ in distribution],
+            str(e.color),
+            bonded,
         )
 
-        fig.tight_layout()
-        ax.legend(rects, ["Node Operators"], loc="upper left")
-        ax2.legend(line, ["Staked RPL"], loc="upper right")
-        fig.savefig(img, format="png")
-        img.seek(0)
-
-        fig.clear()
-        plt.close()
-
         e.title = "RPL Collateral Distribution"
         e.set_image(url="attachment://collateral_distribution.png")
-        f = File(img, filename="collateral_distribution.png")
         percentile_strings = [
             f"{x[0]}th percentile: {int(x[1])}% collateral"
             for x in get_percentiles([50, 75, 90, 99], counts)
         ]
         e.description = f"Total Staked RPL: {sum(bars.values()):,.0f}"
         e.set_footer(text="\n".join(percentile_strings))
-        await interaction.followup.send(embed=e, files=[f])
-        img.close()
+        return ChartResponse([e], [("collateral_distribution.png", png)])
 
     @command()
     @describe(node_address="Node Address or ENS to highlight")
@@ -452,88 +389,41 @@ class Collateral(commands.Cog):
             [],
         )
 
-        img = BytesIO()
-        fig, ax = plt.subplots()
-
-        # Mark the overall average RPL per borrowed ETH
-        avg_pos = avg_ratio / step_size
-        ax.axvline(
-            avg_pos,
-            color="tab:olive",
-            linestyle="--",
-            zorder=1,
-            label=f"Average Stake ({avg_ratio:.1f})",
-        )
-
-        leb8_14_breakeven_ratio = avg_ratio / 9
-        breakeven_pos = leb8_14_breakeven_ratio / step_size
-        ax.axvline(
-            breakeven_pos,
-            color="tab:red",
-            linestyle="--",
-            zorder=1,
-            label=f"LEB8 14% Breakeven ({leb8_14_breakeven_ratio:.1f})",
-        )
-
-        # Highlight target node if provided
+        target = None
         if address is not None:
-            target = await self.bot.db.node_operators.find_one(
+            target_doc = await self.bot.db.node_operators.find_one(
                 {"address": address},
                 {"rpl.megapool_stake": 1, "megapool.user_capital": 1},
             )
-            if target is not None:
-                rpl_stake = (target.get("rpl") or {}).get("megapool_stake", 0)
-                borrowed = (target.get("megapool") or {}).get("user_capital", 0)
+            if target_doc is not None:
+                rpl_stake = (target_doc.get("rpl") or {}).get("megapool_stake", 0)
+                borrowed = (target_doc.get("megapool") or {}).get("user_capital", 0)
                 target_ratio = (rpl_stake / borrowed) if (borrowed > 0) else 0
                 target_pos = min(target_ratio, cap) / step_size
-                ax.axvline(
-                    target_pos,
-                    color="black",
-                    linestyle="-",
-                    zorder=3,
-                    label=f"{display_name} ({target_ratio:.1f})",
-                )
+                target = (str(display_name), target_ratio, target_pos)
 
         # Match decimal places to step size precision
         decimals = (
             len(f"{step_size:.10f}".rstrip("0").split(".")[1]) if step_size % 1 else 0
         )
-        x_keys = [f"{x:.{decimals}f}" for x, _ in distribution]
-        rects = ax.bar(
-            x_keys, [y for _, y in distribution], color=str(e.color), align="edge"
-        )
-        ax.bar_label(rects)
-
-        ax.tick_params(axis="x", rotation=90)
-        ax.set_xlabel("RPL per borrowed ETH")
-
-        ax.set_ylim(top=(ax.get_ylim()[1] * 1.1))
-        ax.set_ylabel("Validators")
-        ax.get_xaxis().set_major_formatter(
-            FuncFormatter(
-                lambda n, _: (
-                    f"{x_keys[n] if n < len(x_keys) else 0}{'+' if n == len(x_keys) - 1 else ''}"
-                )
-            )
+        f = await chart_renderer.render_file(
+            plot_voter_share_distribution,
+            distribution,
+            decimals,
+            str(e.color),
+            avg_ratio,
+            step_size,
+            target,
+            filename="voter_share_distribution.png",
         )
 
-        fig.tight_layout()
-        ax.legend(loc="upper right")
-        fig.savefig(img, format="png")
-        img.seek(0)
-
-        fig.clear()
-        plt.close()
-
         e.set_image(url="attachment://voter_share_distribution.png")
-        f = File(img, filename="voter_share_distribution.png")
         percentile_strings = [
             f"{x[0]}th percentile: {x[1]:.{decimals}f} RPL/ETH"
             for x in get_percentiles([50, 75, 90, 99], counts)
         ]
         e.set_footer(text="\n".join(percentile_strings))
         await interaction.followup.send(embed=e, files=[f])
-        img.close()
 
 
 async def setup(bot: RocketWatch) -> None:
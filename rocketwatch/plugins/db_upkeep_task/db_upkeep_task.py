@@ -11,18 +11,22 @@ from cronitor import Monitor
 from discord.ext import commands
 from discord.utils import as_chunks
 from eth_typing import BlockNumber
-from pymongo import UpdateMany, UpdateOne
+from pymongo import UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.results import BulkWriteResult
 from web3.contract.async_contract import AsyncContractFunction
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
-from rocketwatch.utils.block_time import ts_to_block
+from rocketwatch.utils.block_time import ts_to_block, ts_to_blocks
+from rocketwatch.utils.chart_cache import chart_cache
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.event_logs import get_logs
 from rocketwatch.utils.rocketpool import ValidatorInfo, rp
 from rocketwatch.utils.shared_w3 import bacon, w3
-from rocketwatch.utils.time_debug import timerun, timerun_async
+from rocketwatch.utils.validator_registry import validator_registry
+
+from .scheduler import Stage, StageScheduler
 
 log = logging.getLogger("rocketwatch.db_upkeep_task")
 
@@ -103,46 +107,158 @@ def _unpack_validator_info_dynamic(info: ValidatorInfo) -> dict[str, Any]:
     }
 
 
+def _unpack_beacon_validator(d: dict[str, Any]) -> dict[str, Any]:
+    # dotted paths, so unchanged fields can be left out of the $set
+    v = d["validator"]
+    return {
+        "validator_index": int(d["index"]),
+        "beacon.status": d["status"],
+        "beacon.balance": solidity.to_float(d["balance"], 9),
+        "beacon.effective_balance": solidity.to_float(v["effective_balance"], 9),
+        "beacon.slashed": v["slashed"],
+        "beacon.activation_eligibility_epoch": _parse_epoch(
+            v["activation_eligibility_epoch"]
+        ),
+        "beacon.activation_epoch": _parse_epoch(v["activation_epoch"]),
+        "beacon.exit_epoch": _parse_epoch(v["exit_epoch"]),
+        "beacon.withdrawable_epoch": _parse_epoch(v["withdrawable_epoch"]),
+    }
+
+
+_MISSING = object()
+
+
+def _changed_fields(doc: dict[str, Any], fields: dict[str, Any]) -> dict[str, Any]:
+    changed = {}
+    for path, value in fields.items():
+        stored: Any = doc
+        for key in path.split("."):
+            stored = stored.get(key, _MISSING) if isinstance(stored, dict) else _MISSING
+        if stored is _MISSING or stored != value:
+            changed[path] = value
+    return changed
+
+
+def _written(result: BulkWriteResult) -> int:
+    return result.inserted_count + result.modified_count + result.upserted_count
+
+
 class DBUpkeepTask(commands.Cog):
     def __init__(self, bot: RocketWatch):
         self.bot = bot
         self.monitor = Monitor("db-task", api_key=cfg.secrets.cronitor)
         self.batch_size = 250
-        self.cooldown = timedelta(minutes=10)
+        self.beacon_batch_size = 2000
+        self.startup_delay = timedelta(minutes=10)
+        self.tick = timedelta(seconds=30)
+        self.scheduler = StageScheduler(self._build_stages(), max_concurrent=3)
         self.bot.loop.create_task(self.loop())
 
-    async def loop(self) -> None:
-        await self.bot.wait_until_ready()
-        await asyncio.sleep(self.cooldown.total_seconds())
-        await self.check_indexes()
-        while not self.bot.is_closed():
+    def _stage(
+        self,
+        run: Callable[[], Coroutine[Any, Any, int]],
+        interval: timedelta,
+        *depends_on: Callable[[], Coroutine[Any, Any, int]],
+    ) -> Stage:
+        name = run.__name__
+
+        async def monitored() -> None:
             p_id = time.time()
-            self.monitor.ping(state="run", series=p_id)
+            self.monitor.ping(state="run", series=p_id, message=name)
             try:
-                log.debug("starting db upkeep task")
-                # node operator tasks
-                await self.add_untracked_node_operators()
-                await self.add_static_node_operator_data()
-                await self.update_dynamic_node_operator_data()
-                await self.update_dynamic_megapool_data()
-                # minipool tasks
-                await self.add_untracked_minipools()
-                await self.add_static_minipool_data()
-                await self.add_static_minipool_deposit_data()
-                await self.update_dynamic_minipool_data()
-                await self.update_dynamic_minipool_beacon_data()
-                # megapool validator tasks
-                await self.add_untracked_megapool_validators()
-                await self.add_static_megapool_deposit_data()
-                await self.update_dynamic_megapool_validator_data()
-                await self.update_dynamic_megapool_validator_beacon_data()
-                log.debug("finished db upkeep task")
-                self.monitor.ping(state="complete", series=p_id)
+                written = await run()
+                self.monitor.ping(state="complete", series=p_id, message=name)
             except Exception as err:
-                self.monitor.ping(state="fail", series=p_id)
+                self.monitor.ping(state="fail", series=p_id, message=name)
                 await self.bot.report_error(err)
-            finally:
-                await asyncio.sleep(self.cooldown.total_seconds())
+                raise
+            # stages return how many documents they changed, most runs change
+            # nothing and charts built from the DB stay cached until one does
+            if written:
+                log.debug(f"Stage {name} wrote {written} documents")
+                chart_cache.invalidate("db_upkeep")
+
+        return Stage(name, monitored, interval, tuple(d.__name__ for d in depends_on))
+
+    def _build_stages(self) -> list[Stage]:
+        # discovery and static data only touch documents that are missing data,
+        # so they're cheap to run often and new pools show up quickly
+        discovery = timedelta(minutes=5)
+        dynamic = timedelta(minutes=10)
+        return [
+            # node operator stages
+            self._stage(self.add_untracked_node_operators, discovery),
+            self._stage(
+                self.add_static_node_operator_data,
+                discovery,
+                self.add_untracked_node_operators,
+            ),
+            self._stage(
+                self.update_dynamic_node_operator_data,
+                dynamic,
+                self.add_static_node_operator_data,
+            ),
+            self._stage(
+                self.update_dynamic_megapool_data,
+                dynamic,
+                self.update_dynamic_node_operator_data,
+            ),
+            # minipool stages
+            self._stage(self.add_untracked_minipools, discovery),
+            self._stage(
+                self.add_static_minipool_data, discovery, self.add_untracked_minipools
+            ),
+            self._stage(
+                self.add_static_minipool_deposit_data,
+                discovery,
+                self.add_static_minipool_data,
+            ),
+            self._stage(
+                self.update_dynamic_minipool_data,
+                dynamic,
+                self.add_static_minipool_data,
+            ),
+            self._stage(
+                self.update_dynamic_minipool_beacon_data,
+                dynamic,
+                self.add_static_minipool_data,
+            ),
+            # megapool validator stages
+            self._stage(
+                self.add_untracked_megapool_validators,
+                discovery,
+                self.update_dynamic_megapool_data,
+            ),
+            self._stage(
+                self.add_static_megapool_deposit_data,
+                discovery,
+                self.add_untracked_megapool_validators,
+            ),
+            self._stage(
+                self.update_dynamic_megapool_validator_data,
+                dynamic,
+                self.add_untracked_megapool_validators,
+            ),
+            self._stage(
+                self.update_dynamic_megapool_validator_beacon_data,
+                dynamic,
+                self.add_untracked_megapool_validators,
+            ),
+            self._stage(
+                self.refresh_validator_registry,
+                dynamic,
+                self.update_dynamic_minipool_beacon_data,
+                self.update_dynamic_megapool_validator_beacon_data,
+            ),
+        ]
+
+    async def loop(self) -> None:
+        await self.bot.wait_until_ready()
+        await asyncio.sleep(self.startup_delay.total_seconds())
+        await self.check_indexes()
+        while not self.bot.is_closed():
+            self.scheduler.start_due_stages()
+            await asyncio.sleep(self.tick.total_seconds())
 
     async def check_indexes(self) -> None:
         log.debug("checking indexes")
@@ -160,6 +276,7 @@ class DBUpkeepTask(commands.Cog):
         await self.bot.db.megapool_validators.create_index("validator_index")
         await self.bot.db.megapool_validators.create_index("status")
         await self.bot.db.megapool_validators.create_index("beacon.status")
+        await self.bot.db.block_timestamps.create_index("timestamp")
         log.debug("indexes checked")
 
     async def _batch_multicall_update(
@@ -169,12 +286,13 @@ class DBUpkeepTask(commands.Cog):
         call_fn: Callable[[dict[str, Any]], Coroutine[Any, Any, list[MulticallSpec]]],
         projection: dict[str, Any],
         label: str | None,
-    ) -> None:
+    ) -> int:
         items = await collection.find(query, projection).to_list()
         if not items:
-            return
+            return 0
 
         total = len(items)
+        written = 0
         first_calls = await call_fn(items[0])
         batch_size = self.batch_size // len(first_calls)
         for i, batch in enumerate(as_chunks(items, batch_size)):
@@ -195,18 +313,56 @@ class DBUpkeepTask(commands.Cog):
                 if transform is not None and value is not None:
                     value = transform(value)
                 updates[addr][field] = value
-            await collection.bulk_write(
+            result = await collection.bulk_write(
                 [
                     UpdateOne({"address": addr}, {"$set": d})
                     for addr, d in updates.items()
                 ],
                 ordered=False,
             )
+            written += _written(result)
+        return written
+
+    async def _sync_beacon_data(
+        self, collection: AsyncCollection[dict[str, Any]], label: str
+    ) -> int:
+        docs = await collection.find(
+            {"pubkey": {"$ne": None}, "beacon.status": {"$ne": "withdrawal_done"}},
+            {"pubkey": 1, "validator_index": 1, "beacon": 1},
+        ).to_list()
+        if not docs:
+            return 0
+
+        docs_by_pubkey: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for doc in docs:
+            docs_by_pubkey[doc["pubkey"]].append(doc)
+
+        pubkeys = list(docs_by_pubkey)
+        total = len(pubkeys)
+        written = 0
+        for i, pubkey_batch in enumerate(as_chunks(pubkeys, self.beacon_batch_size)):
+            start = i * self.beacon_batch_size + 1
+            end = min((i + 1) * self.beacon_batch_size, total)
+            log.info(f"Updating beacon chain data for {label} [{start}, {end}]/{total}")
+            beacon_data = (
+                await bacon.post_validators_by_ids("head", ids=pubkey_batch)
+            )["data"]
+            updates = []
+            for d in beacon_data:
+                fields = _unpack_beacon_validator(d)
+                for doc in docs_by_pubkey.get(d["validator"]["pubkey"], []):
+                    if changed := _changed_fields(doc, fields):
+                        updates.append(
+                            UpdateOne({"_id": doc["_id"]}, {"$set": changed})
+                        )
+            log.debug(f"{len(updates)} of {len(pubkey_batch)} {label} changed")
+            if updates:
+                written += _written(await collection.bulk_write(updates, ordered=False))
+        return written
 
     # -- Node operator tasks --
 
-    @timerun_async
-    async def add_untracked_node_operators(self) -> None:
+    async def add_untracked_node_operators(self) -> int:
         nm = await rp.get_contract_by_name("rocketNodeManager")
         latest_rp = await rp.call("rocketNodeManager.getNodeCount") - 1
         latest_db = 0
@@ -216,7 +372,7 @@ class DBUpkeepTask(commands.Cog):
             latest_db = res["_id"]
         if latest_db >= latest_rp:
             log.debug("No new nodes")
-            return
+            return 0
         data: dict[int, Any] = {}
         for index_batch in as_chunks(
             range(latest_db + 1, latest_rp + 1), self.batch_size
@@ -225,12 +381,12 @@ class DBUpkeepTask(commands.Cog):
                 [nm.functions.getNodeAt(i) for i in index_batch]
             )
             data |= dict(zip(index_batch, results, strict=False))
-        await self.bot.db.node_operators.insert_many(
+        result = await self.bot.db.node_operators.insert_many(
             [{"_id": i, "address": w3.to_checksum_address(a)} for i, a in data.items()]
         )
+        return len(result.inserted_ids)
 
-    @timerun_async
-    async def add_static_node_operator_data(self) -> None:
+    async def add_static_node_operator_data(self) -> int:
         df = await rp.get_contract_by_name("rocketNodeDistributorFactory")
         mf = await rp.get_contract_by_name("rocketMegapoolFactory")
 
@@ -250,7 +406,7 @@ class DBUpkeepTask(commands.Cog):
                 ),
             ]
 
-        await self._batch_multicall_update(
+        return await self._batch_multicall_update(
             self.bot.db.node_operators,
             {
                 "$or": [
@@ -263,8 +419,7 @@ class DBUpkeepTask(commands.Cog):
             label="node operators",
         )
 
-    @timerun_async
-    async def update_dynamic_node_operator_data(self) -> None:
+    async def update_dynamic_node_operator_data(self) -> int:
         mf = await rp.get_contract_by_name("rocketMegapoolFactory")
         nd = await rp.get_contract_by_name("rocketNodeDeposit")
         nm = await rp.get_contract_by_name("rocketNodeManager")
@@ -390,7 +545,7 @@ class DBUpkeepTask(commands.Cog):
                 ),
             ]
 
-        await self._batch_multicall_update(
+        return await self._batch_multicall_update(
             self.bot.db.node_operators,
             {},
             get_calls,
@@ -402,10 +557,9 @@ class DBUpkeepTask(commands.Cog):
             },
         )
 
-    @timerun_async
-    async def update_dynamic_megapool_data(self) -> None:
-        delegate_abi = await rp.get_abi_by_name("rocketMegapoolDelegate")
-        proxy_abi = await rp.get_abi_by_name("rocketMegapoolProxy")
+    async def update_dynamic_megapool_data(self) -> int:
+        delegate_abi = await rp.get_parsed_abi_by_name("rocketMegapoolDelegate")
+        proxy_abi = await rp.get_parsed_abi_by_name("rocketMegapoolProxy")
 
         async def get_calls(n: dict[str, Any]) -> list[MulticallSpec]:
             addr = n["megapool"]["address"]
@@ -482,7 +636,7 @@ class DBUpkeepTask(commands.Cog):
                 ),
             ]
 
-        await self._batch_multicall_update(
+        return await self._batch_multicall_update(
             self.bot.db.node_operators,
             {"megapool.deployed": True},
             get_calls,
@@ -492,8 +646,7 @@ class DBUpkeepTask(commands.Cog):
 
     # -- Minipool tasks --
 
-    @timerun_async
-    async def add_untracked_minipools(self) -> None:
+    async def add_untracked_minipools(self) -> int:
         mm = await rp.get_contract_by_name("rocketMinipoolManager")
         latest_rp = await rp.call("rocketMinipoolManager.getMinipoolCount") - 1
         latest_db = 0
@@ -503,27 +656,29 @@ class DBUpkeepTask(commands.Cog):
             latest_db = res["_id"]
         if latest_db >= latest_rp:
             log.debug("No new minipools")
-            return
+            return 0
         log.debug(
             f"Latest minipool in db: {latest_db}, latest minipool in rp: {latest_rp}"
         )
+        written = 0
         for index_batch in as_chunks(
             range(latest_db + 1, latest_rp + 1), self.batch_size
         ):
             results = await rp.multicall(
                 [mm.functions.getMinipoolAt(i) for i in index_batch]
             )
-            await self.bot.db.minipools.insert_many(
+            result = await self.bot.db.minipools.insert_many(
                 [
                     {"_id": i, "address": w3.to_checksum_address(a)}
                     for i, a in zip(index_batch, results, strict=False)
                 ]
             )
+            written += len(result.inserted_ids)
+        return written
 
-    @timerun_async
-    async def add_static_minipool_data(self) -> None:
+    async def add_static_minipool_data(self) -> int:
         mm = await rp.get_contract_by_name("rocketMinipoolManager")
-        minipool_abi = await rp.get_abi_by_name("rocketMinipool")
+        minipool_abi = await rp.get_parsed_abi_by_name("rocketMinipool")
 
         async def lamb(n: dict[str, Any]) -> list[MulticallSpec]:
             return [
@@ -543,7 +698,7 @@ class DBUpkeepTask(commands.Cog):
                 ),
             ]
 
-        await self._batch_multicall_update(
+        return await self._batch_multicall_update(
             self.bot.db.minipools,
             {"node_operator": {"$exists": False}},
             lamb,
@@ -551,8 +706,7 @@ class DBUpkeepTask(commands.Cog):
             label="minipools",
         )
 
-    @timerun
-    async def add_static_minipool_deposit_data(self) -> None:
+    async def add_static_minipool_deposit_data(self) -> int:
         minipools = (
             await self.bot.db.minipools.find(
                 {"deposit_amount": {"$exists": False}, "status": "initialised"},
@@ -562,17 +716,18 @@ class DBUpkeepTask(commands.Cog):
             .to_list()
         )
         if not minipools:
-            return
+            return 0
         nd = await rp.get_contract_by_name("rocketNodeDeposit")
         mm = await rp.get_contract_by_name("rocketMinipoolManager")
 
-        for minipool_batch in as_chunks(minipools, self.batch_size):
-            block_start = BlockNumber(
-                await ts_to_block(minipool_batch[0]["status_time"]) - 1
-            )
-            block_end = BlockNumber(
-                await ts_to_block(minipool_batch[-1]["status_time"]) + 1
-            )
+        batches = list(as_chunks(minipools, self.batch_size))
+        boundaries = await ts_to_blocks(
+            ts for b in batches for ts in (b[0]["status_time"], b[-1]["status_time"])
+        )
+        written = 0
+        for i, minipool_batch in enumerate(batches):
+            block_start = BlockNumber(boundaries[2 * i] - 1)
+            block_end = BlockNumber(boundaries[2 * i + 1] + 1)
             log.debug(f"Processing deposit data for blocks {block_start}..{block_end}")
             addresses = {m["address"] for m in minipool_batch}
 
@@ -613,15 +768,20 @@ class DBUpkeepTask(commands.Cog):
 
             if not data:
                 continue
-            await self.bot.db.minipools.bulk_write(
-                [UpdateOne({"address": addr}, {"$set": d}) for addr, d in data.items()],
-                ordered=False,
+            written += _written(
+                await self.bot.db.minipools.bulk_write(
+                    [
+                        UpdateOne({"address": addr}, {"$set": d})
+                        for addr, d in data.items()
+                    ],
+                    ordered=False,
+                )
             )
+        return written
 
-    @timerun_async
-    async def update_dynamic_minipool_data(self) -> None:
+    async def update_dynamic_minipool_data(self) -> int:
         mc = await rp.get_contract_by_name("multicall3")
-        minipool_abi = await rp.get_abi_by_name("rocketMinipool")
+        minipool_abi = await rp.get_parsed_abi_by_name("rocketMinipool")
 
         async def get_calls(n: dict[str, Any]) -> list[MulticallSpec]:
             minipool_contract = w3.eth.contract(address=n["address"], abi=minipool_abi)
@@ -707,7 +867,7 @@ class DBUpkeepTask(commands.Cog):
                 ),
             ]
 
-        await self._batch_multicall_update(
+        return await self._batch_multicall_update(
             self.bot.db.minipools,
             {"finalized": {"$ne": True}},
             get_calls,
@@ -715,60 +875,21 @@ class DBUpkeepTask(commands.Cog):
             label="minipools",
         )
 
-    @timerun
-    async def update_dynamic_minipool_beacon_data(self) -> None:
-        pubkeys = await self.bot.db.minipools.distinct(
-            "pubkey", {"beacon.status": {"$ne": "withdrawal_done"}}
-        )
-        pubkeys = [pk for pk in pubkeys if pk is not None]
-        total = len(pubkeys)
-        for i, pubkey_batch in enumerate(as_chunks(pubkeys, self.batch_size)):
-            start = i * self.batch_size + 1
-            end = min((i + 1) * self.batch_size, total)
-            log.info(
-                f"Updating beacon chain data for minipools [{start}, {end}]/{total}"
-            )
-            beacon_data = (await bacon.get_validators_by_ids("head", ids=pubkey_batch))[
-                "data"
-            ]
-            data = {}
-            for d in beacon_data:
-                v = d["validator"]
-                data[v["pubkey"]] = {
-                    "validator_index": int(d["index"]),
-                    "beacon": {
-                        "status": d["status"],
-                        "balance": solidity.to_float(d["balance"], 9),
-                        "effective_balance": solidity.to_float(
-                            v["effective_balance"], 9
-                        ),
-                        "slashed": v["slashed"],
-                        "activation_eligibility_epoch": _parse_epoch(
-                            v["activation_eligibility_epoch"]
-                        ),
-                        "activation_epoch": _parse_epoch(v["activation_epoch"]),
-                        "exit_epoch": _parse_epoch(v["exit_epoch"]),
-                        "withdrawable_epoch": _parse_epoch(v["withdrawable_epoch"]),
-                    },
-                }
-            if data:
-                await self.bot.db.minipools.bulk_write(
-                    [UpdateMany({"pubkey": pk}, {"$set": d}) for pk, d in data.items()],
-                    ordered=False,
-                )
+    async def update_dynamic_minipool_beacon_data(self) -> int:
+        return await self._sync_beacon_data(self.bot.db.minipools, "minipools")
 
     # -- Megapool validator tasks --
 
-    @timerun_async
-    async def add_untracked_megapool_validators(self) -> None:
+    async def add_untracked_megapool_validators(self) -> int:
         # get deployed megapools with their on-chain validator count
         nodes = await self.bot.db.node_operators.find(
             {"megapool.deployed": True, "megapool.validator_count": {"$gt": 0}},
             {"address": 1, "megapool.address": 1, "megapool.validator_count": 1},
         ).to_list()
         if not nodes:
-            return
+            return 0
 
+        written = 0
         for node in nodes:
             megapool_addr = node["megapool"]["address"]
             on_chain_count = node["megapool"]["validator_count"]
@@ -814,19 +935,21 @@ class DBUpkeepTask(commands.Cog):
                         doc.update(_unpack_validator_info(info))
                     docs.append(doc)
                 if docs:
-                    await self.bot.db.megapool_validators.insert_many(
+                    result = await self.bot.db.megapool_validators.insert_many(
                         docs, ordered=False
                     )
+                    written += len(result.inserted_ids)
+        return written
 
-    @timerun_async
-    async def add_static_megapool_deposit_data(self) -> None:
+    async def add_static_megapool_deposit_data(self) -> int:
         validators = await self.bot.db.megapool_validators.find(
             {"deposit_time": {"$exists": False}},
             {"megapool": 1, "validator_id": 1},
         ).to_list()
         if not validators:
-            return
+            return 0
 
+        written = 0
         dp = await rp.get_contract_by_name("rocketDepositPool")
         saturn_upgrade_block = BlockNumber(24_479_994)
         to_block = await w3.eth.get_block_number()
@@ -869,19 +992,22 @@ class DBUpkeepTask(commands.Cog):
                     )
                 )
             if ops:
-                await self.bot.db.megapool_validators.bulk_write(ops, ordered=False)
+                written += _written(
+                    await self.bot.db.megapool_validators.bulk_write(ops, ordered=False)
+                )
+        return written
 
-    @timerun_async
-    async def update_dynamic_megapool_validator_data(self) -> None:
-        mp_abi = await rp.get_abi_by_name("rocketMegapoolDelegate")
+    async def update_dynamic_megapool_validator_data(self) -> int:
+        mp_abi = await rp.get_parsed_abi_by_name("rocketMegapoolDelegate")
 
         validators = await self.bot.db.megapool_validators.find(
             {"status": {"$nin": ["exited", "dissolved"]}},
             {"megapool": 1, "validator_id": 1},
         ).to_list()
         if not validators:
-            return
+            return 0
 
+        written = 0
         total = len(validators)
         for i, batch in enumerate(as_chunks(validators, self.batch_size)):
             start = i * self.batch_size + 1
@@ -905,51 +1031,20 @@ class DBUpkeepTask(commands.Cog):
                         )
                     )
             if ops:
-                await self.bot.db.megapool_validators.bulk_write(ops, ordered=False)
+                written += _written(
+                    await self.bot.db.megapool_validators.bulk_write(ops, ordered=False)
+                )
+        return written
 
-    @timerun
-    async def update_dynamic_megapool_validator_beacon_data(self) -> None:
-        pubkeys = await self.bot.db.megapool_validators.distinct(
-            "pubkey", {"beacon.status": {"$ne": "withdrawal_done"}}
+    async def update_dynamic_megapool_validator_beacon_data(self) -> int:
+        return await self._sync_beacon_data(
+            self.bot.db.megapool_validators, "megapool validators"
         )
-        pubkeys = [pk for pk in pubkeys if pk is not None]
-        if not pubkeys:
-            return
-        total = len(pubkeys)
-        for i, pubkey_batch in enumerate(as_chunks(pubkeys, self.batch_size)):
-            start = i * self.batch_size + 1
-            end = min((i + 1) * self.batch_size, total)
-            log.debug(
-                f"Updating beacon data for megapool validators [{start}, {end}]/{total}"
-            )
-            beacon_data = (await bacon.get_validators_by_ids("head", ids=pubkey_batch))[
-                "data"
-            ]
-            data = {}
-            for d in beacon_data:
-                v = d["validator"]
-                data[v["pubkey"]] = {
-                    "validator_index": int(d["index"]),
-                    "beacon": {
-                        "status": d["status"],
-                        "balance": solidity.to_float(d["balance"], 9),
-                        "effective_balance": solidity.to_float(
-                            v["effective_balance"], 9
-                        ),
-                        "slashed": v["slashed"],
-                        "activation_eligibility_epoch": _parse_epoch(
-                            v["activation_eligibility_epoch"]
-                        ),
-                        "activation_epoch": _parse_epoch(v["activation_epoch"]),
-                        "exit_epoch": _parse_epoch(v["exit_epoch"]),
-                        "withdrawable_epoch": _parse_epoch(v["withdrawable_epoch"]),
-                    },
-                }
-            if data:
-                await self.bot.db.megapool_validators.bulk_write(
-                    [UpdateMany({"pubkey": pk}, {"$set": d}) for pk, d in data.items()],
-                    ordered=False,
-                )
+
+    async def refresh_validator_registry(self) -> int:
+        await validator_registry.refresh(self.bot.db)
+        # only refreshes memory
+        return 0
 
 
 async def setup(self: RocketWatch) -> None:
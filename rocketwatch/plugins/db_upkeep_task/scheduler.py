@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+log = logging.getLogger("rocketwatch.db_upkeep_task")
+
+
+@dataclass
+class StageStats:
+    runs: int = 0
+    failures: int = 0
+    running: bool = False
+    last_start: float | None = None
+    last_duration: float | None = None
+    # error of the latest run, None if it succeeded
+    last_error: str | None = None
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[], Awaitable[None]]
+    interval: timedelta
+    depends_on: tuple[str, ...] = ()
+    stats: StageStats = field(default_factory=StageStats)
+
+    def is_due(self, now: float) -> bool:
+        last_start = self.stats.last_start
+        return last_start is None or now - last_start >= self.interval.total_seconds()
+
+
+class StageScheduler:
+    """Runs upkeep stages on their own intervals.
+
+    A due stage starts once none of its dependencies is due, running or
+    failed on its latest run. Stages that don't wait on each other run
+    concurrently, at most `max_concurrent` at a time. Every stage sends its
+    RPC batches one after another, so this also bounds the load on the nodes.
+    """
+
+    def __init__(self, stages: Iterable[Stage], max_concurrent: int = 3) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in self.stages.values():
+            for name in stage.depends_on:
+                if name not in self.stages:
+                    raise ValueError(f"{stage.name} depends on unknown stage {name}")
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _is_ready(self, stage: Stage, now: float) -> bool:
+        if stage.stats.running or not stage.is_due(now):
+            return False
+        for name in stage.depends_on:
+            dependency = self.stages[name]
+            if (
+                dependency.stats.running
+                or dependency.is_due(now)
+                or dependency.stats.last_error is not None
+            ):
+                return False
+        return True
+
+    def start_due_stages(self) -> list[asyncio.Task[None]]:
+        now = time.time()
+        started = []
+        for stage in self.stages.values():
+            if not self._is_ready(stage, now):
+                continue
+            # set before the task is scheduled so dependents see it right away
+            stage.stats.running = True
+            task = asyncio.create_task(self._run(stage))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started.append(task)
+        return started
+
+    async def _run(self, stage: Stage) -> None:
+        stats = stage.stats
+        try:
+            async with self._slots:
+                stats.last_start = time.time()
+                start = time.perf_counter()
+                try:
+                    await stage.run()
+                    stats.last_error = None
+                except Exception as err:
+                    stats.failures += 1
+                    stats.last_error = repr(err)
+                    log.warning(f"Stage {stage.name} failed: {err!r}")
+                finally:
+                    stats.runs += 1
+                    stats.last_duration = time.perf_counter() - start
+                    log.info(f"Stage {stage.name} took {stats.last_duration:.1f}s")
+        finally:
+            stats.running = False
@@ -12,11 +12,15 @@ from eth_typing import HexStr
 from web3.types import EventData, LogReceipt
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.plugins.db_upkeep_task.db_upkeep_task import DBUpkeepTask
+from rocketwatch.utils.block_cache import block_cache
+from rocketwatch.utils.call_cache import call_cache
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.embeds import Embed
+from rocketwatch.utils.event_queue import encode_event, store_images
 from rocketwatch.utils.file import TextFile
 from rocketwatch.utils.rocketpool import rp
-from rocketwatch.utils.shared_w3 import w3
+from rocketwatch.utils.shared_w3 import get_endpoint_health, w3
 
 log = logging.getLogger("rocketwatch.debug")
 
@@ -128,6 +132,84 @@ class Debug(Cog):
         else:
             await interaction.followup.send(content="```No revert reason Available```")
 
+    @command()
+    @guilds(cfg.discord.owner.server_id)
+    @is_owner()
+    async def endpoint_health(self, interaction: Interaction) -> None:
+        """
+        Show latency and error stats of the configured RPC endpoints.
+        """
+        await interaction.response.defer(ephemeral=True)
+        embed = Embed(title="Endpoint Health")
+        for client, endpoints in get_endpoint_health().items():
+            lines = []
+            for health in endpoints:
+                latency = (
+                    f"{health.latency * 1000:.0f} ms"
+                    if health.latency is not None
+                    else "n/a"
+                )
+                status = "🟢" if health.healthy else "🔴"
+                lines.append(
+                    f"{status} `{health.name}`: {latency},"
+                    f" {health.failures}/{health.requests} failed"
+                )
+            embed.add_field(name=client, value="\n".join(lines), inline=False)
+        if not embed.fields:
+            embed.description = "No clients connected yet."
+        await interaction.followup.send(embed=embed)
+
+    @command()
+    @guilds(cfg.discord.owner.server_id)
+    @is_owner()
+    async def cache_stats(self, interaction: Interaction) -> None:
+        """
+        Show hit rates of the shared chain data caches.
+        """
+        await interaction.response.defer(ephemeral=True)
+        embed = Embed(title="Cache Stats")
+        for name, cache in (("Contract calls", call_cache), ("Blocks", block_cache)):
+            total = cache.hits + cache.misses
+            rate = f"{cache.hits / total:.1%}" if total else "n/a"
+            embed.add_field(
+                name=name, value=f"{cache.hits}/{total} hits ({rate})", inline=False
+            )
+        await interaction.followup.send(embed=embed)
+
+    @command()
+    @guilds(cfg.discord.owner.server_id)
+    @is_owner()
+    async def upkeep_stats(self, interaction: Interaction) -> None:
+        """
+        Show durations and failures of the DB upkeep stages.
+        """
+        await interaction.response.defer(ephemeral=True)
+        embed = Embed(title="DB Upkeep Stages")
+        upkeep = cast(DBUpkeepTask | None, self.bot.get_cog("DBUpkeepTask"))
+        if upkeep is None:
+            embed.description = "DB upkeep task isn't loaded."
+            await interaction.followup.send(embed=embed)
+            return
+
+        lines = []
+        for stage in upkeep.scheduler.stages.values():
+            stats = stage.stats
+            if stats.running:
+                status = "🔄"
+            elif stats.last_start is None:
+                status = "⚪"
+            else:
+                status = "🔴" if stats.last_error else "🟢"
+            line = f"{status} `{stage.name}`"
+            if stats.last_start is not None and stats.last_duration is not None:
+                line += (
+                    f": {stats.last_duration:.1f}s <t:{int(stats.last_start)}:R>,"
+                    f" {stats.failures}/{stats.runs} failed"
+                )
+            lines.append(line)
+        embed.description = "\n".join(lines)
+        await interaction.followup.send(embed=embed)
+
     @command()
     @guilds(cfg.discord.owner.server_id)
     @is_owner()
@@ -252,9 +334,6 @@ class Debug(Cog):
     async def restore_missed_events(
         self, interaction: Interaction, tx_hash: str
     ) -> None:
-        import pickle
-        from datetime import datetime
-
         from rocketwatch.plugins.log_events.log_events import LogEvents
 
         await interaction.response.defer(ephemeral=True)
@@ -281,23 +360,9 @@ class Debug(Cog):
             channel_id = (
                 channel_candidates[0] if channel_candidates else channels["default"]
             )
-            await self.bot.db.event_queue.insert_one(
-                {
-                    "_id": event.unique_id,
-                    "embed": pickle.dumps(event.embed),
-                    "topic": event.topic,
-                    "event_name": event.event_name,
-                    "block_number": event.block_number,
-                    "score": event.get_score(),
-                    "time_seen": datetime.now(UTC),
-                    "image": pickle.dumps(event.image) if event.image else None,
-                    "thumbnail": pickle.dumps(event.thumbnail)
-                    if event.thumbnail
-                    else None,
-                    "channel_id": channel_id,
-                    "message_id": None,
-                }
-            )
+            document, images = encode_event(event, channel_id)
+            await store_images(self.bot.db, images)
+            await self.bot.db.event_queue.insert_one(document)
             await interaction.followup.send(embed=event.embed)
         await interaction.followup.send(content="Done")
 
@@ -11,6 +11,7 @@ from web3.types import EventData
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
+from rocketwatch.utils.block_cache import block_cache
 from rocketwatch.utils.embeds import (
     CustomColors,
     Embed,
@@ -604,8 +605,8 @@ class DexTrades(EventPlugin):
                 continue
 
             try:
-                tx = await w3.eth.get_transaction(tx_hash)
-                receipt = await w3.eth.get_transaction_receipt(tx_hash)
+                tx = await block_cache.get_transaction(tx_hash)
+                receipt = await block_cache.get_transaction_receipt(tx_hash)
                 tx_from = w3.to_checksum_address(tx["from"])
                 graph = await self._build_trade_graph(
                     tx_hash, tx_from, list(receipt["logs"])
@@ -899,7 +900,7 @@ class DexTrades(EventPlugin):
 
             # Fetch tx sender since Balancer Swap event has no user field
             tx_hash = HexStr(event["transactionHash"].to_0x_hex())
-            tx = await w3.eth.get_transaction(tx_hash)
+            tx = await block_cache.get_transaction(tx_hash)
             owner = w3.to_checksum_address(tx["from"])
 
             swaps.append(
@@ -967,7 +968,7 @@ class DexTrades(EventPlugin):
             token_out = w3.to_checksum_address(args["tokenOut"])
 
             tx_hash = HexStr(event["transactionHash"].to_0x_hex())
-            tx = await w3.eth.get_transaction(tx_hash)
+            tx = await block_cache.get_transaction(tx_hash)
             owner = w3.to_checksum_address(tx["from"])
 
             swaps.append(
@@ -1073,7 +1074,7 @@ class DexTrades(EventPlugin):
                 sell_token, sell_amount = token0, abs(amount0)
 
             tx_hash = HexStr(event["transactionHash"].to_0x_hex())
-            tx = await w3.eth.get_transaction(tx_hash)
+            tx = await block_cache.get_transaction(tx_hash)
             owner = w3.to_checksum_address(tx["from"])
 
             swaps.append(
@@ -1,29 +1,47 @@
 import asyncio
 import logging
-import pickle
 import time
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any
+from io import BytesIO
+from typing import Any, NamedTuple
 
 import discord
 import pymongo
 from cronitor import Monitor
+from discord import File
 from discord.abc import Messageable
 from discord.ext import commands, tasks
 from eth_typing import BlockNumber
+from pymongo import UpdateOne
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.plugins.support_utils.support_utils import generate_template_embed
+from rocketwatch.utils.block_cache import block_cache
+from rocketwatch.utils.call_cache import call_cache
 from rocketwatch.utils.config import StatusMessageConfig, cfg
 from rocketwatch.utils.embeds import CustomColors, Embed
-from rocketwatch.utils.event import EventPlugin
+from rocketwatch.utils.event import Event, EventPlugin
+from rocketwatch.utils.event_queue import (
+    decode_embed,
+    decode_image,
+    encode_event,
+    load_images,
+    store_images,
+)
 from rocketwatch.utils.shared_w3 import w3
 from rocketwatch.utils.status import StatusPlugin
 
 log = logging.getLogger("rocketwatch.event_core")
 
 
+class BlockWindow(NamedTuple):
+    from_block: BlockNumber
+    to_block: BlockNumber
+    close_to_head: bool
+
+
 class EventCore(commands.Cog):
     class State(Enum):
         OK = 0
@@ -41,6 +59,9 @@ class EventCore(commands.Cog):
         self.at_head: bool = False
         self._catchup_start_block: BlockNumber | None = None
         self.block_batch_size: int = cfg.events.block_batch_size
+        self.max_inflight_batches: int = max(1, cfg.events.max_inflight_batches)
+        self.suppressed_duplicates: int = 0
+        self.message_flush_size: int = 20
         self.monitor = Monitor("event-core", api_key=cfg.secrets.cronitor)
         self.task.start()
 
@@ -88,108 +109,181 @@ class EventCore(commands.Cog):
 
         latest_block = await w3.eth.get_block_number()
         self.latest_block = latest_block
+        block_cache.start_cycle(latest_block)
+        call_cache.advance_head(latest_block)
         submodules = [
             cog for cog in self.bot.cogs.values() if isinstance(cog, EventPlugin)
         ]
         log.debug(f"Running {len(submodules)} submodules")
+        # only reconfigurations within this cycle matter
+        for sm in submodules:
+            sm.reconfigured_blocks.clear()
 
         if self.at_head:
             # already caught up to head, just fetch new events
-            close_to_head = True
-            to_block = latest_block
             coroutines = [sm.get_new_events() for sm in submodules]
             # prevent losing state if process is interrupted before updating db
             self.at_head = False
             self.head_block = cfg.events.genesis
-        else:
-            last_event_entry = (
-                await self.bot.db.event_queue.find()
-                .sort("block_number", pymongo.DESCENDING)
-                .limit(1)
-                .to_list(None)
-            )
-            if last_event_entry:
-                self.head_block = max(
-                    self.head_block, last_event_entry[0]["block_number"]
-                )
+            results = await asyncio.gather(*coroutines)
+            await self._store_events(results)
+            await self._mark_checked(latest_block, close_to_head=True)
+            return
+
+        last_event_entry = (
+            await self.bot.db.event_queue.find()
+            .sort("block_number", pymongo.DESCENDING)
+            .limit(1)
+            .to_list(None)
+        )
+        if last_event_entry:
+            self.head_block = max(self.head_block, last_event_entry[0]["block_number"])
 
-            last_checked_entry = await self.bot.db.last_checked_block.find_one(
-                {"_id": "events"}
+        last_checked_entry = await self.bot.db.last_checked_block.find_one(
+            {"_id": "events"}
+        )
+        if last_checked_entry:
+            self.head_block = max(self.head_block, last_checked_entry["block"])
+
+        if self._catchup_start_block is None:
+            self._catchup_start_block = self.head_block
+
+        windows = self._plan_windows(latest_block)
+        if not windows:
+            log.warning(
+                f"Skipping empty block range [{self.head_block + 1}, {latest_block}]"
             )
-            if last_checked_entry:
-                self.head_block = max(self.head_block, last_checked_entry["block"])
+            return
 
-            if self._catchup_start_block is None:
-                self._catchup_start_block = self.head_block
+        await self._catch_up(submodules, windows)
 
-            if (latest_block - self.head_block) < self.block_batch_size:
+    def _plan_windows(self, latest_block: BlockNumber) -> list[BlockWindow]:
+        windows: list[BlockWindow] = []
+        head_block = self.head_block
+        while len(windows) < self.max_inflight_batches:
+            from_block = BlockNumber(head_block + 1)
+            if (latest_block - head_block) < self.block_batch_size:
                 # close enough to catch up in a single request
-                close_to_head = True
-                to_block = latest_block
-            else:
-                # too far, advance one batch
-                close_to_head = False
-                to_block = BlockNumber(self.head_block + self.block_batch_size)
+                if from_block <= latest_block:
+                    windows.append(BlockWindow(from_block, latest_block, True))
+                break
 
-            from_block = BlockNumber(self.head_block + 1)
-            if to_block < from_block:
-                log.warning(f"Skipping empty block range [{from_block}, {to_block}]")
-                return
+            # too far, advance one batch
+            head_block = BlockNumber(head_block + self.block_batch_size)
+            windows.append(BlockWindow(from_block, head_block, False))
 
-            log.info(f"Checking block range [{from_block}, {to_block}]")
+        return windows
 
-            coroutines = []
+    async def _catch_up(
+        self, submodules: list[EventPlugin], windows: list[BlockWindow]
+    ) -> None:
+        """Fetch all windows concurrently, but commit them strictly in block order.
+
+        A plugin reconfiguring itself (e.g. after a contract upgrade) swaps state
+        that every window still in flight decodes with. Once that happens, all
+        uncommitted windows are fetched again, one at a time.
+        """
+
+        async def fetch(window: BlockWindow) -> list[list[Event]]:
+            log.info(f"Checking block range [{window.from_block}, {window.to_block}]")
+            return await asyncio.gather(
+                *[
+                    sm.get_past_events(
+                        from_block=window.from_block, to_block=window.to_block
+                    )
+                    for sm in submodules
+                ]
+            )
+
+        remaining: list[BlockWindow] = []
+        tasks = [asyncio.create_task(fetch(window)) for window in windows]
+        try:
+            for i, (window, task) in enumerate(zip(windows, tasks, strict=True)):
+                results = await task
+                if (block := self._get_reconfigured_block(submodules)) is not None:
+                    log.info(
+                        f"Plugins reconfigured at block {block}, refetching "
+                        f"from block {window.from_block} sequentially"
+                    )
+                    remaining = windows[i:]
+                    break
+                await self._commit_window(submodules, window, results)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for window in remaining:
+            await self._commit_window(submodules, window, await fetch(window))
+
+    async def _commit_window(
+        self,
+        submodules: list[EventPlugin],
+        window: BlockWindow,
+        results: list[list[Event]],
+    ) -> None:
+        log.debug(f"{window.close_to_head = }, {window.to_block = }")
+        if window.close_to_head:
             for sm in submodules:
-                coroutines.append(
-                    sm.get_past_events(from_block=from_block, to_block=to_block)
-                )
-                if close_to_head:
-                    sm.start_tracking(BlockNumber(to_block + 1))
+                sm.start_tracking(BlockNumber(window.to_block + 1))
 
-        log.debug(f"{close_to_head = }, {to_block = }")
+        await self._store_events(results)
+        await self._mark_checked(window.to_block, window.close_to_head)
 
-        results = await asyncio.gather(*coroutines)
+    @staticmethod
+    def _get_reconfigured_block(submodules: list[EventPlugin]) -> BlockNumber | None:
+        return min(
+            (block for sm in submodules for block in sm.reconfigured_blocks),
+            default=None,
+        )
 
+    async def _store_events(self, results: list[list[Event]]) -> None:
         channels = self.channels
-        events: list[dict[str, Any]] = []
-
-        for result in results:
-            for event in result:
-                if await self.bot.db.event_queue.find_one({"_id": event.unique_id}):
-                    log.debug(f"Event {event} already exists, skipping")
-                    continue
-
-                # select channel dynamically from config based on event_name prefix
-                channel_candidates = [
-                    value
-                    for key, value in channels.items()
-                    if event.event_name.startswith(key)
-                ]
-                channel_id = (
-                    channel_candidates[0] if channel_candidates else channels["default"]
-                )
-                events.append(
-                    {
-                        "_id": event.unique_id,
-                        "embed": pickle.dumps(event.embed),
-                        "topic": event.topic,
-                        "event_name": event.event_name,
-                        "block_number": event.block_number,
-                        "score": event.get_score(),
-                        "time_seen": datetime.now(UTC),
-                        "image": pickle.dumps(event.image) if event.image else None,
-                        "thumbnail": pickle.dumps(event.thumbnail)
-                        if event.thumbnail
-                        else None,
-                        "channel_id": channel_id,
-                        "message_id": None,
-                    }
-                )
+        gathered = [event for result in results for event in result]
+        if not gathered:
+            log.info("0 new events gathered")
+            return
 
-        log.info(f"{len(events)} new events gathered, updating DB")
+        # dedup the whole batch against the queue in a single round trip
+        seen_ids: set[str] = set(
+            await self.bot.db.event_queue.distinct(
+                "_id", {"_id": {"$in": [event.unique_id for event in gathered]}}
+            )
+        )
+        events: list[dict[str, Any]] = []
+        images: dict[str, bytes] = {}
+
+        for event in gathered:
+            if event.unique_id in seen_ids:
+                log.debug(f"Event {event} already exists, skipping")
+                continue
+            seen_ids.add(event.unique_id)
+
+            # select channel dynamically from config based on event_name prefix
+            channel_candidates = [
+                value
+                for key, value in channels.items()
+                if event.event_name.startswith(key)
+            ]
+            channel_id = (
+                channel_candidates[0] if channel_candidates else channels["default"]
+            )
+            document, event_images = encode_event(event, channel_id)
+            events.append(document)
+            images.update(event_images)
+
+        duplicates = len(gathered) - len(events)
+        self.suppressed_duplicates += duplicates
+        log.info(
+            f"{len(events)} new events gathered, {duplicates} duplicates suppressed "
+            f"({self.suppressed_duplicates} total), updating DB"
+        )
         if events:
+            # images first, so a queued event never references a missing image
+            await store_images(self.bot.db, images)
             await self.bot.db.event_queue.insert_many(events)
 
+    async def _mark_checked(self, to_block: BlockNumber, close_to_head: bool) -> None:
         self.head_block = to_block
         self.at_head = close_to_head
         if close_to_head:
@@ -208,59 +302,93 @@ class EventCore(commands.Cog):
             log.debug("No pending events in queue")
             return
 
-        async def try_load(_entry: dict[str, Any], _key: str) -> Any | None:
-            try:
-                serialized = _entry.get(_key)
-                return pickle.loads(serialized) if serialized else None
-            except Exception as err:
-                await self.bot.report_error(err)
-                return None
-
-        for channel_id in channels:
-            db_events: list[dict[str, Any]] = (
-                await self.bot.db.event_queue.find(
-                    {"channel_id": channel_id, "message_id": None}
-                )
-                .sort("score", pymongo.ASCENDING)
-                .to_list(None)
+        # channels are independent, only events within a channel need to stay ordered
+        results = await asyncio.gather(
+            *[self._process_channel_queue(channel_id) for channel_id in channels],
+            return_exceptions=True,
+        )
+        errors: list[Exception] = []
+        for result in results:
+            if isinstance(result, Exception):
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                # a cancelled channel must not pass as processed
+                raise result
+        for error in errors[1:]:
+            await self.bot.report_error(error)
+        if errors:
+            raise errors[0]
+
+        log.info("Processed all events in queue")
+
+    async def _try_load[T](self, decode: Callable[..., T], *args: Any) -> T | None:
+        try:
+            return decode(*args)
+        except Exception as err:
+            await self.bot.report_error(err)
+            return None
+
+    async def _process_channel_queue(self, channel_id: int) -> None:
+        db_events: list[dict[str, Any]] = (
+            await self.bot.db.event_queue.find(
+                {"channel_id": channel_id, "message_id": None}
             )
+            .sort("score", pymongo.ASCENDING)
+            .to_list(None)
+        )
 
-            log.debug(f"Found {len(db_events)} events for channel {channel_id}.")
-            channel = await self.bot.get_or_fetch_channel(channel_id)
-            assert isinstance(channel, Messageable)
+        log.debug(f"Found {len(db_events)} events for channel {channel_id}.")
+        channel = await self.bot.get_or_fetch_channel(channel_id)
+        assert isinstance(channel, Messageable)
 
-            for state_message in await self.bot.db.state_messages.find(
-                {"channel_id": channel_id}
-            ).to_list(None):
-                msg = await channel.fetch_message(state_message["message_id"])
-                await msg.delete()
-                await self.bot.db.state_messages.delete_one({"channel_id": channel_id})
+        for state_message in await self.bot.db.state_messages.find(
+            {"channel_id": channel_id}
+        ).to_list(None):
+            msg = await channel.fetch_message(state_message["message_id"])
+            await msg.delete()
+            await self.bot.db.state_messages.delete_one({"channel_id": channel_id})
 
+        images = await load_images(self.bot.db, db_events)
+        sent_messages: list[UpdateOne] = []
+        try:
             for event_entry in db_events:
-                embed: Embed | None = await try_load(event_entry, "embed")
+                embed: Embed | None = await self._try_load(decode_embed, event_entry)
                 if not embed:
                     continue
 
                 files = []
 
-                if embed and (image := await try_load(event_entry, "image")):
+                if image := await self._try_load(
+                    decode_image, event_entry, "image", images
+                ):
                     file_name = f"{event_entry['event_name']}_img.png"
-                    files.append(image.to_file(file_name))
+                    files.append(File(BytesIO(image), file_name))
                     embed.set_image(url=f"attachment://{file_name}")
 
-                if embed and (thumbnail := await try_load(event_entry, "thumbnail")):
+                if thumbnail := await self._try_load(
+                    decode_image, event_entry, "thumbnail", images
+                ):
                     file_name = f"{event_entry['event_name']}_thumb.png"
-                    files.append(thumbnail.to_file(file_name))
+                    files.append(File(BytesIO(thumbnail), file_name))
                     embed.set_thumbnail(url=f"attachment://{file_name}")
 
-                # post event message
+                # post event message, discord.py paces sends per channel bucket
                 msg = await channel.send(embed=embed, files=files)
-                # add message id to event
-                await self.bot.db.event_queue.update_one(
-                    {"_id": event_entry["_id"]}, {"$set": {"message_id": msg.id}}
+                sent_messages.append(
+                    UpdateOne(
+                        {"_id": event_entry["_id"]}, {"$set": {"message_id": msg.id}}
+                    )
                 )
-
-        log.info("Processed all events in queue")
+                # keep the unrecorded tail short in case the process dies mid-queue
+                if len(sent_messages) >= self.message_flush_size:
+                    await self.bot.db.event_queue.bulk_write(
+                        sent_messages, ordered=False
+                    )
+                    sent_messages = []
+        finally:
+            # record everything that made it out, even if a later send failed
+            if sent_messages:
+                await self.bot.db.event_queue.bulk_write(sent_messages, ordered=False)
 
     async def update_status_messages(self) -> None:
         configs = cfg.events.status_message
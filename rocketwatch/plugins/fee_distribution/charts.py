@@ -0,0 +1,34 @@
+from typing import Any
+
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+
+def plot_fee_distribution(minipools: dict[int, list[dict[str, Any]]]) -> Figure:
+    fig, axs = plt.subplots(1, 2)
+    for i, (bond, entries) in enumerate(minipools.items()):
+        labels = []
+        sizes = []
+
+        for entry in entries:
+            fee_percentage = entry["_id"] * 100
+            labels.append(f"{fee_percentage:.0f}%")
+            sizes.append(entry["count"])
+
+        total = sum(sizes)
+        # avoid overlapping labels for small slices
+        for j in range(len(sizes)):
+            if sizes[j] < 0.05 * total:
+                labels[j] = ""
+
+        ax = axs[i]
+        ax.set_title(f"{bond} ETH")
+        ax.pie(
+            sizes,
+            labels=labels,
+            autopct=lambda p, _total=total: (
+                f"{p * _total / 100:.0f}" if (p >= 5) else ""
+            ),
+        )
+    fig.tight_layout()
+    return fig
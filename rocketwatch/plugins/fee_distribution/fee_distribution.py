@@ -1,18 +1,18 @@
 import logging
-from io import BytesIO
 from typing import Any, Literal
 
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command
 from discord.ext import commands
-from matplotlib import pyplot as plt
-from matplotlib.figure import Figure
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed
 from rocketwatch.utils.readable import render_tree_legacy
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import plot_fee_distribution
+
 log = logging.getLogger("rocketwatch.fee_distribution")
 
 
@@ -50,34 +50,6 @@ class FeeDistribution(commands.Cog):
             tree[f"{bond} ETH"] = subtree
         return tree
 
-    async def _get_pie(self) -> Figure:
-        fig, axs = plt.subplots(1, 2)
-        for i, bond in enumerate((8, 16)):
-            labels = []
-            sizes = []
-
-            for entry in await self._get_minipools(bond):
-                fee_percentage = entry["_id"] * 100
-                labels.append(f"{fee_percentage:.0f}%")
-                sizes.append(entry["count"])
-
-            total = sum(sizes)
-            # avoid overlapping labels for small slices
-            for j in range(len(sizes)):
-                if sizes[j] < 0.05 * total:
-                    labels[j] = ""
-
-            ax = axs[i]
-            ax.set_title(f"{bond} ETH")
-            ax.pie(
-                sizes,
-                labels=labels,
-                autopct=lambda p, _total=total: (
-                    f"{p * _total / 100:.0f}" if (p >= 5) else ""
-                ),
-            )
-        return fig
-
     @command()
     async def fee_distribution(
         self, interaction: Interaction, mode: Literal["tree", "pie"] = "pie"
@@ -95,17 +67,13 @@ class FeeDistribution(commands.Cog):
             e.description = f"```\n{render_tree_legacy(tree, 'Minipools')}\n```"
             await interaction.followup.send(embed=e)
         elif mode == "pie":
-            img = BytesIO()
-            fig = await self._get_pie()
-            fig.tight_layout()
-            fig.savefig(img, format="png")
-            img.seek(0)
-            fig.clear()
-            plt.close()
-
+            minipools = {bond: await self._get_minipools(bond) for bond in (8, 16)}
             file_name = "fee_distribution.png"
+            file = await chart_renderer.render_file(
+                plot_fee_distribution, minipools, filename=file_name
+            )
             e.set_image(url=f"attachment://{file_name}")
-            await interaction.followup.send(embed=e, file=File(img, filename=file_name))
+            await interaction.followup.send(embed=e, file=file)
 
 
 async def setup(bot: RocketWatch) -> None:
@@ -22,7 +22,9 @@ from web3.logs import DISCARD
 from web3.types import EventData, FilterParams, LogReceipt, TxReceipt, Wei
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.block_cache import block_cache
 from rocketwatch.utils.config import cfg
+from rocketwatch.utils.embeds import prefetch_explorer_urls
 from rocketwatch.utils.event import Event, EventPlugin
 from rocketwatch.utils.rocketpool import NoAddressFound, rp
 from rocketwatch.utils.shared_w3 import w3
@@ -37,6 +39,9 @@ from .event_definitions import (
 
 log = logging.getLogger("rocketwatch.log_events")
 
+# blocks with at least this many relevant transactions get all receipts at once
+_RECEIPT_PREFETCH_THRESHOLD = 3
+
 _DUMMY_RECEIPT: TxReceipt = {
     "blockHash": HexBytes(HASH_ZERO),
     "blockNumber": BlockNumber(0),
@@ -411,6 +416,8 @@ class LogEvents(EventPlugin):
             self._global_event_map,
         )
 
+        # recorded before the swap, so windows decoding concurrently are refetched
+        self.reconfigured_blocks.append(contract_upgrade_block)
         try:
             await rp.flush()
             await self.async_init()
@@ -440,7 +447,9 @@ class LogEvents(EventPlugin):
             events, self._topic_map
         )
         log.debug("Processing %d events", len(aggregated))
+        await self._prefetch_receipts(aggregated)
 
+        resolved_events: list[tuple[dict[str, Any], dict[str, Any], LogEvent, Any]] = []
         for event in aggregated:
             if event.get("removed", False):
                 continue
@@ -524,7 +533,18 @@ class LogEvents(EventPlugin):
             resolved = await event_cls.resolve(args, event_data)
             if resolved is None:
                 continue
-            event_cls = resolved
+            resolved_events.append((processed, args, resolved, args_hash))
+
+        # look up every address the embeds will link in one go
+        await prefetch_explorer_urls(
+            value
+            for _, args, _, _ in resolved_events
+            for value in args.values()
+            if isinstance(value, str) and w3.is_checksum_address(value)
+        )
+
+        for processed, args, event_cls, args_hash in resolved_events:
+            event_data = cast(LogEventData, processed)
             event_name: str = event_cls.event_name
 
             # Get receipt for mainnet fee calculation
@@ -532,9 +552,8 @@ class LogEvents(EventPlugin):
             if cfg.rocketpool.chain == "mainnet":
                 tx_hash = processed["transactionHash"]
                 if isinstance(tx_hash, str):
-                    receipt = await w3.eth.get_transaction_receipt(HexStr(tx_hash))
-                else:
-                    receipt = await w3.eth.get_transaction_receipt(tx_hash)
+                    tx_hash = HexStr(tx_hash)
+                receipt = await block_cache.get_transaction_receipt(tx_hash)
 
             try:
                 embeds = await event_cls.build_embeds(args, event_data, receipt)
@@ -582,12 +601,27 @@ class LogEvents(EventPlugin):
 
         return messages, upgrade_block
 
+    async def _prefetch_receipts(self, events: list[dict[str, Any]]) -> None:
+        """Fetch receipts block-wise where many transactions need one anyway."""
+        if cfg.rocketpool.chain != "mainnet":
+            return
+        tx_hashes: dict[int, set[Any]] = {}
+        for event in events:
+            tx_hashes.setdefault(event["blockNumber"], set()).add(
+                event["transactionHash"]
+            )
+        await block_cache.prefetch_block_receipts(
+            block
+            for block, hashes in tx_hashes.items()
+            if len(hashes) >= _RECEIPT_PREFETCH_THRESHOLD
+        )
+
     async def _enrich_global_event(self, event: dict[str, Any]) -> bool:
         """Enrich a global event with minipool/megapool validation, pubkey, and sender.
 
         Returns False if the event should be skipped.
         """
-        receipt = await w3.eth.get_transaction_receipt(event["transactionHash"])
+        receipt = await block_cache.get_transaction_receipt(event["transactionHash"])
 
         is_minipool_event = await rp.is_minipool(
             event["address"]
@@ -0,0 +1,32 @@
+from typing import Any
+
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+
+def plot_monthly_usage(
+    command_usage: list[dict[str, Any]], event_emission: list[dict[str, Any]]
+) -> Figure:
+    # create a new figure
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
+
+    # plot the command usage as bars
+    ax1.bar(
+        [f"{x['_id']['year']}-{x['_id']['month']:0>2}" for x in command_usage],
+        [x["total"] for x in command_usage],
+    )
+    ax1.set_title("Command Usage")
+    ax1.tick_params(axis="x", rotation=45)
+
+    # plot the event usage
+    ax2.bar(
+        [f"{x['_id']['year']}-{x['_id']['month']:0>2}" for x in event_emission],
+        [x["total"] for x in event_emission],
+    )
+    ax2.set_title("Event Emission")
+    ax2.tick_params(axis="x", rotation=45)
+
+    # use minimal whitespace
+    fig.tight_layout()
+
+    return fig
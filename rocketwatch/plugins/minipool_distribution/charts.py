@@ -0,0 +1,61 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+
+def plot_minipool_distribution(
+    distribution: list[tuple[int, int]], color: str
+) -> Figure:
+    fig, ax = plt.subplots(1, 1)
+
+    # First chart is sorted bars showing total minipools provided by nodes with x minipools per node
+    # Remove the 0,0 value, since it doesn't provide any insight
+    x_keys = [str(x) for x, _ in distribution]
+    rects = ax.bar(x_keys, [x * y for x, y in distribution], color=color)
+    ax.bar_label(rects, rotation=90, padding=3, fontsize=7)
+    ax.set_ylabel("Total Minipools")
+    # tilt the x axis labels
+    ax.tick_params(axis="x", labelrotation=90, labelsize=7)
+    # Add a 5% buffer to the ylim to help fit all the bar labels
+    ax.set_ylim(top=(ax.get_ylim()[1] * 1.1))
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_node_gini(x: np.ndarray, y: np.ndarray) -> Figure:
+    fig, ax = plt.subplots(1, 1)
+
+    ax.plot(x, y)
+    ax.set_xlabel("number of nodes")
+    ax.set_ylabel("protocol share")
+    ax.set_xscale("log")
+    ax.set_xlim((1, x[-1]))
+    ax.set_ylim((0, 1))
+
+    x_ticks = [x[-1]]
+
+    def draw_threshold(threshold: float, color: str) -> None:
+        index = y.searchsorted(threshold)
+        x_pos = x[index]
+        percentage = round(100 * threshold)
+        x_ticks.append(x_pos)
+        ax.axvline(x=float(x_pos), linestyle="--", c=color, label=f"{percentage}%")
+
+    draw_threshold(1 / 3, "tab:green")
+    draw_threshold(0.5, "tab:olive")
+    draw_threshold(2 / 3, "tab:orange")
+    draw_threshold(0.9, "tab:red")
+
+    # add powers of 10 to x ticks if not too close to existing ticks
+    i = 1
+    while i < x[-1]:
+        if not any((i / 1.5 < tick < i * 1.5) for tick in x_ticks):
+            x_ticks.append(i)
+        i *= 10
+
+    ax.set_xticks(x_ticks, map(str, x_ticks))
+    ax.legend()
+
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+COLORS = {
+    "Nimbus": "#CC9133",
+    "Prysm": "#40BFBF",
+    "Lighthouse": "#9933CC",
+    "Teku": "#3357CC",
+    "Lodestar": "#FB5B9D",
+    "Geth": "#40BFBF",
+    "Besu": "#55AA7A",
+    "Nethermind": "#2688D9",
+    "Reth": "#760910",
+    "External": "#808080",
+    "Smart Node": "#CC6E33",
+    "Allnodes": "#4533cc",
+    "No proposals yet": "#E0E0E0",
+    "Unknown": "#AAAAAA",
+}
+
+type Color = str | tuple[float, float, float, float]
+
+
+def plot_version_chart(
+    x: list[datetime],
+    y: dict[str, list[float]],
+    versions: list[str],
+    recent_versions: list[str],
+    labels: list[str],
+    window_length: int,
+) -> Figure:
+    # generate enough distinct colors for all recent versions
+    cmap = plt.colormaps["tab20"]
+    recent_colors = [
+        cmap(i / max(len(recent_versions) - 1, 1)) for i in range(len(recent_versions))
+    ]
+    # generate color mapping
+    colors: list[Color] = ["darkgray"] * len(versions)
+    for i, version in enumerate(versions):
+        if version in recent_versions:
+            colors[i] = recent_colors[recent_versions.index(version)]
+
+    # add percentage to labels
+    x_arr = np.array(x)
+    fig, ax = plt.subplots()
+    ax.stackplot(x_arr, *y.values(), labels=labels, colors=colors)
+    # hide y axis
+    ax.tick_params(axis="y", which="both", left=False, right=False, labelleft=False)
+    fig.autofmt_xdate()
+    handles, legend_labels = ax.get_legend_handles_labels()
+    ax.legend(reversed(handles), reversed(legend_labels), loc="upper left")
+    # add a thin line at current time from y=0 to y=1 with a width of 0.5
+    ax.plot([x_arr[-1], x_arr[-1]], [0, 1], color="white", alpha=0.25)
+    # calculate future point to make latest data more visible
+    future_point = x[-1] + timedelta(days=window_length)
+    last_y_values = [[yy[-1]] * 2 for yy in y.values()]
+    ax.stackplot(
+        [x_arr[-1], np.datetime64(future_point)], *last_y_values, colors=colors
+    )
+    fig.tight_layout()
+    return fig
+
+
+def plot_distribution(
+    title: str,
+    minipools: list[tuple[str, int]],
+    node_operators: list[tuple[str, int]],
+) -> Figure:
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 8))
+
+    # sort data
+    ax1.pie(
+        [x[1] for x in minipools],
+        colors=[COLORS.get(x[0], "red") for x in minipools],
+        autopct=lambda pct: (f"{pct:.1f}%") if pct > 5 else "",
+        startangle=90,
+        textprops={"fontsize": "12"},
+    )
+    # legend
+    total_minipols = sum(x[1] for x in minipools)
+    # legend in the top left corner of the plot
+    ax1.legend(
+        [f"{x[1]} {x[0]} ({x[1] / total_minipols:.2%})" for x in minipools],
+        loc="lower left",
+        bbox_to_anchor=(0, -0.1),
+        fontsize=11,
+    )
+    ax1.set_title("Minipools", fontsize=22)
+
+    ax2.pie(
+        [x[1] for x in node_operators],
+        colors=[COLORS.get(x[0], "red") for x in node_operators],
+        autopct=lambda pct: (f"{pct:.1f}%") if pct > 5 else "",
+        startangle=90,
+        textprops={"fontsize": "12"},
+    )
+    # legend
+    total_node_operators = sum(x[1] for x in node_operators)
+    ax2.legend(
+        [f"{x[1]} {x[0]} ({x[1] / total_node_operators:.2%})" for x in node_operators],
+        loc="lower left",
+        bbox_to_anchor=(0, -0.1),
+        fontsize=11,
+    )
+    ax2.set_title("Node Operators", fontsize=22)
+
+    fig.subplots_adjust(left=0, right=1, top=0.9, bottom=0, wspace=0)
+    # set title
+    fig.suptitle(title, fontsize=24)
+    return fig
@@ -2,30 +2,33 @@ import asyncio
 import logging
 import re
 import time
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from http import HTTPStatus
-from io import BytesIO
 from typing import Any
 
-import numpy as np
 from aiohttp.client_exceptions import ClientResponseError
 from cronitor import Monitor
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command, describe
 from discord.ext import commands
 from discord.utils import as_chunks
-from matplotlib import pyplot as plt
-from matplotlib.axes import Axes
 from pymongo import ASCENDING, DESCENDING
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.beacon_cache import beacon_cache
+from rocketwatch.utils.chart_cache import ChartResponse, chart_cache
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.embeds import Embed
 from rocketwatch.utils.shared_w3 import bacon
 from rocketwatch.utils.solidity import beacon_block_to_date, date_to_beacon_block
 from rocketwatch.utils.time_debug import timerun_async
+from rocketwatch.utils.validator_registry import validator_registry
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import plot_distribution, plot_version_chart
+
 cog_id = "proposals"
 log = logging.getLogger(f"rocketwatch.{cog_id}")
 
@@ -46,23 +49,6 @@ LOOKUP = {
     },
 }
 
-COLORS = {
-    "Nimbus": "#CC9133",
-    "Prysm": "#40BFBF",
-    "Lighthouse": "#9933CC",
-    "Teku": "#3357CC",
-    "Lodestar": "#FB5B9D",
-    "Geth": "#40BFBF",
-    "Besu": "#55AA7A",
-    "Nethermind": "#2688D9",
-    "Reth": "#760910",
-    "External": "#808080",
-    "Smart Node": "#CC6E33",
-    "Allnodes": "#4533cc",
-    "No proposals yet": "#E0E0E0",
-    "Unknown": "#AAAAAA",
-}
-
 PROPOSAL_TEMPLATE = {
     "type": "Unknown",
     "consensus_client": "Unknown",
@@ -122,7 +108,9 @@ class Proposals(commands.Cog):
     def __init__(self, bot: RocketWatch):
         self.bot = bot
         self.monitor = Monitor("proposals-task", api_key=cfg.secrets.cronitor)
-        self.batch_size = 100
+        self.batch_size = 25  # epochs
+        # concurrent header lookups when duties are unavailable
+        self.slot_batch_size = 100
         self.cooldown = timedelta(minutes=5)
         self.bot.loop.create_task(self.loop())
 
@@ -142,6 +130,7 @@ class Proposals(commands.Cog):
                 await self.bot.report_error(err)
                 self.monitor.ping(state="fail", series=p_id)
             finally:
+                chart_cache.invalidate("proposals")
                 await asyncio.sleep(self.cooldown.total_seconds())
 
     async def check_indexes(self) -> None:
@@ -166,15 +155,44 @@ class Proposals(commands.Cog):
                 "slot"
             ]
         )
-        for slots in as_chunks(
-            range(last_checked_slot + 1, latest_slot + 1), self.batch_size
+        beacon_cache.set_finalized_slot(latest_slot)
+        await validator_registry.ensure_loaded(self.bot.db)
+        # proposer duties cover a whole epoch, so only RP slots need a block download
+        for epochs in as_chunks(
+            range((last_checked_slot + 1) // 32, latest_slot // 32 + 1),
+            self.batch_size,
         ):
-            log.info(f"Fetching proposals for slots {slots[0]} to {slots[-1]}")
-            await asyncio.gather(*[self.fetch_proposal(s) for s in slots])
+            first_slot = max(epochs[0] * 32, last_checked_slot + 1)
+            last_slot = min(epochs[-1] * 32 + 31, latest_slot)
+            log.info(f"Fetching proposals for slots {first_slot} to {last_slot}")
+            await self.fetch_batch_proposals(epochs, range(first_slot, last_slot + 1))
             await self.bot.db.last_checked_block.replace_one(
-                {"_id": cog_id}, {"_id": cog_id, "slot": slots[-1]}, upsert=True
+                {"_id": cog_id}, {"_id": cog_id, "slot": last_slot}, upsert=True
             )
 
+    async def fetch_batch_proposals(self, epochs: Sequence[int], slots: range) -> None:
+        try:
+            duties = await asyncio.gather(
+                *[beacon_cache.get_proposer_duties(epoch) for epoch in epochs]
+            )
+        except ClientResponseError as e:
+            # nodes without historical state may not serve old duties
+            log.warning(
+                f"Proposer duties unavailable ({e.status}),"
+                f" checking slots {slots[0]} to {slots[-1]} individually"
+            )
+            for slot_batch in as_chunks(slots, self.slot_batch_size):
+                await asyncio.gather(*[self.fetch_proposal(s) for s in slot_batch])
+            return
+
+        rp_slots = [
+            slot
+            for epoch_duties in duties
+            for slot, validator_index in epoch_duties.items()
+            if slot in slots and validator_index in validator_registry
+        ]
+        await asyncio.gather(*[self.store_proposal(s) for s in rp_slots])
+
     async def fetch_proposal(self, slot: int) -> None:
         try:
             beacon_header = (await bacon.get_block_header(str(slot)))["data"]["header"][
@@ -186,16 +204,17 @@ class Proposals(commands.Cog):
             else:
                 raise e
 
-        validator_index = int(beacon_header["proposer_index"])
-        query = {"validator_index": validator_index}
-        is_megapool = await self.bot.db.minipools.count_documents(query, limit=1)
-        is_minipool = await self.bot.db.megapool_validators.count_documents(
-            query, limit=1
-        )
-        if not (is_minipool or is_megapool):
+        await validator_registry.ensure_loaded(self.bot.db)
+        if int(beacon_header["proposer_index"]) not in validator_registry:
+            return None
+
+        await self.store_proposal(slot)
+
+    async def store_proposal(self, slot: int) -> None:
+        if (beacon_block := await beacon_cache.get_block(slot)) is None:
+            # duty without a block, the proposal was missed
             return None
 
-        beacon_block = (await bacon.get_block(str(slot)))["data"]["message"]
         proposal_data = parse_proposal(beacon_block)
         await self.bot.db.proposals.update_one(
             {"slot": slot}, {"$set": proposal_data}, upsert=True
@@ -306,8 +325,6 @@ class Proposals(commands.Cog):
                     d[key] = entry
             return d
 
-    type Color = str | tuple[float, float, float, float]
-
     @command()
     @describe(days="how many days to show history for")
     async def version_chart(self, interaction: Interaction, days: int = 90) -> None:
@@ -386,57 +403,31 @@ class Proposals(commands.Cog):
             for version in versions:
                 y[version].append(value_.get(version, 0))
 
-        # generate enough distinct colors for all recent versions
-        cmap = plt.colormaps["tab20"]
-        recent_colors = [
-            cmap(i / max(len(recent_versions) - 1, 1))
-            for i in range(len(recent_versions))
-        ]
-        # generate color mapping
-        colors: list[Proposals.Color] = ["darkgray"] * len(versions)
-        for i, version in enumerate(versions):
-            if version in recent_versions:
-                colors[i] = recent_colors[recent_versions.index(version)]
-
         last_slot_data = data[max(x)]
         last_slot_data = {v: last_slot_data[v] for v in recent_versions}
         labels = [
             f"{v} ({last_slot_data[v]:.2%})" if v in recent_versions else "_nolegend_"
             for v in versions
         ]
-        # add percentage to labels
-        x_arr = np.array(x)
-        fig, ax = plt.subplots()
-        ax.stackplot(x_arr, *y.values(), labels=labels, colors=colors)
-        # hide y axis
-        ax.tick_params(axis="y", which="both", left=False, right=False, labelleft=False)
-        fig.autofmt_xdate()
-        handles, legend_labels = ax.get_legend_handles_labels()
-        ax.legend(reversed(handles), reversed(legend_labels), loc="upper left")
-        # add a thin line at current time from y=0 to y=1 with a width of 0.5
-        ax.plot([x_arr[-1], x_arr[-1]], [0, 1], color="white", alpha=0.25)
-        # calculate future point to make latest data more visible
-        future_point = x[-1] + timedelta(days=window_length)
-        last_y_values = [[yy[-1]] * 2 for yy in y.values()]
-        ax.stackplot(
-            [x_arr[-1], np.datetime64(future_point)], *last_y_values, colors=colors
+        file = await chart_renderer.render_file(
+            plot_version_chart,
+            x,
+            y,
+            versions,
+            recent_versions,
+            labels,
+            window_length,
+            filename="chart.png",
+            savefig_kwargs={"bbox_inches": "tight", "dpi": 300},
         )
-        fig.tight_layout()
-
-        # respond with image
-        img = BytesIO()
-        fig.savefig(img, format="png", bbox_inches="tight", dpi=300)
-        img.seek(0)
-        plt.close(fig)
         e.set_image(url="attachment://chart.png")
 
         # send data
-        await interaction.followup.send(embed=e, file=File(img, filename="chart.png"))
-        img.close()
+        await interaction.followup.send(embed=e, file=file)
 
-    async def plot_axes_with_data(
-        self, attr: str, ax1: Axes, ax2: Axes, remove_allnodes: bool = False
-    ) -> None:
+    async def gather_distribution(
+        self, attr: str, remove_allnodes: bool = False
+    ) -> tuple[list[tuple[str, int]], list[tuple[str, int]]]:
         # group by client and get count
         data = await self.gather_attribute(attr, remove_allnodes)
 
@@ -507,70 +498,35 @@ class Proposals(commands.Cog):
                 ),
             )
 
-        # sort data
-        ax1.pie(
-            [x[1] for x in minipools],
-            colors=[COLORS.get(x[0], "red") for x in minipools],
-            autopct=lambda pct: (f"{pct:.1f}%") if pct > 5 else "",
-            startangle=90,
-            textprops={"fontsize": "12"},
-        )
-        # legend
-        total_minipols = sum(x[1] for x in minipools)
-        # legend in the top left corner of the plot
-        ax1.legend(
-            [f"{x[1]} {x[0]} ({x[1] / total_minipols:.2%})" for x in minipools],
-            loc="lower left",
-            bbox_to_anchor=(0, -0.1),
-            fontsize=11,
-        )
-        ax1.set_title("Minipools", fontsize=22)
-
-        ax2.pie(
-            [x[1] for x in node_operators],
-            colors=[COLORS.get(x[0], "red") for x in node_operators],
-            autopct=lambda pct: (f"{pct:.1f}%") if pct > 5 else "",
-            startangle=90,
-            textprops={"fontsize": "12"},
-        )
-        # legend
-        total_node_operators = sum(x[1] for x in node_operators)
-        ax2.legend(
-            [
-                f"{x[1]} {x[0]} ({x[1] / total_node_operators:.2%})"
-                for x in node_operators
-            ],
-            loc="lower left",
-            bbox_to_anchor=(0, -0.1),
-            fontsize=11,
-        )
-        ax2.set_title("Node Operators", fontsize=22)
+        return minipools, node_operators
 
     async def proposal_vs_node_operators_embed(
         self, attribute: str, name: str, remove_allnodes: bool = False
-    ) -> tuple[Embed, File]:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 8))
-        # iterate axes in pairs
+    ) -> ChartResponse:
         title = f"Rocket Pool {name} Distribution {'without Allnodes' if remove_allnodes else ''}"
-        await self.plot_axes_with_data(attribute, ax1, ax2, remove_allnodes)
+        minipools, node_operators = await self.gather_distribution(
+            attribute, remove_allnodes
+        )
+        png = await chart_renderer.render(
+            plot_distribution, title, minipools, node_operators
+        )
 
         e = Embed(title=title)
-
-        fig.subplots_adjust(left=0, right=1, top=0.9, bottom=0, wspace=0)
-        # set title
-        fig.suptitle(title, fontsize=24)
-
-        # respond with image
-        img = BytesIO()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
         e.set_image(url=f"attachment://{attribute}.png")
+        return ChartResponse([e], [(f"{attribute}.png", png)])
 
-        # send data
-        f = File(img, filename=f"{attribute}.png")
-        img.close()
-        return e, f
+    async def _build_client_distribution(self, remove_allnodes: bool) -> ChartResponse:
+        embeds, files = [], []
+        for attr, name in [
+            ["consensus_client", "Consensus Client"],
+            ["execution_client", "Execution Client"],
+        ]:
+            response = await self.proposal_vs_node_operators_embed(
+                attr, name, remove_allnodes
+            )
+            embeds += response.embeds
+            files += response.files
+        return ChartResponse(embeds, files)
 
     @command()
     async def client_distribution(
@@ -580,17 +536,15 @@ class Proposals(commands.Cog):
         Generate a distribution graph of clients.
         """
         await interaction.response.defer(ephemeral=is_hidden(interaction))
-        embeds, files = [], []
-        for attr, name in [
-            ["consensus_client", "Consensus Client"],
-            ["execution_client", "Execution Client"],
-        ]:
-            e, f = await self.proposal_vs_node_operators_embed(
-                attr, name, remove_allnodes
-            )
-            embeds.append(e)
-            files.append(f)
-        await interaction.followup.send(embeds=embeds, files=files)
+        response = await chart_cache.fetch(
+            "client_distribution",
+            remove_allnodes,
+            ("proposals", "db_upkeep"),
+            lambda: self._build_client_distribution(remove_allnodes),
+        )
+        await interaction.followup.send(
+            embeds=response.get_embeds(), files=response.get_files()
+        )
 
     @command()
     async def operator_type_distribution(self, interaction: Interaction) -> None:
@@ -598,7 +552,14 @@ class Proposals(commands.Cog):
         Generate a graph of NO groups.
         """
         await interaction.response.defer(ephemeral=is_hidden(interaction))
-        embed, file = await self.proposal_vs_node_operators_embed("type", "User")
+        response = await chart_cache.fetch(
+            "operator_type_distribution",
+            (),
+            ("proposals", "db_upkeep"),
+            lambda: self.proposal_vs_node_operators_embed("type", "User"),
+        )
+        (embed,) = response.get_embeds()
+        (file,) = response.get_files()
         await interaction.followup.send(embed=embed, file=file)
 
     @command()
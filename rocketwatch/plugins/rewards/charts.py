@@ -0,0 +1,98 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+
+def plot_simulated_rewards(
+    rpl_ratio: float,
+    system_weight: float,
+    period_inflation: int,
+    actual_rpl_stake: float,
+    actual_borrowed_eth: float,
+    rpl_stake: int,
+    borrowed_eth: int,
+) -> Figure:
+    def node_weight(_stake: float, _borrowed_eth: float) -> float:
+        rpl_value = _stake * rpl_ratio
+        collateral_ratio = (rpl_value / _borrowed_eth) if _borrowed_eth > 0 else 0
+        if collateral_ratio <= 0.15:
+            return float(100 * rpl_value)
+        else:
+            return float(
+                (13.6137 + 2 * np.log(100 * collateral_ratio - 13)) * _borrowed_eth
+            )
+
+    def rewards_at(_stake: float, _borrowed_eth: float) -> float:
+        weight = node_weight(_stake, _borrowed_eth)
+        base_weight = node_weight(actual_rpl_stake, _borrowed_eth)
+        new_system_weight = system_weight + weight - base_weight
+        return 0.7 * period_inflation * weight / (new_system_weight * 10**18)
+
+    fig, ax = plt.subplots(figsize=(5, 2.5))
+    ax.grid()
+
+    one_perc_borrowed = max(actual_borrowed_eth, borrowed_eth) / (rpl_ratio * 100)
+
+    x_min = 0
+    x_max = max(rpl_stake * 2, actual_rpl_stake * 5, one_perc_borrowed * 20)
+    ax.set_xlim((x_min, x_max))
+
+    cur_color, cur_label, cur_ls = "#eb8e55", "current", "solid"
+    sim_color, sim_label, sim_ls = "darkred", "simulated", "dashed"
+
+    def draw_reward_curve(
+        _color: str, _label: str | None, _line_style: str, _borrowed_eth: float
+    ) -> None:
+        step_size = max(1, (x_max - x_min) // 1000)
+        x = np.arange(x_min, x_max, step_size, dtype=int)
+        y = np.array([rewards_at(int(x), _borrowed_eth) for x in x])
+        ax.plot(x, y, color=_color, linestyle=_line_style, label=_label)
+
+        def plot_point(_pt_color: str, _pt_label: str, _x: float) -> None:
+            label = _pt_label if _label is None else None
+            _y = rewards_at(_x, _borrowed_eth)
+            ax.plot(_x, _y, "o", color=_pt_color, label=label)
+            ax.annotate(
+                f"{_y:.2f}",
+                (_x, _y),
+                textcoords="offset points",
+                xytext=(5, -10 if _y > 0 else 5),
+                ha="left",
+            )
+
+        plot_point(cur_color, cur_label, actual_rpl_stake)
+        if rpl_stake > 0:
+            plot_point(sim_color, sim_label, rpl_stake)
+
+    if (actual_borrowed_eth > 0) and (borrowed_eth > 0):
+        draw_reward_curve(cur_color, cur_label, cur_ls, actual_borrowed_eth)
+        draw_reward_curve(sim_color, sim_label, sim_ls, borrowed_eth)
+    elif actual_borrowed_eth > 0:
+        draw_reward_curve(cur_color, None, cur_ls, actual_borrowed_eth)
+    else:
+        draw_reward_curve(sim_color, None, sim_ls, borrowed_eth)
+
+    def formatter(_x: float, _pos: float) -> str:
+        if _x < 1000:
+            return f"{_x:.0f}"
+        elif _x < 10_000:
+            return f"{(_x / 1000):.1f}k"
+        elif _x < 1_000_000:
+            return f"{(_x / 1000):.0f}k"
+        else:
+            return f"{(_x / 1_000_000):.1f}m"
+
+    ax.set_xlabel("rpl stake")
+    ax.set_ylabel("rewards")
+    ax.xaxis.set_major_formatter(formatter)
+
+    y_min = min(rewards_at(x_min, borrowed_eth), rewards_at(x_min, actual_borrowed_eth))
+    _, y_max = ax.get_ylim()
+    ax.set_ylim((y_min, y_max))
+
+    handles, labels = ax.get_legend_handles_labels()
+    by_label = dict(zip(labels, handles, strict=False))
+    ax.legend(by_label.values(), by_label.keys(), loc="lower right")
+    fig.tight_layout()
+
+    return fig
@@ -1,12 +1,9 @@
 import logging
 from dataclasses import dataclass, replace
-from io import BytesIO
 from typing import Any
 
 import aiohttp
-import matplotlib.pyplot as plt
-import numpy as np
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command, describe
 from discord.ext import commands
 from eth_typing import ChecksumAddress
@@ -14,10 +11,13 @@ from eth_typing import ChecksumAddress
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
 from rocketwatch.utils.block_time import ts_to_block
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed, resolve_ens
 from rocketwatch.utils.retry import retry
 from rocketwatch.utils.rocketpool import rp
 
+from .charts import plot_simulated_rewards
+
 log = logging.getLogger("rocketwatch.rewards")
 
 
@@ -197,101 +197,23 @@ class Rewards(commands.Cog):
             period_inflation = solidity.to_int(period_inflation * inflation_rate)
         period_inflation -= total_supply
 
-        def node_weight(_stake: float, _borrowed_eth: float) -> float:
-            rpl_value = _stake * rpl_ratio
-            collateral_ratio = (rpl_value / _borrowed_eth) if _borrowed_eth > 0 else 0
-            if collateral_ratio <= 0.15:
-                return float(100 * rpl_value)
-            else:
-                return float(
-                    (13.6137 + 2 * np.log(100 * collateral_ratio - 13)) * _borrowed_eth
-                )
-
-        def rewards_at(_stake: float, _borrowed_eth: float) -> float:
-            weight = node_weight(_stake, _borrowed_eth)
-            base_weight = node_weight(actual_rpl_stake, _borrowed_eth)
-            new_system_weight = rewards.system_weight + weight - base_weight
-            return 0.7 * period_inflation * weight / (new_system_weight * 10**18)
-
         if (actual_borrowed_eth <= 0) and (borrowed_eth <= 0):
             await interaction.followup.send(
                 "Empty node. Choose another one or specify the minipool count."
             )
             return
 
-        fig, ax = plt.subplots(figsize=(5, 2.5))
-        ax.grid()
-
-        one_perc_borrowed = max(actual_borrowed_eth, borrowed_eth) / (rpl_ratio * 100)
-
-        x_min = 0
-        x_max = max(rpl_stake * 2, actual_rpl_stake * 5, one_perc_borrowed * 20)
-        ax.set_xlim((x_min, x_max))
-
-        cur_color, cur_label, cur_ls = "#eb8e55", "current", "solid"
-        sim_color, sim_label, sim_ls = "darkred", "simulated", "dashed"
-
-        def draw_reward_curve(
-            _color: str, _label: str | None, _line_style: str, _borrowed_eth: float
-        ) -> None:
-            step_size = max(1, (x_max - x_min) // 1000)
-            x = np.arange(x_min, x_max, step_size, dtype=int)
-            y = np.array([rewards_at(int(x), _borrowed_eth) for x in x])
-            ax.plot(x, y, color=_color, linestyle=_line_style, label=_label)
-
-            def plot_point(_pt_color: str, _pt_label: str, _x: float) -> None:
-                label = _pt_label if _label is None else None
-                _y = rewards_at(_x, _borrowed_eth)
-                ax.plot(_x, _y, "o", color=_pt_color, label=label)
-                ax.annotate(
-                    f"{_y:.2f}",
-                    (_x, _y),
-                    textcoords="offset points",
-                    xytext=(5, -10 if _y > 0 else 5),
-                    ha="left",
-                )
-
-            plot_point(cur_color, cur_label, actual_rpl_stake)
-            if rpl_stake > 0:
-                plot_point(sim_color, sim_label, rpl_stake)
-
-        if (actual_borrowed_eth > 0) and (borrowed_eth > 0):
-            draw_reward_curve(cur_color, cur_label, cur_ls, actual_borrowed_eth)
-            draw_reward_curve(sim_color, sim_label, sim_ls, borrowed_eth)
-        elif actual_borrowed_eth > 0:
-            draw_reward_curve(cur_color, None, cur_ls, actual_borrowed_eth)
-        else:
-            draw_reward_curve(sim_color, None, sim_ls, borrowed_eth)
-
-        def formatter(_x: float, _pos: float) -> str:
-            if _x < 1000:
-                return f"{_x:.0f}"
-            elif _x < 10_000:
-                return f"{(_x / 1000):.1f}k"
-            elif _x < 1_000_000:
-                return f"{(_x / 1000):.0f}k"
-            else:
-                return f"{(_x / 1_000_000):.1f}m"
-
-        ax.set_xlabel("rpl stake")
-        ax.set_ylabel("rewards")
-        ax.xaxis.set_major_formatter(formatter)
-
-        y_min = min(
-            rewards_at(x_min, borrowed_eth), rewards_at(x_min, actual_borrowed_eth)
+        f = await chart_renderer.render_file(
+            plot_simulated_rewards,
+            rpl_ratio,
+            rewards.system_weight,
+            period_inflation,
+            actual_rpl_stake,
+            actual_borrowed_eth,
+            rpl_stake,
+            borrowed_eth,
+            filename="rewards.png",
         )
-        _, y_max = ax.get_ylim()
-        ax.set_ylim((y_min, y_max))
-
-        handles, labels = ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles, strict=False))
-        ax.legend(by_label.values(), by_label.keys(), loc="lower right")
-        fig.tight_layout()
-
-        img = BytesIO()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
 
         sim_info = []
         if rpl_stake > 0:
@@ -307,9 +229,7 @@ class Rewards(commands.Cog):
         embed = self.create_embed(title, rewards)
         embed.set_image(url="attachment://rewards.png")
 
-        f = File(img, filename="rewards.png")
         await interaction.followup.send(embed=embed, files=[f])
-        img.close()
 
 
 async def setup(bot: RocketWatch) -> None:
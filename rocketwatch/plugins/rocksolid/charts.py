@@ -0,0 +1,21 @@
+from datetime import date
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.dates import DateFormatter
+from matplotlib.figure import Figure
+
+
+def plot_assets(x: list[date], y: list[float]) -> Figure:
+    fig, ax = plt.subplots(figsize=(6, 2))
+    ax.grid()
+
+    x_arr = np.array(x)
+    ax.plot(x_arr, y, color="#50b1f7")
+    ax.xaxis.set_major_formatter(DateFormatter("%b %d"))
+    ax.set_ylabel("AUM (rETH)")
+    ax.set_xlim((x_arr[0], x_arr[-1]))
+    ax.set_ylim((y[0], y[-1] * 1.05))
+
+    fig.tight_layout()
+    return fig
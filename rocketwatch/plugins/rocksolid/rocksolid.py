@@ -1,25 +1,24 @@
 import logging
 from datetime import datetime, timedelta
-from io import BytesIO
 
-import matplotlib.pyplot as plt
-import numpy as np
-from discord import File, Interaction
+from discord import Interaction
 from discord.app_commands import command
 from discord.ext.commands import Cog
 from eth_typing import BlockNumber
-from matplotlib.dates import DateFormatter
 from pymongo import InsertOne
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
 from rocketwatch.utils.block_time import block_to_ts, ts_to_block
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed, el_explorer_url
 from rocketwatch.utils.event_logs import get_logs
 from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.shared_w3 import w3
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import plot_assets
+
 cog_id = "rocksolid"
 log = logging.getLogger(f"rocketwatch.{cog_id}")
 
@@ -91,7 +90,7 @@ class RockSolid(Cog):
 
         async def get_apy(days: int) -> float | None:
             reference_block = await ts_to_block(
-                now - timedelta(days=days).total_seconds()
+                now - int(timedelta(days=days).total_seconds())
             )
             if reference_block < self.deployment_block:
                 return None
@@ -128,21 +127,9 @@ class RockSolid(Cog):
             x.append(current_date)
             y.append(current_assets)
 
-        fig, ax = plt.subplots(figsize=(6, 2))
-        ax.grid()
-
-        x_arr = np.array(x)
-        ax.plot(x_arr, y, color="#50b1f7")
-        ax.xaxis.set_major_formatter(DateFormatter("%b %d"))
-        ax.set_ylabel("AUM (rETH)")
-        ax.set_xlim((x_arr[0], x_arr[-1]))
-        ax.set_ylim((y[0], y[-1] * 1.05))
-
-        img = BytesIO()
-        fig.tight_layout()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
+        file = await chart_renderer.render_file(
+            plot_assets, x, y, filename="rocksolid-tvl.png"
+        )
 
         ca_reth = await rp.get_address_by_name("rocketTokenRETH")
         ca_rock_reth = await rp.get_address_by_name("RockSolidVault")
@@ -161,9 +148,7 @@ class RockSolid(Cog):
         )
         embed.set_image(url="attachment://rocksolid-tvl.png")
 
-        await interaction.followup.send(
-            embed=embed, file=File(img, "rocksolid-tvl.png")
-        )
+        await interaction.followup.send(embed=embed, file=file)
 
 
 async def setup(bot: RocketWatch) -> None:
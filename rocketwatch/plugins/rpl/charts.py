@@ -0,0 +1,66 @@
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+
+def plot_staked_rpl(sizes: list[float]) -> Figure:
+    labels = ["Minipools", "Megapools", "Unstaking", "Unstaked"]
+    colors = ["#CC4400", "#FF6B00", "#D2B48C", "#808080"]
+    total = sum(sizes)
+
+    def fmt(v: float) -> str:
+        if v >= 1_000_000:
+            return f"{v / 1_000_000:.2f}M"
+        if v >= 1_000:
+            return f"{v / 1_000:.1f}K"
+        return f"{v:.0f}"
+
+    def autopct(pct: float) -> str:
+        return f"{fmt(pct / 100 * total)} ({pct:.1f}%)"
+
+    fig, ax = plt.subplots()
+    ax.pie(
+        sizes,
+        labels=labels,
+        colors=colors,
+        autopct=autopct,
+        startangle=90,
+        wedgeprops={"linewidth": 0.5, "edgecolor": "white"},
+    )
+    fig.tight_layout()
+    return fig
+
+
+def plot_withdrawable_rpl(
+    x: list[float],
+    y: list[float],
+    rpl_eth_price: float,
+    current_withdrawable_rpl: float,
+    color: str,
+) -> Figure:
+    fig, ax = plt.subplots()
+    ax.plot(x, y, color=color)
+    ax.plot(rpl_eth_price, current_withdrawable_rpl, "bo")
+    ax.set_xlim(min(x), max(x))
+
+    ax.annotate(
+        f"{rpl_eth_price:.4f}",
+        (rpl_eth_price, current_withdrawable_rpl),
+        textcoords="offset points",
+        xytext=(-10, -5),
+        ha="right",
+    )
+    ax.annotate(
+        f"{current_withdrawable_rpl / 1000000:.2f} million RPL withdrawable",
+        (rpl_eth_price, current_withdrawable_rpl),
+        textcoords="offset points",
+        xytext=(10, -5),
+        ha="left",
+    )
+    ax.grid()
+
+    ax.set_ylabel("Withdrawable RPL")
+    ax.set_xlabel("RPL / ETH ratio")
+    ax.yaxis.set_major_formatter(lambda x, _: f"{x / 1000000:.1f}m")
+    ax.xaxis.set_major_formatter(lambda x, _: f"{x:.4f}")
+    fig.tight_layout()
+    return fig
@@ -1,20 +1,59 @@
+import asyncio
 import logging
-from io import BytesIO
 
-import matplotlib.pyplot as plt
-from discord import File, Interaction
+import numpy as np
+from discord import Interaction
 from discord.app_commands import command
 from discord.ext import commands
 
 from rocketwatch.bot import RocketWatch
 from rocketwatch.utils import solidity
+from rocketwatch.utils.chart_cache import ChartResponse, chart_cache
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed
 from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import plot_staked_rpl, plot_withdrawable_rpl
+
 log = logging.getLogger("rocketwatch.rpl")
 
 
+class WithdrawableRPL:
+    """Legacy RPL that node operators could withdraw at a given RPL/ETH price.
+
+    A node can withdraw whatever exceeds `min_stake` of its bonded ETH,
+    max(0, rpl - min_stake * eth / price). Sorting nodes by the price at
+    which they cross that line turns the total for any price into a prefix
+    sum, so a whole price grid costs one binary search per point.
+    """
+
+    def __init__(
+        self, eth_stake: np.ndarray, rpl_stake: np.ndarray, min_stake: float
+    ) -> None:
+        bonded = eth_stake > 0
+        # if there are no pools, then all the RPL can be withdrawn
+        self._unbonded_rpl = float(rpl_stake[~bonded].sum())
+        eth, rpl = eth_stake[bonded], rpl_stake[bonded]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            thresholds = min_stake * eth / rpl
+        order = np.argsort(thresholds)
+        self._thresholds = thresholds[order]
+        self._min_stake = min_stake
+        self._rpl_sums = np.concatenate(([0.0], np.cumsum(rpl[order])))
+        self._eth_sums = np.concatenate(([0.0], np.cumsum(eth[order])))
+
+    def at(self, prices: np.ndarray) -> np.ndarray:
+        # nodes at or above their threshold price have RPL to spare
+        n = np.searchsorted(self._thresholds, prices, side="right")
+        withdrawable: np.ndarray = (
+            self._unbonded_rpl
+            + self._rpl_sums[n]
+            - self._min_stake * self._eth_sums[n] / prices
+        )
+        return withdrawable
+
+
 class RPL(commands.Cog):
     def __init__(self, bot: RocketWatch):
         self.bot = bot
@@ -50,45 +89,13 @@ class RPL(commands.Cog):
         )["total_unstaking_rpl_"]
         unstaked_rpl = rpl_supply - staked_rpl - unstaking_rpl
 
-        def fmt(v: float) -> str:
-            if v >= 1_000_000:
-                return f"{v / 1_000_000:.2f}M"
-            if v >= 1_000:
-                return f"{v / 1_000:.1f}K"
-            return f"{v:.0f}"
-
         sizes = [legacy_staked_rpl, megapool_staked_rpl, unstaking_rpl, unstaked_rpl]
-        labels = ["Minipools", "Megapools", "Unstaking", "Unstaked"]
-        colors = ["#CC4400", "#FF6B00", "#D2B48C", "#808080"]
-
-        total = sum(sizes)
-
-        def autopct(pct: float) -> str:
-            return f"{fmt(pct / 100 * total)} ({pct:.1f}%)"
-
-        fig, ax = plt.subplots()
-        ax.pie(
-            sizes,
-            labels=labels,
-            colors=colors,
-            autopct=autopct,
-            startangle=90,
-            wedgeprops={"linewidth": 0.5, "edgecolor": "white"},
-        )
-
-        img = BytesIO()
-        fig.tight_layout()
-        fig.savefig(img, format="png")
-        img.seek(0)
-        plt.close(fig)
+        file = await chart_renderer.render_file(plot_staked_rpl, sizes)
 
         embed = Embed()
         embed.title = "Staked RPL"
         embed.set_image(url="attachment://graph.png")
-        file = File(img, filename="graph.png")
-
         await interaction.followup.send(embed=embed, file=file)
-        img.close()
 
     @command()
     async def withdrawable_rpl(self, interaction: Interaction) -> None:
@@ -97,6 +104,26 @@ class RPL(commands.Cog):
         """
         await interaction.response.defer(ephemeral=is_hidden(interaction))
 
+        rpl_eth_price, min_stake = map(
+            solidity.to_float,
+            await asyncio.gather(
+                rp.call("rocketNetworkPrices.getRPLPrice"),
+                rp.call("rocketDAOProtocolSettingsNode.getMinimumLegacyRPLStake"),
+            ),
+        )
+        response = await chart_cache.fetch(
+            "withdrawable_rpl",
+            (),
+            ("db_upkeep",),
+            lambda: self._build_withdrawable_rpl(rpl_eth_price, min_stake),
+            fingerprint=(rpl_eth_price, min_stake),
+        )
+        (embed,) = response.get_embeds()
+        await interaction.followup.send(embed=embed, files=response.get_files())
+
+    async def _build_withdrawable_rpl(
+        self, rpl_eth_price: float, min_stake: float
+    ) -> ChartResponse:
         data = await (
             await self.bot.db.node_operators.aggregate(
                 [
@@ -115,91 +142,29 @@ class RPL(commands.Cog):
                 ]
             )
         ).to_list()
-        rpl_eth_price = solidity.to_float(
-            await rp.call("rocketNetworkPrices.getRPLPrice")
-        )
-
-        # calculate withdrawable RPL at various RPL ETH prices
-        # i/10 is the ratio of the price checked to the actual RPL ETH price
-
-        free_rpl_liquidity = {}
-        max_collateral = solidity.to_float(
-            await rp.call("rocketDAOProtocolSettingsNode.getMinimumLegacyRPLStake")
+        model = WithdrawableRPL(
+            np.array([node["eth_stake"] for node in data], dtype=float),
+            np.array([node["rpl_stake"] for node in data], dtype=float),
+            min_stake,
         )
-        current_withdrawable_rpl = 0
-        for i in range(1, 31):
-            test_ratio = i / 10
-            rpl_eth_test_price = rpl_eth_price * test_ratio
-            liquid_rpl = 0
-
-            for node in data:
-                eth_stake = node["eth_stake"]
-                rpl_stake = node["rpl_stake"]
-
-                # if there are no pools, then all the RPL can be withdrawn
-                if eth_stake == 0:
-                    liquid_rpl += rpl_stake
-                    continue
-
-                effective_staked = rpl_stake * rpl_eth_test_price
-                collateral_percentage = effective_staked / eth_stake
-
-                # if there is no extra RPL, go to the next node
-                if collateral_percentage < max_collateral:
-                    continue
-
-                liquid_rpl += (
-                    (collateral_percentage - max_collateral) / collateral_percentage
-                ) * rpl_stake
-
-            free_rpl_liquidity[i] = (rpl_eth_test_price, liquid_rpl)
-            if test_ratio == 1:
-                current_withdrawable_rpl = liquid_rpl
 
-        # break the tuples into lists to plot
-        x, y = zip(*list(free_rpl_liquidity.values()), strict=False)
+        # 0.1x to 3x the current RPL/ETH price
+        x = rpl_eth_price * np.linspace(0.1, 3, 291)
+        y = model.at(x)
+        current_withdrawable_rpl = float(model.at(np.array(rpl_eth_price)))
 
         embed = Embed()
-
-        # plot the data
-        fig, ax = plt.subplots()
-        ax.plot(x, y, color=str(embed.color))
-        ax.plot(rpl_eth_price, current_withdrawable_rpl, "bo")
-        ax.set_xlim(min(x), max(x))
-
-        ax.annotate(
-            f"{rpl_eth_price:.4f}",
-            (rpl_eth_price, current_withdrawable_rpl),
-            textcoords="offset points",
-            xytext=(-10, -5),
-            ha="right",
-        )
-        ax.annotate(
-            f"{current_withdrawable_rpl / 1000000:.2f} million RPL withdrawable",
-            (rpl_eth_price, current_withdrawable_rpl),
-            textcoords="offset points",
-            xytext=(10, -5),
-            ha="left",
+        png = await chart_renderer.render(
+            plot_withdrawable_rpl,
+            x.tolist(),
+            y.tolist(),
+            rpl_eth_price,
+            current_withdrawable_rpl,
+            str(embed.color),
         )
-        ax.grid()
-
-        ax.set_ylabel("Withdrawable RPL")
-        ax.set_xlabel("RPL / ETH ratio")
-        ax.yaxis.set_major_formatter(lambda x, _: f"{x / 1000000:.1f}m")
-        ax.xaxis.set_major_formatter(lambda x, _: f"{x:.4f}")
-
-        img = BytesIO()
-        fig.tight_layout()
-        fig.savefig(img, format="png")
-        img.seek(0)
-
-        plt.close(fig)
-
         embed.title = "Available RPL Liquidity"
         embed.set_image(url="attachment://graph.png")
-        f = File(img, filename="graph.png")
-        await interaction.followup.send(embed=embed, files=[f])
-        img.close()
+        return ChartResponse([embed], [("graph.png", png)])
 
 
 async def setup(bot: RocketWatch) -> None:
@@ -2,6 +2,7 @@ import logging
 from typing import Any
 
 import humanize
+import numpy as np
 from colorama import Style
 from discord import Interaction
 from discord.app_commands import command, describe
@@ -17,6 +18,24 @@ from rocketwatch.utils.visibility import is_hidden
 
 log = logging.getLogger("rocketwatch.tvl")
 
+# megapool reward split key → tree branch
+SPLIT_SHARES = {
+    "node": "Node Share",
+    "reth": "rETH Share",
+    "voter": "Voter Share",
+    "dao": "DAO Share",
+}
+
+
+def columns(docs: list[dict[str, Any]], *fields: str) -> np.ndarray:
+    """Float array with one row per field, built in a single pass over `docs`.
+
+    Fields must be flat and non-null, queries fill defaults with $ifNull.
+    np.array() would otherwise turn None into NaN and poison every sum it
+    ends up in."""
+    rows = [[doc[field] for field in fields] for doc in docs]
+    return np.array(rows, float).reshape(len(docs), len(fields)).T
+
 
 def minipool_split_rewards_logic(
     balance: float, node_share: float, commission: float, force_base: bool = False
@@ -39,13 +58,96 @@ def minipool_split_rewards_logic(
     return d
 
 
-def megapool_split_rewards(
-    rewards: float,
-    capital_ratio: float,
+def minipool_split_rewards_array(
+    balance: np.ndarray,
+    node_share: np.ndarray,
+    commission: np.ndarray,
+    force_base: bool = False,
+) -> dict[str, dict[str, np.ndarray]]:
+    """Element-wise `minipool_split_rewards_logic` for non-negative balances."""
+    node_balance = 32 * node_share
+    reth_balance = 32 - node_balance
+    with_base = np.full(balance.shape, force_base) | (balance >= 8)
+    # reth base share
+    base_reth = np.where(with_base, np.minimum(balance, reth_balance), 0.0)
+    balance = balance - base_reth
+    # node base share
+    base_node = np.where(with_base, np.minimum(balance, node_balance), 0.0)
+    balance = np.maximum(balance - base_node, 0.0)
+    # rewards split logic
+    node_ownership_share = node_share + (1 - node_share) * commission
+    return {
+        "base": {"reth": base_reth, "node": base_node},
+        "rewards": {
+            "reth": balance * (1 - node_ownership_share),
+            "node": balance * node_ownership_share,
+        },
+    }
+
+
+def minipool_balance_totals(
+    node_share: np.ndarray,
+    commission: np.ndarray,
+    refund_balance: np.ndarray,
+    contract_balance: np.ndarray,
+    beacon_balance: np.ndarray,
+) -> dict[str, dict[str, float]]:
+    """Split the beacon and contract balances of staking minipools.
+
+    Outstanding refunds are paid to the node from the contract balance
+    first, then from the beacon balance. Returns totals for the minipool
+    stake, the beacon chain rewards and the contract balances.
+    """
+    has_refund = refund_balance > 0
+    from_contract = np.where(
+        has_refund & (contract_balance > 0),
+        np.minimum(contract_balance, refund_balance),
+        0.0,
+    )
+    contract_balance = contract_balance - from_contract
+    refund_balance = refund_balance - from_contract
+    from_beacon = np.where(
+        (refund_balance > 0) & (beacon_balance > 0),
+        np.minimum(beacon_balance, refund_balance),
+        0.0,
+    )
+    beacon_balance = beacon_balance - from_beacon
+
+    beacon = minipool_split_rewards_array(
+        np.maximum(beacon_balance, 0.0), node_share, commission, force_base=True
+    )
+    contract = minipool_split_rewards_array(
+        np.maximum(contract_balance, 0.0), node_share, commission
+    )
+    return {
+        "stake": {
+            "node": float(from_beacon.sum() + beacon["base"]["node"].sum()),
+            "reth": float(beacon["base"]["reth"].sum()),
+        },
+        "beacon_rewards": {
+            "node": float(beacon["rewards"]["node"].sum()),
+            "reth": float(beacon["rewards"]["reth"].sum()),
+        },
+        "contract": {
+            "node": float(
+                from_contract.sum()
+                + contract["base"]["node"].sum()
+                + contract["rewards"]["node"].sum()
+            ),
+            "reth": float(
+                contract["base"]["reth"].sum() + contract["rewards"]["reth"].sum()
+            ),
+        },
+    }
+
+
+def megapool_split_rewards[T: (float, np.ndarray)](
+    rewards: T,
+    capital_ratio: T,
     node_commission: float,
     voter_share: float,
     dao_share: float,
-) -> dict[str, float]:
+) -> dict[str, T]:
     borrowed_portion = rewards * (1 - capital_ratio)
     reth_commission = 1 - node_commission - voter_share - dao_share
     reth = borrowed_portion * reth_commission
@@ -55,6 +157,18 @@ def megapool_split_rewards(
     return {"node": node, "reth": reth, "voter": voter, "dao": dao}
 
 
+def megapool_base_shares(
+    requested_bond: np.ndarray, beacon_balance: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """rETH and node share of the base stake (up to 32 ETH) of megapool validators."""
+    base = np.minimum(beacon_balance, 32)
+    # handle penalties (beacon < 32): node absorbs losses first
+    node_base = np.where(
+        base < 32, np.maximum(0, requested_bond - (32 - base)), requested_bond
+    )
+    return base - node_base, node_base
+
+
 class TVL(Cog):
     def __init__(self, bot: RocketWatch):
         self.bot = bot
@@ -177,73 +291,49 @@ class TVL(Cog):
         minipools = await self.bot.db.minipools.find(
             {
                 "status": {"$nin": ["initialised", "prelaunch", "dissolved"]},
-                "node_deposit_balance": {"$exists": True},
-            }
+                "node_deposit_balance": {"$ne": None},
+            },
+            {
+                "_id": 0,
+                "node_deposit_balance": 1,
+                "node_fee": {"$ifNull": ["$node_fee", 0]},
+                "node_refund_balance": {"$ifNull": ["$node_refund_balance", 0]},
+                "execution_balance": {"$ifNull": ["$execution_balance", 0]},
+                "beacon_balance": {"$ifNull": ["$beacon.balance", 32]},
+            },
         ).to_list(None)
-
-        for minipool in minipools:
-            node_share = minipool["node_deposit_balance"] / 32
-            commission = minipool["node_fee"]
-            refund_balance = minipool["node_refund_balance"]
-            contract_balance = minipool["execution_balance"]
-            beacon_balance = (
-                minipool["beacon"]["balance"] if "beacon" in minipool else 32
+        node_deposit, node_fee, refund_balance, contract_balance, beacon_balance = (
+            columns(
+                minipools,
+                "node_deposit_balance",
+                "node_fee",
+                "node_refund_balance",
+                "execution_balance",
+                "beacon_balance",
             )
-            # if there is a refund_balance, we first try to pay that off using the contract balance
-            if refund_balance > 0:
-                if contract_balance > 0:
-                    if contract_balance >= refund_balance:
-                        contract_balance -= refund_balance
-                        data["Total ETH Locked"]["Undistributed Balances"][
-                            "Minipool Contract Balances"
-                        ]["Node Share"]["_val"] += refund_balance
-                        refund_balance = 0
-                    else:
-                        refund_balance -= contract_balance
-                        data["Total ETH Locked"]["Undistributed Balances"][
-                            "Minipool Contract Balances"
-                        ]["Node Share"]["_val"] += contract_balance
-                        contract_balance = 0
-                # if there is still a refund balance, we try to pay it off using the beacon balance
-                if refund_balance > 0 and beacon_balance > 0:
-                    if beacon_balance >= refund_balance:
-                        beacon_balance -= refund_balance
-                        data["Total ETH Locked"]["Minipool Stake"]["Staking Minipools"][
-                            "Node Share"
-                        ]["_val"] += refund_balance
-                        refund_balance = 0
-                    else:
-                        refund_balance -= beacon_balance
-                        data["Total ETH Locked"]["Minipool Stake"]["Staking Minipools"][
-                            "Node Share"
-                        ]["_val"] += beacon_balance
-                        beacon_balance = 0
-            if beacon_balance > 0:
-                d = minipool_split_rewards_logic(
-                    beacon_balance, node_share, commission, force_base=True
-                )
-                data["Total ETH Locked"]["Minipool Stake"]["Staking Minipools"][
-                    "Node Share"
-                ]["_val"] += d["base"]["node"]
-                data["Total ETH Locked"]["Minipool Stake"]["Staking Minipools"][
-                    "rETH Share"
-                ]["_val"] += d["base"]["reth"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["Node Share"]["_val"] += d["rewards"]["node"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["rETH Share"]["_val"] += d["rewards"]["reth"]
-            if contract_balance > 0:
-                d = minipool_split_rewards_logic(
-                    contract_balance, node_share, commission
-                )
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Minipool Contract Balances"
-                ]["Node Share"]["_val"] += d["base"]["node"] + d["rewards"]["node"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Minipool Contract Balances"
-                ]["rETH Share"]["_val"] += d["base"]["reth"] + d["rewards"]["reth"]
+        )
+        totals = minipool_balance_totals(
+            node_deposit / 32,
+            node_fee,
+            refund_balance,
+            contract_balance,
+            beacon_balance,
+        )
+        staking_minipools = data["Total ETH Locked"]["Minipool Stake"][
+            "Staking Minipools"
+        ]
+        staking_minipools["Node Share"]["_val"] += totals["stake"]["node"]
+        staking_minipools["rETH Share"]["_val"] += totals["stake"]["reth"]
+        beacon_rewards = data["Total ETH Locked"]["Undistributed Balances"][
+            "Beacon Chain Rewards"
+        ]
+        beacon_rewards["Node Share"]["_val"] += totals["beacon_rewards"]["node"]
+        beacon_rewards["rETH Share"]["_val"] += totals["beacon_rewards"]["reth"]
+        minipool_balances = data["Total ETH Locked"]["Undistributed Balances"][
+            "Minipool Contract Balances"
+        ]
+        minipool_balances["Node Share"]["_val"] += totals["contract"]["node"]
+        minipool_balances["rETH Share"]["_val"] += totals["contract"]["reth"]
 
         # Megapool commission settings
         network_settings = await rp.get_contract_by_name(
@@ -294,47 +384,38 @@ class TVL(Cog):
         # Staking, Locked & Exiting Megapool Validators: beacon balance split by capital ratio
         # locked = exit requested but not yet confirmed on beacon chain, treated as exiting
         megapool_validators = await self.bot.db.megapool_validators.find(
-            {"status": {"$in": ["staking", "locked", "exiting"]}}
+            {"status": {"$in": ["staking", "locked", "exiting"]}},
+            {
+                "_id": 0,
+                "requested_bond": {"$ifNull": ["$requested_bond", 0]},
+                "beacon_balance": {"$ifNull": ["$beacon.balance", 32]},
+                "status": 1,
+            },
         ).to_list(None)
-        for v in megapool_validators:
-            capital_ratio = v["requested_bond"] / 32
-            beacon_balance = v.get("beacon", {}).get("balance", 32)
-            status = v["status"]
-            # base stake (up to 32 ETH)
-            base = min(beacon_balance, 32)
-            node_base = v["requested_bond"]
-            # handle penalties (beacon < 32): node absorbs losses first
-            if base < 32:
-                shortfall = 32 - base
-                node_base = max(0, node_base - shortfall)
-            reth_base = base - node_base
-            target = (
-                "Staking Validators" if (status == "staking") else "Exiting Validators"
-            )
-            data["Total ETH Locked"]["Megapool Stake"][target]["rETH Share"][
-                "_val"
-            ] += reth_base
-            data["Total ETH Locked"]["Megapool Stake"][target]["Node Share"][
-                "_val"
-            ] += node_base
-            # beacon chain rewards (anything over 32)
-            if beacon_balance > 32:
-                rewards = beacon_balance - 32
-                split = megapool_split_rewards(
-                    rewards, capital_ratio, node_share, voter_share, dao_share
-                )
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["Node Share"]["_val"] += split["node"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["rETH Share"]["_val"] += split["reth"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["Voter Share"]["_val"] += split["voter"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Beacon Chain Rewards"
-                ]["DAO Share"]["_val"] += split["dao"]
+        requested_bond, beacon_balance = columns(
+            megapool_validators, "requested_bond", "beacon_balance"
+        )
+        staking = np.array(
+            [v["status"] == "staking" for v in megapool_validators], bool
+        )
+        reth_base, node_base = megapool_base_shares(requested_bond, beacon_balance)
+        for target, mask in (
+            ("Staking Validators", staking),
+            ("Exiting Validators", ~staking),
+        ):
+            shares = data["Total ETH Locked"]["Megapool Stake"][target]
+            shares["rETH Share"]["_val"] += float(reth_base[mask].sum())
+            shares["Node Share"]["_val"] += float(node_base[mask].sum())
+        # beacon chain rewards (anything over 32)
+        split = megapool_split_rewards(
+            np.maximum(beacon_balance - 32, 0.0),
+            requested_bond / 32,
+            node_share,
+            voter_share,
+            dao_share,
+        )
+        for key, name in SPLIT_SHARES.items():
+            beacon_rewards[name]["_val"] += float(split[key].sum())
 
         # Megapool Contract Balances: eth_balance = assignedValue + refundValue + pendingRewards
         # assignedValue already counted in Queued Validators, so we split the rest:
@@ -351,46 +432,50 @@ class TVL(Cog):
                     },
                     {
                         "$project": {
-                            "refund_value": "$megapool.refund_value",
-                            "debt": "$megapool.debt",
-                            "pending_rewards": "$megapool.pending_rewards",
-                            "node_bond": "$megapool.node_bond",
-                            "user_capital": "$megapool.user_capital",
+                            "_id": 0,
+                            "refund_value": {"$ifNull": ["$megapool.refund_value", 0]},
+                            "debt": {"$ifNull": ["$megapool.debt", 0]},
+                            "pending_rewards": {
+                                "$ifNull": ["$megapool.pending_rewards", 0]
+                            },
+                            "node_bond": {"$ifNull": ["$megapool.node_bond", 0]},
+                            "user_capital": {"$ifNull": ["$megapool.user_capital", 0]},
                         }
                     },
                 ]
             )
         ).to_list()
-        for mp in megapool_balances:
-            refund_value = mp.get("refund_value", 0)
-            debt_val = mp.get("debt", 0)
-            pending_rewards = mp.get("pending_rewards", 0)
-            # refundValue minus debt → Node Share
-            node_refund = max(0, refund_value - debt_val)
-            data["Total ETH Locked"]["Undistributed Balances"][
-                "Megapool Contract Balances"
-            ]["Node Share"]["_val"] += node_refund
-            # pendingRewards → split by commission
-            if pending_rewards > 0:
-                total_capital = mp.get("node_bond", 0) + mp.get("user_capital", 0)
-                capital_ratio = (
-                    mp.get("node_bond", 0) / total_capital if total_capital > 0 else 0
-                )
-                split = megapool_split_rewards(
-                    pending_rewards, capital_ratio, node_share, voter_share, dao_share
-                )
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Megapool Contract Balances"
-                ]["Node Share"]["_val"] += split["node"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Megapool Contract Balances"
-                ]["rETH Share"]["_val"] += split["reth"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Megapool Contract Balances"
-                ]["Voter Share"]["_val"] += split["voter"]
-                data["Total ETH Locked"]["Undistributed Balances"][
-                    "Megapool Contract Balances"
-                ]["DAO Share"]["_val"] += split["dao"]
+        refund_value, debt, pending_rewards, node_bond, user_capital = columns(
+            megapool_balances,
+            "refund_value",
+            "debt",
+            "pending_rewards",
+            "node_bond",
+            "user_capital",
+        )
+        total_capital = node_bond + user_capital
+        megapool_contracts = data["Total ETH Locked"]["Undistributed Balances"][
+            "Megapool Contract Balances"
+        ]
+        # refundValue minus debt → Node Share
+        megapool_contracts["Node Share"]["_val"] += float(
+            np.maximum(0, refund_value - debt).sum()
+        )
+        # pendingRewards → split by commission
+        split = megapool_split_rewards(
+            np.maximum(pending_rewards, 0.0),
+            np.divide(
+                node_bond,
+                total_capital,
+                out=np.zeros_like(total_capital),
+                where=total_capital > 0,
+            ),
+            node_share,
+            voter_share,
+            dao_share,
+        )
+        for key, name in SPLIT_SHARES.items():
+            megapool_contracts[name]["_val"] += float(split[key].sum())
 
         # Deposit Pool Balance: calls the contract and asks what its balance is, simple enough.
         # ETH in here has been swapped for rETH and is waiting to be matched with a minipool.
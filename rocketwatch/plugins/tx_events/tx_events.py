@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import json
 import logging
@@ -14,9 +15,10 @@ from discord.ui import Modal, TextInput
 from eth_typing import BlockIdentifier, BlockNumber, ChecksumAddress, HexStr
 from hexbytes import HexBytes
 from web3.constants import ADDRESS_ZERO, HASH_ZERO
-from web3.types import BlockData, Nonce, TxData, TxReceipt, Wei
+from web3.types import BlockData, Nonce, RPCEndpoint, TxData, TxReceipt, Wei
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.block_cache import block_cache
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.dao import DefaultDAO, ProtocolDAO
 from rocketwatch.utils.embeds import Embed
@@ -37,6 +39,9 @@ from .event_definitions import (
 
 log = logging.getLogger("rocketwatch.tx_events")
 
+# blocks fetched in parallel while scanning a range
+_BLOCK_FETCH_CONCURRENCY = 16
+
 _DUMMY_RECEIPT: TxReceipt = {
     "blockHash": HexBytes(HASH_ZERO),
     "blockNumber": BlockNumber(0),
@@ -135,6 +140,8 @@ class TxEvents(EventPlugin):
     def __init__(self, bot: RocketWatch) -> None:
         super().__init__(bot)
         self.addresses: list[ChecksumAddress] | None = None
+        # cleared once the node turns out not to support trace_filter
+        self._use_trace_filter = True
 
     async def _ensure_config(self) -> None:
         if self.addresses is None:
@@ -255,12 +262,111 @@ class TxEvents(EventPlugin):
         self, from_block: BlockNumber, to_block: BlockNumber
     ) -> list[Event]:
         await self._ensure_config()
+        addresses = self.addresses
+        block_numbers: Sequence[int] = range(from_block, to_block)
+        candidates = await self._find_candidate_blocks(from_block, to_block)
+        if candidates is not None:
+            log.debug("Scanning %d of %d blocks", len(candidates), len(block_numbers))
+            block_numbers = sorted(candidates)
+        semaphore = asyncio.Semaphore(_BLOCK_FETCH_CONCURRENCY)
+
+        async def scan(block_number: int) -> tuple[BlockData, list[TxData]] | None:
+            async with semaphore:
+                block = await self._fetch_block(block_number)
+            if block is None or not (matches := self._match_transactions(block)):
+                return None
+            # only keep what processing needs, full blocks add up over a batch
+            return cast(BlockData, {**block, "transactions": []}), matches
+
+        scanned = await asyncio.gather(*[scan(n) for n in block_numbers])
+        await asyncio.gather(
+            *[
+                block_cache.get_transaction_receipt(txn["hash"])
+                for _, matches in filter(None, scanned)
+                for txn in matches
+            ]
+        )
+
         events: list[Event] = []
-        for block in range(from_block, to_block):
-            events.extend(await self.get_events_for_block(block))
+        for block_number, result in zip(block_numbers, scanned, strict=True):
+            if result is not None:
+                block, matches = result
+                events.extend(await self._process_matches(block, matches))
+            if self.addresses is not addresses:
+                # contract upgrade, every later block was selected and matched
+                # against outdated addresses, not just the remaining candidates
+                events.extend(
+                    await self.get_past_events(BlockNumber(block_number + 1), to_block)
+                )
+                break
         return events
 
+    async def _find_candidate_blocks(
+        self, from_block: BlockNumber, to_block: BlockNumber
+    ) -> set[int] | None:
+        """Blocks in [from_block, to_block) with a transaction sent to a tracked
+        contract, or None if the node can't tell and every block needs a look."""
+        if not self._use_trace_filter or from_block >= to_block:
+            return None
+        if not self.addresses:
+            return set()
+        try:
+            traces: list[dict[str, Any]] = await w3.manager.coro_request(
+                RPCEndpoint("trace_filter"),
+                [
+                    {
+                        "fromBlock": hex(from_block),
+                        "toBlock": hex(to_block - 1),
+                        "toAddress": self.addresses,
+                    }
+                ],
+            )
+        except web3.exceptions.MethodUnavailable:
+            log.warning("Node doesn't support trace_filter, scanning full blocks")
+            self._use_trace_filter = False
+            return None
+        except Exception as err:
+            log.warning(f"trace_filter failed, scanning full blocks: {err!r}")
+            return None
+        # internal calls don't count, matching is on the transaction's `to`
+        return {
+            int(trace["blockNumber"])
+            for trace in traces
+            if not trace.get("traceAddress")
+        }
+
     async def get_events_for_block(self, block_number: BlockIdentifier) -> list[Event]:
+        block = await self._fetch_block(block_number)
+        if block is None:
+            return []
+        return await self._process_matches(block, self._match_transactions(block))
+
+    async def _process_matches(
+        self, block: BlockData, matches: list[TxData]
+    ) -> list[Event]:
+        addresses = self.addresses
+        events: list[Event] = []
+        for txn in matches:
+            events.extend(
+                await self.process_transaction(block, txn, txn["to"], txn["input"])
+            )
+            if self.addresses is addresses:
+                continue
+            # contract upgrade, the rest of the block was matched against
+            # outdated addresses
+            full_block = await self._fetch_block(block["number"])
+            if full_block is not None:
+                remaining = [
+                    t
+                    for t in self._match_transactions(full_block)
+                    if t["transactionIndex"] > txn["transactionIndex"]
+                ]
+                events.extend(await self._process_matches(block, remaining))
+            break
+        return events
+
+    @staticmethod
+    async def _fetch_block(block_number: BlockIdentifier) -> BlockData | None:
         log.debug("Checking block %s", block_number)
         try:
             block: BlockData = await w3.eth.get_block(
@@ -268,24 +374,25 @@ class TxEvents(EventPlugin):
             )
         except web3.exceptions.BlockNotFound:
             log.error("Skipping block %s as it can't be found", block_number)
-            return []
+            return None
+        return block
 
+    def _match_transactions(self, block: BlockData) -> list[TxData]:
+        """Transactions in `block` sent to one of the tracked contracts."""
+        addresses = set(self.addresses or [])
         # full_transactions=True guarantees Sequence[TxData], not Sequence[HexBytes]
         transactions = cast(Sequence[TxData], block.get("transactions", []))
-        events: list[Event] = []
+        matches: list[TxData] = []
         for txn in transactions:
-            if "to" in txn:
-                events.extend(
-                    await self.process_transaction(block, txn, txn["to"], txn["input"])
-                )
-            else:
+            if "to" not in txn:
                 log.debug(
                     "Skipping transaction %s as it has no `to` parameter. "
                     "Possible contract creation.",
                     txn["hash"].hex(),
                 )
-
-        return events
+            elif txn["to"] in addresses:
+                matches.append(txn)
+        return matches
 
     # --- Transaction processing ---
 
@@ -303,7 +410,7 @@ class TxEvents(EventPlugin):
         contract_name = rp.get_name_by_address(contract_address)
         if contract_name is None:
             return []
-        receipt: TxReceipt = await w3.eth.get_transaction_receipt(txn["hash"])
+        receipt: TxReceipt = await block_cache.get_transaction_receipt(txn["hash"])
 
         if not self._should_process(contract_name, receipt, txn):
             return []
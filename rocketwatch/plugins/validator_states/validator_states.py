@@ -7,6 +7,7 @@ from discord.app_commands import command
 from discord.ext import commands
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.chart_cache import ChartResponse, chart_cache
 from rocketwatch.utils.embeds import Embed, el_explorer_url
 from rocketwatch.utils.readable import render_tree_legacy
 from rocketwatch.utils.shared_w3 import w3
@@ -123,7 +124,13 @@ class ValidatorStates(commands.Cog):
     async def validator_states(self, interaction: Interaction) -> None:
         """Show validator counts by beacon chain and contract status"""
         await interaction.response.defer(ephemeral=is_hidden(interaction))
+        response = await chart_cache.fetch(
+            "validator_states", (), ("db_upkeep",), self._build_validator_states
+        )
+        (embed,) = response.get_embeds()
+        await interaction.followup.send(embed=embed)
 
+    async def _build_validator_states(self) -> ChartResponse:
         minipools = await self.bot.db.minipools.find(
             {"beacon.status": {"$exists": True}},
             {
@@ -235,7 +242,7 @@ class ValidatorStates(commands.Cog):
                 description += "\n"
 
         embed.description = description
-        await interaction.followup.send(embed=embed)
+        return ChartResponse([embed])
 
 
 async def setup(self: RocketWatch) -> None:
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+
+import numpy as np
+from matplotlib import figure, ticker
+from matplotlib import font_manager as fm
+from matplotlib import pyplot as plt
+from matplotlib.patches import Rectangle
+
+# (depth per price step, label, color)
+DepthSeries = tuple[np.ndarray, str, str]
+
+
+@dataclass(frozen=True)
+class TickFormat:
+    """Tick formatter with automatic K/M/B suffixing and four-figure
+    full-number output (1000-9999) for readability."""
+
+    base_fmt: str
+    scale: float = 1.0
+    offset: float = 0.0
+    prefix: str = ""
+    suffix: str = ""
+
+    def __call__(self, _x: float, _pos: float) -> str:
+        value = _x * self.scale + self.offset
+        levels = [
+            (1_000_000_000, 1_000_000_000, "B"),
+            (1_000_000, 1_000_000, "M"),
+            (10_000, 1_000, "K"),
+        ]
+        modifier = ""
+        for threshold, divisor, s in levels:
+            if value >= threshold:
+                modifier = s
+                value /= divisor
+                break
+
+        if value >= 1000:
+            value_str = f"{value:,.0f}"
+        else:
+            value_str = f"{value:{self.base_fmt}}".rstrip(".")
+        return self.prefix + value_str + modifier + self.suffix
+
+
+def plot_market_depth(
+    x: np.ndarray,
+    primary_price: float,
+    cex_data: list[DepthSeries],
+    dex_data: list[DepthSeries],
+    primary_prefix: str,
+    bottom_formatter: ticker.Formatter,
+    top_formatter: ticker.Formatter,
+    y_right_formatter: ticker.Formatter,
+) -> figure.Figure:
+    fig, ax = plt.subplots(figsize=(10, 5))
+
+    ax.minorticks_on()
+    ax.grid(True, which="major", linestyle="--", linewidth=0.5, alpha=0.5)
+    ax.grid(True, which="minor", linestyle=":", linewidth=0.3, alpha=0.5)
+
+    ax.set_xlabel("price")
+    ax.xaxis.labelpad = 8
+    ax.set_ylabel("depth")
+    ax.yaxis.labelpad = 10
+
+    y = []
+    colors = []
+
+    y_offset = 0.0
+    max_label_length: int = np.max([len(t[1]) for t in (cex_data + dex_data)])
+
+    def add_data(_data: list[DepthSeries], _name: str | None) -> None:
+        labels, handles = [], []
+        for y_values, label, color in _data:
+            y.append(y_values)
+            labels.append(f"{label:\u00a0<{max_label_length}}")
+            colors.append(color)
+            handles.append(Rectangle((0, 0), 1, 1, color=color))
+
+        nonlocal y_offset
+        legend = ax.legend(
+            handles,
+            labels,
+            title=_name,
+            loc="upper left",
+            bbox_to_anchor=(0, 1 - y_offset),
+            prop=fm.FontProperties(family="monospace", size=10),
+        )
+        ax.add_artist(legend)
+        y_offset += 0.025 + 0.055 * (len(_data) + int(_name is not None))
+
+    if dex_data and cex_data:
+        add_data(dex_data, "DEX")
+        add_data(cex_data, "CEX")
+    elif dex_data:
+        add_data(dex_data, None)
+    else:
+        add_data(cex_data, None)
+
+    ax.stackplot(
+        x, np.array(y[::-1]), colors=colors[::-1], edgecolor="black", linewidth=0.3
+    )
+    ax.axvline(primary_price, color="black", linestyle="--", linewidth=1)
+
+    range_size = x[-1] - x[0]
+    ax.set_xlim((x[0], x[-1]))
+
+    # Matplotlib's default locator may suggest ticks outside xlim for
+    # visual margin — clamp to the actual data range so labels don't spill
+    # past the plot edges.
+    x_ticks = [t for t in ax.get_xticks() if x[0] <= t <= x[-1]]
+    ax.set_xticks(
+        [t for t in x_ticks if abs(t - primary_price) >= range_size / 20]
+        + [primary_price]
+    )
+    ax.xaxis.set_major_formatter(bottom_formatter)
+
+    ax_top = ax.twiny()
+    ax_top.minorticks_on()
+    ax_top.set_xlim(ax.get_xlim())
+    ax_top.set_xticks(
+        [t for t in x_ticks if abs(t - primary_price) >= range_size / 10]
+        + [primary_price]
+    )
+    ax_top.xaxis.set_major_formatter(top_formatter)
+
+    ax.yaxis.set_major_formatter(
+        ticker.FuncFormatter(TickFormat("#.3g", prefix=primary_prefix))
+    )
+
+    ax_right = ax.twinx()
+    ax_right.minorticks_on()
+    ax_right.set_yticks(ax.get_yticks())
+    ax_right.set_ylim(ax.get_ylim())
+    ax_right.yaxis.set_major_formatter(y_right_formatter)
+
+    return fig
@@ -2,21 +2,18 @@ import asyncio
 import logging
 from collections import OrderedDict
 from dataclasses import dataclass
-from io import BytesIO
 from typing import Literal, cast
 
 import aiohttp
 import numpy as np
-from discord import File, Interaction, app_commands
+from discord import Interaction, app_commands
 from discord.app_commands import describe
 from discord.ext import commands
 from eth_typing import ChecksumAddress, HexStr
-from matplotlib import figure, ticker
-from matplotlib import font_manager as fm
-from matplotlib import pyplot as plt
-from matplotlib.patches import Rectangle
+from matplotlib import ticker
 
 from rocketwatch.bot import RocketWatch
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.embeds import Embed
 from rocketwatch.utils.liquidity import (
     CEX,
@@ -51,6 +48,8 @@ from rocketwatch.utils.shared_w3 import w3
 from rocketwatch.utils.time_debug import timerun, timerun_async
 from rocketwatch.utils.visibility import is_hidden
 
+from .charts import DepthSeries, TickFormat, plot_market_depth
+
 
 @dataclass(frozen=True)
 class MarketConfig:
@@ -300,134 +299,21 @@ class Wall(commands.GroupCog, name="wall"):
         prefix: str = "",
         suffix: str = "",
     ) -> ticker.FuncFormatter:
-        """Tick formatter with automatic K/M/B suffixing and four-figure
-        full-number output (1000-9999) for readability."""
-
-        def formatter(_x: float, _pos: float) -> str:
-            value = _x * scale + offset
-            levels = [
-                (1_000_000_000, 1_000_000_000, "B"),
-                (1_000_000, 1_000_000, "M"),
-                (10_000, 1_000, "K"),
-            ]
-            modifier = ""
-            for threshold, divisor, s in levels:
-                if value >= threshold:
-                    modifier = s
-                    value /= divisor
-                    break
-
-            if value >= 1000:
-                value_str = f"{value:,.0f}"
-            else:
-                value_str = f"{value:{base_fmt}}".rstrip(".")
-            return prefix + value_str + modifier + suffix
-
-        return ticker.FuncFormatter(formatter)
+        return ticker.FuncFormatter(
+            TickFormat(
+                base_fmt, scale=scale, offset=offset, prefix=prefix, suffix=suffix
+            )
+        )
 
     @staticmethod
-    def _plot_data(
-        x: np.ndarray,
-        primary_price: float,
-        cex_data: OrderedDict[CEX, np.ndarray],
-        dex_data: OrderedDict[DEX, np.ndarray],
-        config: MarketConfig,
-        bottom_formatter: ticker.Formatter,
-        top_formatter: ticker.Formatter,
-        y_right_formatter: ticker.Formatter,
-    ) -> figure.Figure:
-        fig, ax = plt.subplots(figsize=(10, 5))
-
-        ax.minorticks_on()
-        ax.grid(True, which="major", linestyle="--", linewidth=0.5, alpha=0.5)
-        ax.grid(True, which="minor", linestyle=":", linewidth=0.3, alpha=0.5)
-
-        ax.set_xlabel("price")
-        ax.xaxis.labelpad = 8
-        ax.set_ylabel("depth")
-        ax.yaxis.labelpad = 10
-
-        y = []
-        colors = []
-
+    def _label_depth_data(
+        cex_data: OrderedDict[CEX, np.ndarray], dex_data: OrderedDict[DEX, np.ndarray]
+    ) -> tuple[list[DepthSeries], list[DepthSeries]]:
         max_unique = 7 - min(len(dex_data), 4) if dex_data else 9
         cex_data_aggr = Wall._label_exchange_data(cex_data, max_unique, "#555555")
         max_unique = 7 - min(len(cex_data), 4) if cex_data else 9
         dex_data_aggr = Wall._label_exchange_data(dex_data, max_unique, "#777777")
-
-        y_offset = 0.0
-        max_label_length: int = np.max(
-            [len(t[1]) for t in (cex_data_aggr + dex_data_aggr)]
-        )
-
-        def add_data(
-            _data: list[tuple[np.ndarray, str, str]], _name: str | None
-        ) -> None:
-            labels, handles = [], []
-            for y_values, label, color in _data:
-                y.append(y_values)
-                labels.append(f"{label:\u00a0<{max_label_length}}")
-                colors.append(color)
-                handles.append(Rectangle((0, 0), 1, 1, color=color))
-
-            nonlocal y_offset
-            legend = ax.legend(
-                handles,
-                labels,
-                title=_name,
-                loc="upper left",
-                bbox_to_anchor=(0, 1 - y_offset),
-                prop=fm.FontProperties(family="monospace", size=10),
-            )
-            ax.add_artist(legend)
-            y_offset += 0.025 + 0.055 * (len(_data) + int(_name is not None))
-
-        if dex_data and cex_data:
-            add_data(dex_data_aggr, "DEX")
-            add_data(cex_data_aggr, "CEX")
-        elif dex_data:
-            add_data(dex_data_aggr, None)
-        else:
-            add_data(cex_data_aggr, None)
-
-        ax.stackplot(
-            x, np.array(y[::-1]), colors=colors[::-1], edgecolor="black", linewidth=0.3
-        )
-        ax.axvline(primary_price, color="black", linestyle="--", linewidth=1)
-
-        range_size = x[-1] - x[0]
-        ax.set_xlim((x[0], x[-1]))
-
-        # Matplotlib's default locator may suggest ticks outside xlim for
-        # visual margin — clamp to the actual data range so labels don't spill
-        # past the plot edges.
-        x_ticks = [t for t in ax.get_xticks() if x[0] <= t <= x[-1]]
-        ax.set_xticks(
-            [t for t in x_ticks if abs(t - primary_price) >= range_size / 20]
-            + [primary_price]
-        )
-        ax.xaxis.set_major_formatter(bottom_formatter)
-
-        ax_top = ax.twiny()
-        ax_top.minorticks_on()
-        ax_top.set_xlim(ax.get_xlim())
-        ax_top.set_xticks(
-            [t for t in x_ticks if abs(t - primary_price) >= range_size / 10]
-            + [primary_price]
-        )
-        ax_top.xaxis.set_major_formatter(top_formatter)
-
-        ax.yaxis.set_major_formatter(
-            Wall._get_formatter("#.3g", prefix=config.primary_prefix)
-        )
-
-        ax_right = ax.twinx()
-        ax_right.minorticks_on()
-        ax_right.set_yticks(ax.get_yticks())
-        ax_right.set_ylim(ax.get_ylim())
-        ax_right.yaxis.set_major_formatter(y_right_formatter)
-
-        return fig
+        return cex_data_aggr, dex_data_aggr
 
     async def _run(
         self,
@@ -495,20 +381,18 @@ class Wall(commands.GroupCog, name="wall"):
         liquidity_primary = sum((y[0] + y[-1]) for y in (dex_data | cex_data).values())
         liquidity_secondary = liquidity_primary * (secondary_price / primary_price)
 
-        buffer = BytesIO()
-        fig = self._plot_data(
+        file_name = "wall.png"
+        file = await chart_renderer.render_file(
+            plot_market_depth,
             x,
             primary_price,
-            cex_data,
-            dex_data,
-            config,
-            bottom_formatter=bottom_formatter,
-            top_formatter=top_formatter,
-            y_right_formatter=y_right_formatter,
+            *self._label_depth_data(cex_data, dex_data),
+            config.primary_prefix,
+            bottom_formatter,
+            top_formatter,
+            y_right_formatter,
+            filename=file_name,
         )
-        fig.savefig(buffer, format="png")
-        plt.close(fig)
-        buffer.seek(0)
 
         embed.add_field(
             name="Current Price",
@@ -526,9 +410,8 @@ class Wall(commands.GroupCog, name="wall"):
         )
         embed.add_field(name="Sources", value=", ".join(source_desc))
 
-        file_name = "wall.png"
         embed.set_image(url=f"attachment://{file_name}")
-        await interaction.followup.send(embed=embed, files=[File(buffer, file_name)])
+        await interaction.followup.send(embed=embed, files=[file])
         return None
 
     @app_commands.command(name="rpl")
@@ -642,7 +525,7 @@ class Wall(commands.GroupCog, name="wall"):
             primary_price=market_price,
             secondary_price=reth_usd,
             # Bottom = % relative to the protocol rate. The dashed vertical
-            # line (drawn at primary_price = market_price by _plot_data) then
+            # line (drawn at primary_price = market_price by plot_market_depth) then
             # reads as the pool's discount/premium vs. the canonical peg.
             bottom_formatter=self._get_formatter(
                 "+.3f", scale=100 / protocol_rate, offset=-100, suffix="%"
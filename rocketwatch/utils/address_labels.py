@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from collections import Counter
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
 from functools import cache
 from pathlib import Path
 from typing import Any, cast
 
 import aiohttp
+from cachetools import LRUCache
 from eth_typing import ChecksumAddress
 from pymongo import AsyncMongoClient
 from pymongo.asynchronous.collection import AsyncCollection
@@ -54,8 +57,12 @@ _PROJECT_OVERRIDES: dict[str, str] = {
 }
 
 
+_OLI_CONCURRENCY = 4
+
 _session: aiohttp.ClientSession | None = None
 _collection: AsyncCollection[dict[str, Any]] | None = None
+_memory: LRUCache[ChecksumAddress, dict[str, Any]] = LRUCache(maxsize=8192)
+_pending: dict[ChecksumAddress, asyncio.Future[str | None]] = {}
 
 
 def _get_collection() -> AsyncCollection[dict[str, Any]]:
@@ -68,6 +75,10 @@ def _get_collection() -> AsyncCollection[dict[str, Any]]:
     return _collection
 
 
+def clear() -> None:
+    _memory.clear()
+
+
 async def _get_session() -> aiohttp.ClientSession:
     global _session
     if _session is None or _session.closed:
@@ -126,47 +137,133 @@ async def _fetch_from_oli(address: ChecksumAddress) -> str | None:
     return _pick_display_name(data.get("labels", []))
 
 
-async def get_address_name(address: ChecksumAddress) -> str | None:
-    """Look up a display name for `address`.
-
-    Resolution order: hand-curated overrides (resources/addresses.json) →
-    MongoDB cache → OLI. Returns None when no label exists or transport
-    failures prevent a result.
-    """
-    if manual := _manual_names().get(address):
-        return manual
-
+def _usable_name(doc: dict[str, Any]) -> tuple[bool, str | None]:
+    """Whether a cached entry can be served, and the name it holds."""
+    cached_name = doc.get("name")
+    if isinstance(cached_name, str):
+        return True, cached_name
+    fetched_at = doc.get("fetched_at")
+    if isinstance(fetched_at, datetime) and (
+        datetime.now(UTC) - fetched_at < _NEGATIVE_TTL
+    ):
+        return True, None
+    return False, None
+
+
+async def _resolve(
+    address: ChecksumAddress,
+    check_mongo: bool = True,
+    limit: asyncio.Semaphore | None = None,
+) -> str | None:
     collection = _get_collection()
 
-    try:
-        cached = await collection.find_one({"_id": address})
-    except Exception:
-        log.exception("Mongo lookup failed for %s; falling through to OLI", address)
-        cached = None
-
-    if cached is not None:
-        cached_name = cached.get("name")
-        if isinstance(cached_name, str):
-            return cached_name
-        fetched_at = cached.get("fetched_at")
-        if isinstance(fetched_at, datetime) and (
-            datetime.now(UTC) - fetched_at < _NEGATIVE_TTL
-        ):
-            return None
+    if check_mongo:
+        try:
+            cached = await collection.find_one({"_id": address})
+        except Exception:
+            log.exception("Mongo lookup failed for %s; falling through to OLI", address)
+            cached = None
+
+        if cached is not None:
+            usable, cached_name = _usable_name(cached)
+            if usable:
+                _memory[address] = cached
+                return cached_name
 
     try:
-        name = await _fetch_from_oli(address)
+        if limit is None:
+            name = await _fetch_from_oli(address)
+        else:
+            async with limit:
+                name = await _fetch_from_oli(address)
     except Exception:
         log.exception("OLI fetch failed for %s; not caching", address)
         return None
 
+    doc = {"name": name, "fetched_at": datetime.now(UTC)}
+    _memory[address] = doc
     try:
-        await collection.update_one(
-            {"_id": address},
-            {"$set": {"name": name, "fetched_at": datetime.now(UTC)}},
-            upsert=True,
-        )
+        await collection.update_one({"_id": address}, {"$set": doc}, upsert=True)
     except Exception:
         log.exception("Mongo upsert failed for %s; result not cached", address)
 
     return name
+
+
+async def _resolve_once(
+    address: ChecksumAddress,
+    check_mongo: bool = True,
+    limit: asyncio.Semaphore | None = None,
+) -> str | None:
+    # concurrent lookups of the same address share one fetch
+    if (pending := _pending.get(address)) is not None:
+        return await asyncio.shield(pending)
+
+    future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+    _pending[address] = future
+    try:
+        name = await _resolve(address, check_mongo, limit)
+        future.set_result(name)
+        return name
+    except BaseException as err:
+        future.set_exception(err)
+        future.exception()
+        raise
+    finally:
+        del _pending[address]
+
+
+def _from_memory(address: ChecksumAddress) -> tuple[bool, str | None]:
+    if manual := _manual_names().get(address):
+        return True, manual
+    if (doc := _memory.get(address)) is not None:
+        return _usable_name(doc)
+    return False, None
+
+
+async def get_address_name(address: ChecksumAddress) -> str | None:
+    """Look up a display name for `address`.
+
+    Resolution order: hand-curated overrides (resources/addresses.json) →
+    in-process cache → MongoDB cache → OLI. Returns None when no label
+    exists or transport failures prevent a result.
+    """
+    found, name = _from_memory(address)
+    if found:
+        return name
+    return await _resolve_once(address)
+
+
+async def prefetch_address_names(addresses: Iterable[ChecksumAddress]) -> None:
+    """Load labels for many addresses ahead of `get_address_name` calls.
+
+    Cached entries come from one Mongo query; the rest are fetched from OLI
+    concurrently, at most `_OLI_CONCURRENCY` requests at a time.
+    """
+    targets = [
+        a
+        for a in dict.fromkeys(addresses)
+        if not _from_memory(a)[0] and a not in _pending
+    ]
+    if not targets:
+        return
+
+    missing = set(targets)
+    try:
+        docs = await _get_collection().find({"_id": {"$in": targets}}).to_list()
+    except Exception:
+        log.exception("Mongo lookup failed for %d addresses", len(targets))
+        docs = []
+    for doc in docs:
+        if _usable_name(doc)[0]:
+            _memory[doc["_id"]] = doc
+            missing.discard(doc["_id"])
+
+    limit = asyncio.Semaphore(_OLI_CONCURRENCY)
+    await asyncio.gather(
+        *(
+            _resolve_once(a, check_mongo=False, limit=limit)
+            for a in targets
+            if a in missing
+        )
+    )
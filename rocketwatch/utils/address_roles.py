@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import LRUCache
+from eth_typing import BlockIdentifier, ChecksumAddress
+from web3.constants import ADDRESS_ZERO
+
+from rocketwatch.utils.call_cache import call_cache
+from rocketwatch.utils.rocketpool import rp
+from rocketwatch.utils.shared_w3 import w3
+
+log = logging.getLogger("rocketwatch.address_roles")
+
+
+@dataclass(frozen=True, slots=True)
+class AddressRoles:
+    """What Rocket Pool knows about an address, as shown in address links."""
+
+    node: bool = False
+    megapool: bool = False
+    minipool: bool = False
+    contract: bool = False
+    # only set for nodes
+    node_megapool: ChecksumAddress | None = None
+    smoothing_pool: bool = False
+    odao_member_id: str = ""
+    security_member_id: str = ""
+
+
+# Facts that never revert once true: nodes can't deregister, megapool and
+# minipool contracts stay registered, and a node's megapool address is fixed.
+# Only positive answers are kept here, everything else goes through
+# call_cache, which holds "latest" results until the head moves.
+_kinds: LRUCache[ChecksumAddress, str] = LRUCache(maxsize=16_384)
+_node_megapools: LRUCache[ChecksumAddress, ChecksumAddress] = LRUCache(maxsize=16_384)
+_contracts: LRUCache[ChecksumAddress, bool] = LRUCache(maxsize=16_384)
+
+
+def clear() -> None:
+    _kinds.clear()
+    _node_megapools.clear()
+    _contracts.clear()
+
+
+async def _resolve_kinds(
+    addresses: list[ChecksumAddress],
+) -> dict[ChecksumAddress, str | None]:
+    kinds: dict[ChecksumAddress, str | None] = {a: _kinds.get(a) for a in addresses}
+    unknown = [a for a in addresses if a not in _kinds]
+    without_megapool = [
+        a for a in addresses if _kinds.get(a) == "node" and a not in _node_megapools
+    ]
+    if not (unknown or without_megapool):
+        return kinds
+
+    node_manager = await rp.get_contract_by_name("rocketNodeManager")
+    minipool_manager = await rp.get_contract_by_name("rocketMinipoolManager")
+    storage = await rp.assemble_contract("rocketStorage", rp.addresses["rocketStorage"])
+    calls: list[Any] = []
+    for address in unknown:
+        sha3 = w3.solidity_keccak(["string", "address"], ["megapool.exists", address])
+        calls += [
+            node_manager.functions.getNodeExists(address),
+            storage.functions.getBool(sha3),
+            minipool_manager.functions.getMinipoolExists(address),
+            node_manager.functions.getMegapoolAddress(address),
+        ]
+    calls += [node_manager.functions.getMegapoolAddress(a) for a in without_megapool]
+    results = await rp.multicall(calls, require_success=False)
+
+    for i, address in enumerate(unknown):
+        is_node, is_megapool, is_minipool, megapool = results[4 * i : 4 * i + 4]
+        if is_node:
+            kinds[address] = "node"
+            if megapool and megapool != ADDRESS_ZERO:
+                _node_megapools[address] = megapool
+        elif is_megapool:
+            kinds[address] = "megapool"
+        elif is_minipool:
+            kinds[address] = "minipool"
+        if (kind := kinds[address]) is not None:
+            _kinds[address] = kind
+
+    for address, megapool in zip(
+        without_megapool, results[4 * len(unknown) :], strict=True
+    ):
+        if megapool and megapool != ADDRESS_ZERO:
+            _node_megapools[address] = megapool
+    return kinds
+
+
+async def _is_contract(address: ChecksumAddress) -> bool:
+    if address in _contracts:
+        return True
+    key = call_cache.make_key("code", False, address, b"", "latest")
+    code = await call_cache.fetch(key, lambda: w3.eth.get_code(address))
+    if code:
+        _contracts[address] = True
+    return bool(code)
+
+
+async def get_address_roles(
+    addresses: Iterable[str], block: BlockIdentifier = "latest"
+) -> dict[ChecksumAddress, AddressRoles]:
+    """Resolve the roles of many addresses with one multicall per lookup stage.
+
+    Node membership and smoothing pool state are read at `block`, everything
+    else at the latest block.
+    """
+    targets = list(dict.fromkeys(w3.to_checksum_address(a) for a in addresses))
+    if not targets:
+        return {}
+
+    kinds = await _resolve_kinds(targets)
+    nodes = {a: i for i, a in enumerate(a for a in targets if kinds[a] == "node")}
+    node_facts: list[Any] = []
+    if nodes:
+        node_manager = await rp.get_contract_by_name("rocketNodeManager")
+        odao = await rp.get_contract_by_name("rocketDAONodeTrusted")
+        security = await rp.get_contract_by_name("rocketDAOSecurity")
+        calls: list[Any] = []
+        for address in nodes:
+            calls += [
+                node_manager.functions.getSmoothingPoolRegistrationState(address),
+                odao.functions.getMemberID(address),
+                security.functions.getMemberID(address),
+            ]
+        node_facts = await rp.multicall(calls, require_success=False, block=block)
+    is_contract = await asyncio.gather(*(_is_contract(a) for a in targets))
+
+    roles: dict[ChecksumAddress, AddressRoles] = {}
+    for address, contract in zip(targets, is_contract, strict=True):
+        kind = kinds[address]
+        if kind == "node":
+            i = 3 * nodes[address]
+            smoothing_pool, odao_id, security_id = node_facts[i : i + 3]
+            roles[address] = AddressRoles(
+                node=True,
+                contract=contract,
+                node_megapool=_node_megapools.get(address),
+                smoothing_pool=bool(smoothing_pool),
+                odao_member_id=odao_id or "",
+                security_member_id=security_id or "",
+            )
+        else:
+            roles[address] = AddressRoles(
+                megapool=kind == "megapool",
+                minipool=kind == "minipool",
+                contract=contract,
+            )
+    return roles
+
+
+async def prefetch_address_roles(
+    addresses: Iterable[str], block: BlockIdentifier = "latest"
+) -> None:
+    """Warm the caches for addresses that are about to be formatted."""
+    try:
+        await get_address_roles(addresses, block)
+    except Exception as err:
+        log.warning(f"Failed to prefetch address roles: {err}")
@@ -0,0 +1,107 @@
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import ClientResponseError
+from cachetools import LRUCache, TTLCache
+
+from rocketwatch.utils.coalesce import Coalescer
+from rocketwatch.utils.shared_w3 import bacon
+
+log = logging.getLogger("rocketwatch.beacon_cache")
+
+type BeaconBlock = dict[str, Any]
+type ProposerDuties = dict[int, int]
+
+
+def _trim_block(block: BeaconBlock) -> BeaconBlock:
+    # attestations and transactions make up most of a block and nothing reads them
+    body = {k: v for k, v in block["body"].items() if k != "attestations"}
+    if payload := body.get("execution_payload"):
+        body["execution_payload"] = {
+            k: v for k, v in payload.items() if k != "transactions"
+        }
+    return block | {"body": body}
+
+
+class BeaconCache:
+    """Shared cache for beacon blocks and proposer duties.
+
+    Only data that can't change anymore is kept: blocks (or their absence)
+    at or below the last finalized slot, and duties of epochs whose
+    dependent root is final. Duties of later epochs are reused for a
+    single slot, which is enough for a burst of lookups within one epoch.
+    """
+
+    def __init__(
+        self, max_blocks: int = 256, max_epochs: int = 1024, duties_ttl: float = 12
+    ) -> None:
+        self._blocks: LRUCache[int, BeaconBlock | None] = LRUCache(max_blocks)
+        self._duties: LRUCache[int, ProposerDuties] = LRUCache(max_epochs)
+        self._recent_duties: TTLCache[int, ProposerDuties] = TTLCache(64, duties_ttl)
+        self._pending: Coalescer[Hashable] = Coalescer()
+        self.finalized_slot = -1
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._duties.clear()
+        self._recent_duties.clear()
+        self.finalized_slot = -1
+
+    def set_finalized_slot(self, slot: int) -> None:
+        self.finalized_slot = max(self.finalized_slot, slot)
+
+    async def _get[V](self, key: Hashable, fetch: Callable[[], Awaitable[V]]) -> V:
+        # concurrent lookups for the same key share one request
+        if key in self._pending:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return await self._pending.run(key, fetch)
+
+    async def get_block(self, slot: int) -> BeaconBlock | None:
+        """Block message at `slot`, None if the slot was missed."""
+        if slot in self._blocks:
+            self.hits += 1
+            return self._blocks[slot]
+
+        async def fetch() -> BeaconBlock | None:
+            block: BeaconBlock | None
+            try:
+                block = _trim_block(
+                    (await bacon.get_block(str(slot)))["data"]["message"]
+                )
+            except ClientResponseError as e:
+                if e.status != HTTPStatus.NOT_FOUND:
+                    raise
+                block = None
+            if slot <= self.finalized_slot:
+                self._blocks[slot] = block
+            return block
+
+        return await self._get(("block", slot), fetch)
+
+    async def get_proposer_duties(self, epoch: int) -> ProposerDuties:
+        """Validator index of the scheduled proposer for every slot of `epoch`."""
+        for cache in (self._duties, self._recent_duties):
+            if epoch in cache:
+                self.hits += 1
+                return cache[epoch]
+
+        async def fetch() -> ProposerDuties:
+            resp = await bacon.get_block_proposer_duties(str(epoch))
+            duties = {int(d["slot"]): int(d["validator_index"]) for d in resp["data"]}
+            # duties are derived from the state at the end of the previous epoch
+            if epoch * 32 - 1 <= self.finalized_slot:
+                self._duties[epoch] = duties
+            else:
+                self._recent_duties[epoch] = duties
+            return duties
+
+        return await self._get(("duties", epoch), fetch)
+
+
+beacon_cache = BeaconCache()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import cast
+
+from cachetools import LRUCache
+from eth_typing import BlockNumber, Hash32, HexStr
+from hexbytes import HexBytes
+from web3.types import BlockData, TxData, TxReceipt
+
+from rocketwatch.utils.coalesce import Coalescer
+from rocketwatch.utils.config import cfg
+from rocketwatch.utils.shared_w3 import w3
+
+log = logging.getLogger("rocketwatch.block_cache")
+
+TxHash = HexStr | Hash32 | HexBytes | bytes
+
+
+def _block_of(entry: TxData | TxReceipt) -> int:
+    number = entry.get("blockNumber")
+    return number if number is not None else 2**63
+
+
+class BlockCache:
+    """Shared cache for blocks, transactions and receipts.
+
+    Entries are tagged with the block they belong to. Anything within the
+    lookback distance of the head is dropped at the start of every event
+    cycle, and a block hash that differs from the one seen before for the
+    same height invalidates everything from that height upwards.
+    """
+
+    def __init__(self, max_blocks: int = 256, max_transactions: int = 8192) -> None:
+        self._blocks: LRUCache[tuple[int, bool], BlockData] = LRUCache(max_blocks)
+        self._transactions: LRUCache[HexBytes, TxData] = LRUCache(max_transactions)
+        self._receipts: LRUCache[HexBytes, TxReceipt] = LRUCache(max_transactions)
+        self._block_hashes: LRUCache[int, HexBytes] = LRUCache(max_blocks * 4)
+        self._pending: Coalescer[Hashable] = Coalescer()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._transactions.clear()
+        self._receipts.clear()
+        self._block_hashes.clear()
+
+    def start_cycle(self, latest_block: BlockNumber) -> None:
+        """Drop entries that could still be reorged out before a new event cycle."""
+        self.invalidate(BlockNumber(latest_block - cfg.events.lookback_distance))
+
+    def invalidate(self, from_block: BlockNumber) -> None:
+        for blocks_key in [k for k in self._blocks if k[0] >= from_block]:
+            del self._blocks[blocks_key]
+        for cache in (self._transactions, self._receipts):
+            for tx_key in [k for k, v in cache.items() if _block_of(v) >= from_block]:
+                del cache[tx_key]
+        for number in [n for n in self._block_hashes if n >= from_block]:
+            del self._block_hashes[number]
+
+    def _observe_block(self, number: int | None, block_hash: bytes | None) -> None:
+        if number is None or block_hash is None:
+            return
+        known_hash = self._block_hashes.get(number)
+        if known_hash is not None and known_hash != block_hash:
+            log.warning(f"Reorg detected at block {number}, invalidating cache")
+            self.invalidate(BlockNumber(number))
+        self._block_hashes[number] = HexBytes(block_hash)
+
+    async def _get[K: Hashable, V](
+        self,
+        cache: LRUCache[K, V],
+        key: K,
+        fetch: Callable[[], Awaitable[V]],
+    ) -> V:
+        if key in cache:
+            self.hits += 1
+            return cache[key]
+
+        # concurrent lookups for the same key share one request
+        pending_key = (id(cache), key)
+        if pending_key in self._pending:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return await self._pending.run(pending_key, fetch)
+
+    async def get_block(
+        self, block_number: BlockNumber, full_transactions: bool = False
+    ) -> BlockData:
+        async def fetch() -> BlockData:
+            block: BlockData = await w3.eth.get_block(
+                block_number, full_transactions=full_transactions
+            )
+            self._observe_block(block.get("number"), block.get("hash"))
+            if full_transactions:
+                for txn in block.get("transactions", []):
+                    txn = cast(TxData, txn)
+                    if "hash" in txn:
+                        self._transactions[HexBytes(txn["hash"])] = txn
+            self._blocks[(block_number, full_transactions)] = block
+            return block
+
+        return await self._get(self._blocks, (block_number, full_transactions), fetch)
+
+    async def get_transaction(self, tx_hash: TxHash) -> TxData:
+        key = HexBytes(tx_hash)
+
+        async def fetch() -> TxData:
+            txn: TxData = await w3.eth.get_transaction(key)
+            if txn.get("blockNumber") is not None:
+                # pending transactions aren't cached
+                self._observe_block(txn.get("blockNumber"), txn.get("blockHash"))
+                self._transactions[key] = txn
+            return txn
+
+        return await self._get(self._transactions, key, fetch)
+
+    async def get_transaction_receipt(self, tx_hash: TxHash) -> TxReceipt:
+        key = HexBytes(tx_hash)
+
+        async def fetch() -> TxReceipt:
+            receipt: TxReceipt = await w3.eth.get_transaction_receipt(key)
+            self._store_receipt(receipt)
+            return receipt
+
+        return await self._get(self._receipts, key, fetch)
+
+    def _store_receipt(self, receipt: TxReceipt) -> None:
+        self._observe_block(receipt.get("blockNumber"), receipt.get("blockHash"))
+        self._receipts[HexBytes(receipt["transactionHash"])] = receipt
+
+    async def prefetch_block_receipts(self, block_numbers: Iterable[int]) -> None:
+        """Load all receipts of the given blocks with one `eth_getBlockReceipts` each."""
+
+        async def prefetch(block_number: int) -> None:
+            try:
+                receipts = await w3.eth.get_block_receipts(block_number)
+            except Exception as err:
+                # not every node supports it, single lookups still work
+                log.warning(f"Failed to prefetch receipts for {block_number}: {err}")
+                return
+            for receipt in receipts:
+                self._store_receipt(receipt)
+
+        await asyncio.gather(*[prefetch(block) for block in set(block_numbers)])
+
+
+block_cache = BlockCache()
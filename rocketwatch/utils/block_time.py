@@ -1,49 +1,204 @@
+import asyncio
+import bisect
 import logging
-import math
+from collections.abc import Iterable
+from typing import Any
 
-from aiocache import cached
+from cachetools import LRUCache
 from eth_typing import BlockNumber
+from pymongo import AsyncMongoClient, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
 from web3.types import BlockData
 
+from rocketwatch.utils.config import cfg
 from rocketwatch.utils.shared_w3 import w3
 
 log = logging.getLogger("rocketwatch.block_time")
 
+# only blocks this far below the head are written to the index
+_FINALITY_DISTANCE = 64
+
+_timestamps: LRUCache[int, int] = LRUCache(maxsize=65_536)
+_collection: AsyncCollection[dict[str, Any]] | None = None
+
+
+def _get_collection() -> AsyncCollection[dict[str, Any]]:
+    global _collection
+    if _collection is None:
+        client: AsyncMongoClient[dict[str, Any]] = AsyncMongoClient(
+            cfg.mongodb.uri, tz_aware=True
+        )
+        _collection = client.rocketwatch.block_timestamps
+    return _collection
+
 
-@cached()
 async def block_to_ts(block_number: int) -> int:
+    if (ts := _timestamps.get(block_number)) is not None:
+        return ts
     block: BlockData = await w3.eth.get_block(block_number)
-    return block.get("timestamp", 0)
+    ts = block.get("timestamp", 0)
+    _timestamps[block_number] = ts
+    return ts
 
 
-async def ts_to_block(target_ts: int) -> BlockNumber:
-    log.debug(f"Looking for block at timestamp {target_ts}")
-    if target_ts < await block_to_ts(1):
-        # genesis block doesn't have a timestamp
-        return BlockNumber(0)
+class _KnownBlocks:
+    """Sorted (timestamp, block) points to search between.
+
+    Seeded from the persistent index and extended with every block probed
+    during a lookup, so later targets in the same pass start from a tighter
+    range. New points are written back in one go by `persist`.
+    """
+
+    def __init__(self) -> None:
+        self.points: list[tuple[int, int]] = []
+        self.new: dict[int, int] = {}
+        self.latest: BlockNumber | None = None
+
+    def add(self, block: int, ts: int, new: bool = True) -> None:
+        point = (ts, block)
+        idx = bisect.bisect_left(self.points, point)
+        if idx < len(self.points) and self.points[idx] == point:
+            return
+        self.points.insert(idx, point)
+        if new:
+            self.new[block] = ts
+
+    def below(self, target_ts: int) -> tuple[int, int] | None:
+        # highest point with ts <= target
+        idx = bisect.bisect_left(self.points, (target_ts + 1, -1))
+        return self.points[idx - 1] if idx > 0 else None
+
+    def above(self, target_ts: int) -> tuple[int, int] | None:
+        # lowest point with ts >= target
+        idx = bisect.bisect_left(self.points, (target_ts, -1))
+        return self.points[idx] if idx < len(self.points) else None
+
+    async def load(self, targets: list[int]) -> None:
+        collection = _get_collection()
+
+        async def bracket(
+            target_ts: int,
+        ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+            return await asyncio.gather(
+                collection.find_one(
+                    {"timestamp": {"$lte": target_ts}}, sort=[("timestamp", -1)]
+                ),
+                collection.find_one(
+                    {"timestamp": {"$gte": target_ts}}, sort=[("timestamp", 1)]
+                ),
+            )
+
+        try:
+            results = await asyncio.gather(*(bracket(t) for t in targets))
+        except Exception:
+            log.exception("Block timestamp index lookup failed, searching from RPC")
+            return
+
+        for docs in results:
+            for doc in docs:
+                if doc is not None:
+                    self.add(doc["_id"], doc["timestamp"], new=False)
+
+    async def get_latest(self) -> BlockNumber:
+        if self.latest is None:
+            self.latest = await w3.eth.get_block_number()
+            self.add(self.latest, await block_to_ts(self.latest), new=False)
+        return self.latest
 
-    lo = 1
-    hi = await w3.eth.get_block_number() - 1
+    async def persist(self) -> None:
+        # recent blocks can still be reorged out, don't make them permanent
+        cutoff = None if self.latest is None else self.latest - _FINALITY_DISTANCE
+        ops = [
+            UpdateOne({"_id": block}, {"$set": {"timestamp": ts}}, upsert=True)
+            for block, ts in self.new.items()
+            if cutoff is None or block <= cutoff
+        ]
+        if not ops:
+            return
+        try:
+            await _get_collection().bulk_write(ops, ordered=False)
+        except Exception:
+            log.exception("Failed to update block timestamp index")
 
-    # simple binary search over block numbers
-    while lo < hi:
-        mid = math.ceil((lo + hi) / 2)
-        ts = await block_to_ts(mid)
 
+async def _search(
+    target_ts: int, lo: tuple[int, int], hi: tuple[int, int], known: _KnownBlocks
+) -> BlockNumber:
+    (lo_ts, lo_block), (hi_ts, hi_block) = lo, hi
+    slow_steps = 0
+    while hi_block - lo_block > 1:
+        span = hi_block - lo_block
+        if slow_steps >= 2:
+            # uneven block times, fall back to bisection for a step
+            guess = (lo_block + hi_block) // 2
+            slow_steps = 0
+        else:
+            # post-merge blocks are one slot apart, so this is usually spot on
+            guess = lo_block + (target_ts - lo_ts) * span // (hi_ts - lo_ts)
+        guess = min(max(guess, lo_block + 1), hi_block - 1)
+
+        ts = await block_to_ts(guess)
+        known.add(guess, ts)
+        if ts == target_ts:
+            log.debug(f"Exact match: block {guess} @ {ts}")
+            return BlockNumber(guess)
         if ts < target_ts:
-            lo = mid
-        elif ts > target_ts:
-            hi = mid - 1
-        elif ts == target_ts:
-            log.debug(f"Exact match: block {mid} @ {ts}")
-            return BlockNumber(mid)
-
-    # l == r, highest block number below target
-    block = hi
-    if abs(await block_to_ts(block + 1) - target_ts) < abs(
-        await block_to_ts(block) - target_ts
-    ):
-        block += 1
-
-    log.debug(f"Closest match: block {block} @ {await block_to_ts(block)}")
+            lo_ts, lo_block = ts, guess
+        else:
+            hi_ts, hi_block = ts, guess
+
+        if (hi_block - lo_block) * 2 > span:
+            slow_steps += 1
+
+    # adjacent blocks on either side of the target, pick the closer one
+    block = hi_block if abs(hi_ts - target_ts) < abs(lo_ts - target_ts) else lo_block
+    log.debug(f"Closest match: block {block}")
     return BlockNumber(block)
+
+
+async def _resolve(target_ts: int, known: _KnownBlocks) -> BlockNumber:
+    lo = known.below(target_ts)
+    if lo is None:
+        genesis_ts = await block_to_ts(1)
+        if target_ts < genesis_ts:
+            # genesis block doesn't have a timestamp
+            return BlockNumber(0)
+        known.add(1, genesis_ts)
+        lo = (genesis_ts, 1)
+
+    hi = known.above(target_ts)
+    if hi is None:
+        latest = await known.get_latest()
+        hi = known.above(target_ts)
+        if hi is None:
+            return latest
+
+    if lo[0] == target_ts:
+        return BlockNumber(lo[1])
+    if hi[0] == target_ts:
+        return BlockNumber(hi[1])
+    return await _search(target_ts, lo, hi, known)
+
+
+async def ts_to_blocks(timestamps: Iterable[int]) -> list[BlockNumber]:
+    """Map each timestamp to the block closest to it, in one pass.
+
+    Targets are resolved in ascending order against a shared set of known
+    blocks, so each lookup narrows the range for the next one.
+    """
+    targets = list(timestamps)
+    if not targets:
+        return []
+
+    unique = sorted(set(targets))
+    log.debug(f"Looking for blocks at {len(unique)} timestamps")
+    known = _KnownBlocks()
+    await known.load(unique)
+    blocks = {target_ts: await _resolve(target_ts, known) for target_ts in unique}
+    await known.persist()
+    return [blocks[target_ts] for target_ts in targets]
+
+
+async def ts_to_block(target_ts: int) -> BlockNumber:
+    log.debug(f"Looking for block at timestamp {target_ts}")
+    return (await ts_to_blocks([target_ts]))[0]
@@ -0,0 +1,107 @@
+import copy
+import logging
+from collections.abc import Awaitable, Callable, Hashable, MutableMapping
+from typing import Any
+
+from cachetools import LRUCache, TTLCache
+from eth_typing import BlockIdentifier, BlockNumber
+from hexbytes import HexBytes
+
+from rocketwatch.utils.coalesce import Coalescer
+from rocketwatch.utils.config import cfg
+
+log = logging.getLogger("rocketwatch.call_cache")
+
+_BLOCK_TAGS = {"latest", "pending", "safe", "finalized", "earliest"}
+
+# (kind, mainnet, address, calldata, block)
+CallKey = tuple[str, bool, str, bytes, Hashable]
+
+
+class CallCache:
+    """Cache for contract call results.
+
+    Calls pinned to a block hash, or to a block number past the lookback
+    distance of the head, are immutable and kept until evicted. Calls against
+    a block tag like "latest", or a block that could still be reorged out, are
+    only reused until the head advances, or for one slot if nobody reports
+    the head.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._pinned: LRUCache[CallKey, Any] = LRUCache(maxsize)
+        # one slot
+        self._latest: TTLCache[CallKey, Any] = TTLCache(maxsize, ttl=12)
+        self._pending: Coalescer[CallKey] = Coalescer()
+        self._head: BlockNumber | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        mainnet: bool,
+        address: str,
+        calldata: bytes | str,
+        block: BlockIdentifier,
+    ) -> CallKey:
+        block_key: Hashable = block
+        if isinstance(block, str) and block.isdigit():
+            block_key = int(block)
+        elif isinstance(block, bytes):
+            block_key = bytes(block)
+        return kind, mainnet, address, bytes(HexBytes(calldata)), block_key
+
+    def _cache_for(self, key: CallKey) -> MutableMapping[CallKey, Any]:
+        block = key[4]
+        if block in _BLOCK_TAGS:
+            return self._latest
+        if isinstance(block, int) and not self._is_final(block):
+            return self._latest
+        return self._pinned
+
+    def _is_final(self, block: int) -> bool:
+        if self._head is None:
+            return False
+        lookback: int = cfg.events.lookback_distance
+        return block <= self._head - lookback
+
+    def clear(self) -> None:
+        self._pinned.clear()
+        self._latest.clear()
+        self._head = None
+
+    def advance_head(self, block: BlockNumber) -> None:
+        if self._head is None or block > self._head:
+            self._latest.clear()
+        self._head = block
+
+    def get(self, key: CallKey) -> tuple[bool, Any]:
+        cache = self._cache_for(key)
+        if key in cache:
+            self.hits += 1
+            # callers may mutate decoded lists
+            return True, copy.deepcopy(cache[key])
+        self.misses += 1
+        return False, None
+
+    def put(self, key: CallKey, value: Any) -> None:
+        self._cache_for(key)[key] = copy.deepcopy(value)
+
+    async def fetch(self, key: CallKey, call: Callable[[], Awaitable[Any]]) -> Any:
+        found, value = self.get(key)
+        if found:
+            return value
+
+        async def fetch() -> Any:
+            value = await call()
+            self.put(key, value)
+            return value
+
+        # identical calls in flight share one request
+        if key in self._pending:
+            return copy.deepcopy(await self._pending.run(key, fetch))
+        return await self._pending.run(key, fetch)
+
+
+call_cache = CallCache()
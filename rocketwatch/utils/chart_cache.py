@@ -0,0 +1,94 @@
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Literal
+
+from cachetools import LRUCache
+from discord import Embed, File
+
+from rocketwatch.utils.coalesce import Coalescer
+
+log = logging.getLogger("rocketwatch.chart_cache")
+
+# jobs that write the data chart commands are built from
+ChartSource = Literal["db_upkeep", "proposals", "reth_apr"]
+
+# (command, arguments, fingerprint, run of every source)
+ChartKey = tuple[str, Hashable, Hashable, tuple[tuple[ChartSource, int], ...]]
+
+
+@dataclass(frozen=True)
+class ChartResponse:
+    """Embeds and encoded attachments of a chart command."""
+
+    embeds: list[Embed]
+    files: list[tuple[str, bytes]] = field(default_factory=list)
+
+    def get_embeds(self) -> list[Embed]:
+        return [embed.copy() for embed in self.embeds]
+
+    def get_files(self) -> list[File]:
+        # a File is consumed when it's sent, hand out fresh ones every time
+        return [File(BytesIO(data), filename=name) for name, data in self.files]
+
+
+class ChartCache:
+    """Cache for the rendered output of chart commands.
+
+    Entries are keyed by command, arguments, an optional fingerprint of
+    data read outside the DB and the current run of every job the chart
+    is built from. When such a job finishes it calls `invalidate()`, which
+    starts a new run and drops everything built from the previous one.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self._entries: LRUCache[ChartKey, ChartResponse] = LRUCache(maxsize)
+        self._runs: dict[ChartSource, int] = {}
+        self._pending: Coalescer[ChartKey] = Coalescer()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._runs.clear()
+
+    def _runs_of(
+        self, sources: Iterable[ChartSource]
+    ) -> tuple[tuple[ChartSource, int], ...]:
+        return tuple((source, self._runs.get(source, 0)) for source in sorted(sources))
+
+    def invalidate(self, source: ChartSource) -> None:
+        self._runs[source] = self._runs.get(source, 0) + 1
+        stale = [key for key in self._entries if source in dict(key[3])]
+        for key in stale:
+            del self._entries[key]
+        log.debug(f"Dropped {len(stale)} cached charts built from {source}")
+
+    async def fetch(
+        self,
+        command: str,
+        args: Hashable,
+        sources: Iterable[ChartSource],
+        build: Callable[[], Awaitable[ChartResponse]],
+        fingerprint: Hashable = None,
+    ) -> ChartResponse:
+        sources = tuple(sources)
+        key: ChartKey = (command, args, fingerprint, self._runs_of(sources))
+        if (response := self._entries.get(key)) is not None:
+            self.hits += 1
+            return response
+        self.misses += 1
+
+        async def render() -> ChartResponse:
+            response = await build()
+            # don't keep a chart if a source job finished while it was built
+            if key[3] == self._runs_of(sources):
+                self._entries[key] = response
+            return response
+
+        # identical requests in flight share one render
+        return await self._pending.run(key, render)
+
+
+chart_cache = ChartCache()
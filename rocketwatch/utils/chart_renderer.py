@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from types import FrameType
+from typing import Any
+
+from discord import File
+from matplotlib.figure import Figure
+
+log = logging.getLogger("rocketwatch.chart_renderer")
+
+PlotFunction = Callable[..., Figure]
+
+
+def _init_worker() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    signal.signal(signal.SIGALRM, _abort_job)
+
+
+def _abort_job(signum: int, frame: FrameType | None) -> None:
+    raise TimeoutError("chart rendering timed out")
+
+
+def _render(
+    plot: PlotFunction,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    savefig_kwargs: dict[str, Any],
+    timeout: float,
+) -> bytes:
+    from matplotlib import pyplot as plt
+
+    # a worker process runs jobs on its main thread, where the job can time
+    # itself out and free the worker without affecting anyone else's job
+    in_worker = threading.current_thread() is threading.main_thread()
+    if in_worker:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        fig = plot(*args, **kwargs)
+        try:
+            buffer = BytesIO()
+            fig.savefig(buffer, format="png", **savefig_kwargs)
+            return buffer.getvalue()
+        finally:
+            plt.close(fig)
+    finally:
+        if in_worker:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ChartRenderer:
+    """Renders matplotlib charts to PNG in a pool of worker processes.
+
+    A plot function is a module-level callable that builds a figure from
+    plain, picklable data. It runs in a worker together with the PNG
+    encoding, so the event loop never blocks on matplotlib.
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_jobs: int = 4, timeout: float = 60
+    ) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._jobs = asyncio.Semaphore(max_jobs)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # forking a process with a running event loop and open sockets
+            # is asking for trouble, start clean interpreters instead
+            self._executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def render(
+        self,
+        plot: PlotFunction,
+        /,
+        *args: Any,
+        savefig_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        """Build the figure returned by `plot(*args, **kwargs)` and encode it.
+
+        Raises TimeoutError if the job doesn't finish within `timeout`, the job
+        is then aborted in its worker as well.
+        """
+        async with self._jobs:
+            executor = self._get_executor()
+            future = executor.submit(
+                _render, plot, args, kwargs, savefig_kwargs or {}, self.timeout
+            )
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except TimeoutError:
+                log.error(f"Rendering {plot.__qualname__} timed out")
+                raise
+            except BrokenProcessPool:
+                # a worker died, start a fresh pool for the next job
+                self._discard(executor)
+                raise
+
+    async def render_file(
+        self,
+        plot: PlotFunction,
+        /,
+        *args: Any,
+        filename: str = "graph.png",
+        savefig_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> File:
+        png = await self.render(plot, *args, savefig_kwargs=savefig_kwargs, **kwargs)
+        return File(BytesIO(png), filename=filename)
+
+    def _discard(self, executor: Executor) -> None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # another job may already have replaced a broken pool
+        if self._executor is executor:
+            self._executor = None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._discard(self._executor)
+
+
+chart_renderer = ChartRenderer()
@@ -0,0 +1,39 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, cast
+
+
+class Coalescer[K: Hashable]:
+    """Shares one in-flight request between concurrent lookups of a key.
+
+    The first caller runs the request, everyone else arriving before it
+    finishes waits for the same result. Waiters are shielded, cancelling
+    one of them doesn't cancel the request, and cancelling the owner
+    cancels the waiters instead of leaving them hanging.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[K, asyncio.Future[Any]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._pending
+
+    async def run[V](self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        if key in self._pending:
+            return cast(V, await asyncio.shield(self._pending[key]))
+
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await fetch()
+            future.set_result(value)
+            return value
+        except Exception as err:
+            future.set_exception(err)
+            # consumed here, waiters (if any) get their own reference
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._pending[key]
@@ -23,6 +23,8 @@ class ExecutionLayerEndpoint(BaseModel):
 class ExecutionLayerConfig(BaseModel):
     explorer: str
     endpoint: ExecutionLayerEndpoint
+    batch_window_ms: float = 0
+    max_batch_size: int = 100
 
 
 class ConsensusLayerConfig(BaseModel):
@@ -52,6 +54,7 @@ class RocketPoolConfig(BaseModel):
     chain: str = "mainnet"
     manual_addresses: dict[str, str] = {}
     dao_multisigs: list[str] = []
+    coalesce_calls: bool = False
     support: RocketPoolSupport
     dm_warning: DmWarningConfig
 
@@ -113,6 +116,7 @@ class EventsConfig(BaseModel):
     lookback_distance: int
     genesis: int
     block_batch_size: int
+    max_inflight_batches: int = 1
     status_message: dict[str, StatusMessageConfig] = {}
 
 
@@ -1,7 +1,8 @@
+import asyncio
 import contextlib
 import logging
 import math
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from typing import Any, cast
 
@@ -16,7 +17,11 @@ from eth_typing import BlockIdentifier, BlockNumber, ChecksumAddress, HexStr
 from web3.constants import ADDRESS_ZERO
 from web3.types import TxReceipt
 
-from rocketwatch.utils.address_labels import get_address_name
+from rocketwatch.utils.address_labels import (
+    get_address_name,
+    prefetch_address_names,
+)
+from rocketwatch.utils.address_roles import get_address_roles, prefetch_address_roles
 from rocketwatch.utils.block_time import block_to_ts
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.readable import advanced_txn_url, s_hex
@@ -135,6 +140,7 @@ async def build_rich_event_embed(
     embed.add_field(name="Transaction Hash", value=f"{tx_link}{tx_advanced}")
 
     if sender:
+        await prefetch_explorer_urls([sender, caller] if caller else [sender])
         sea = await get_sea_creature_for_address(w3.to_checksum_address(sender))
         sender_link = await el_explorer_url(sender, prefix=sea)
         if caller and (caller != sender) and (caller != ADDRESS_ZERO):
@@ -213,7 +219,7 @@ async def resolve_ens(
         return None, None
 
     try:
-        display_name = await ens.get_name(node_address) or address
+        display_name = await ens.get_name(address) or address
         return display_name, address
     except InvalidName:
         await interaction.followup.send("Invalid address")
@@ -238,6 +244,20 @@ async def get_pdao_delegates() -> dict[str, str]:
     return _pdao_delegates
 
 
+async def prefetch_explorer_urls(
+    addresses: Iterable[str], block: BlockIdentifier = "latest"
+) -> None:
+    """Warm the lookups behind `el_explorer_url` for many addresses at once."""
+    from rocketwatch.utils import ens
+
+    targets = list(dict.fromkeys(w3.to_checksum_address(a) for a in addresses))
+    _, names = await asyncio.gather(
+        prefetch_address_roles(targets, block), ens.get_names(targets)
+    )
+    # labels are only looked up for addresses without an ENS name
+    await prefetch_address_names([a for a in targets if not names[a]])
+
+
 async def el_explorer_url(
     target: str,
     name: str = "",
@@ -257,45 +277,37 @@ async def el_explorer_url(
         chain = cfg.rocketpool.chain
         dashboard_network = "" if (chain == "mainnet") else f"?network={chain}"
 
-        if await rp.is_node(target):
-            megapool_address = await rp.call(
-                "rocketNodeManager.getMegapoolAddress", target
-            )
-            if megapool_address != ADDRESS_ZERO:
-                url = f"https://rocketdash.net/megapool/{megapool_address}{dashboard_network}"
-            if await rp.call(
-                "rocketNodeManager.getSmoothingPoolRegistrationState",
-                target,
-                block=block,
-            ):
+        roles = (await get_address_roles([target], block))[
+            cast(ChecksumAddress, target)
+        ]
+        if roles.node:
+            if roles.node_megapool:
+                url = f"https://rocketdash.net/megapool/{roles.node_megapool}{dashboard_network}"
+            if roles.smoothing_pool:
                 _prefix += ":cup_with_straw:"
 
-            if member_id := await rp.call(
-                "rocketDAONodeTrusted.getMemberID", target, block=block
-            ):
+            if roles.odao_member_id:
                 _prefix += "🔮"
-                name = name or member_id
-            elif member_id := await rp.call(
-                "rocketDAOSecurity.getMemberID", target, block=block
-            ):
+                name = name or roles.odao_member_id
+            elif roles.security_member_id:
                 _prefix += "🔒"
-                name = name or member_id
+                name = name or roles.security_member_id
             elif delegate_name := (await get_pdao_delegates()).get(target):
                 _prefix += "🏛️"
                 name = name or delegate_name
 
-        elif await rp.is_megapool(target):
+        elif roles.megapool:
             url = f"https://rocketdash.net/megapool/{target}{dashboard_network}"
-        elif await rp.is_minipool(target):
+        elif roles.minipool:
             if chain == "mainnet":
                 url = f"https://rocketexplorer.net/validator/{target}"
 
         if not name:
-            name = await ens.get_name(target) or ""
+            name = await ens.get_name(cast(ChecksumAddress, target)) or ""
         if not name:
             name = await get_address_name(cast(ChecksumAddress, target)) or ""
 
-        if await w3.eth.get_code(target):
+        if roles.contract:
             _prefix += "📄"
             if not name:
                 name = (
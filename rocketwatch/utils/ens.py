@@ -1,37 +1,204 @@
+import asyncio
 import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
 from functools import cache
+from typing import Any
 
-from aiocache import cached
+from cachetools import TTLCache
+from discord.utils import as_chunks
 from ens import AsyncENS
 from eth_typing import ChecksumAddress
+from pymongo import AsyncMongoClient, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
 
+from rocketwatch.utils.config import cfg
+from rocketwatch.utils.rocketpool import rp
 from rocketwatch.utils.shared_w3 import w3_mainnet
 
 log = logging.getLogger("rocketwatch.ens")
 
+# reverse records rarely change, but they do
+_NAME_TTL = timedelta(hours=24)
+# addresses per getNames call, far below the eth_call gas limit
+_BATCH_SIZE = 250
+
+_names: TTLCache[ChecksumAddress, str | None] = TTLCache(
+    maxsize=16_384, ttl=_NAME_TTL.total_seconds()
+)
+_addresses: TTLCache[str, ChecksumAddress | None] = TTLCache(
+    maxsize=4096, ttl=_NAME_TTL.total_seconds()
+)
+_queued: dict[ChecksumAddress, asyncio.Future[str | None]] = {}
+_lookup_tasks: set[asyncio.Task[None]] = set()
+_collection: AsyncCollection[dict[str, Any]] | None = None
+
 
 @cache
 def _client() -> AsyncENS:
     return AsyncENS.from_web3(w3_mainnet)
 
 
-@cached(key_builder=lambda _, address: address)
-async def get_name(address: ChecksumAddress) -> str | None:
-    log.debug(f"Retrieving ENS name for {address}")
+def _get_collection() -> AsyncCollection[dict[str, Any]]:
+    global _collection
+    if _collection is None:
+        client: AsyncMongoClient[dict[str, Any]] = AsyncMongoClient(
+            cfg.mongodb.uri, tz_aware=True
+        )
+        _collection = client.rocketwatch.ens_names
+    return _collection
+
+
+def clear() -> None:
+    _names.clear()
+    _addresses.clear()
+
+
+async def _lookup_name(address: ChecksumAddress) -> str | None:
+    result: str | None = await _client().name(address)
+    return result
+
+
+async def _lookup_names(
+    addresses: list[ChecksumAddress],
+) -> dict[ChecksumAddress, str | None]:
+    """Look up reverse records on chain. Failed lookups are left out."""
+    log.debug(f"Retrieving ENS names for {len(addresses)} addresses")
     try:
-        result: str | None = await _client().name(address)
-        return result
+        # ReverseRecords only returns names whose forward record points back
+        # at the address, same as AsyncENS.name
+        contract = await rp.get_contract_by_name("ENSReverseRecords", mainnet=True)
+        names: list[str] = []
+        for batch in as_chunks(addresses, _BATCH_SIZE):
+            names += await contract.functions.getNames(batch).call()
+        return {a: name or None for a, name in zip(addresses, names, strict=True)}
     except Exception as e:
-        log.warning(f"ENS name lookup failed for {address}: {e}")
-        return None
+        log.warning(f"Bulk ENS lookup failed, resolving one by one: {e}")
+
+    results = await asyncio.gather(
+        *(_lookup_name(a) for a in addresses), return_exceptions=True
+    )
+    found: dict[ChecksumAddress, str | None] = {}
+    for address, result in zip(addresses, results, strict=True):
+        if isinstance(result, BaseException):
+            log.warning(f"ENS name lookup failed for {address}: {result}")
+        else:
+            found[address] = result
+    return found
+
+
+async def _load_stored(
+    addresses: list[ChecksumAddress],
+) -> dict[ChecksumAddress, str | None]:
+    try:
+        docs = await (
+            _get_collection()
+            .find(
+                {
+                    "_id": {"$in": addresses},
+                    "fetched_at": {"$gte": datetime.now(UTC) - _NAME_TTL},
+                }
+            )
+            .to_list()
+        )
+    except Exception:
+        log.exception("Mongo lookup of ENS names failed")
+        return {}
+    return {doc["_id"]: doc.get("name") for doc in docs}
+
+
+async def _store(names: dict[ChecksumAddress, str | None]) -> None:
+    now = datetime.now(UTC)
+    try:
+        await _get_collection().bulk_write(
+            [
+                UpdateOne(
+                    {"_id": address},
+                    {"$set": {"name": name, "fetched_at": now}},
+                    upsert=True,
+                )
+                for address, name in names.items()
+            ],
+            ordered=False,
+        )
+    except Exception:
+        log.exception("Failed to store ENS names")
+
+
+async def get_names(
+    addresses: Iterable[ChecksumAddress],
+) -> dict[ChecksumAddress, str | None]:
+    """Reverse-resolve many addresses at once.
+
+    Names come from memory, then from Mongo, and whatever is left is looked
+    up on chain in as few calls as possible. Both caches expire after a day.
+    """
+    targets = list(dict.fromkeys(addresses))
+    names: dict[ChecksumAddress, str | None] = {}
+    missing: list[ChecksumAddress] = []
+    for address in targets:
+        if address in _names:
+            names[address] = _names[address]
+        else:
+            missing.append(address)
+
+    if missing:
+        stored = await _load_stored(missing)
+        names.update(stored)
+        _names.update(stored)
+        missing = [a for a in missing if a not in stored]
+
+    if missing:
+        fetched = await _lookup_names(missing)
+        names.update(fetched)
+        _names.update(fetched)
+        if fetched:
+            await _store(fetched)
+
+    return {address: names.get(address) for address in targets}
+
+
+async def _resolve_queued() -> None:
+    batch = dict(_queued)
+    _queued.clear()
+    try:
+        names = await get_names(batch)
+    except Exception as e:
+        log.warning(f"ENS name lookup failed for {len(batch)} addresses: {e}")
+        names = {}
+    for address, future in batch.items():
+        if not future.done():
+            future.set_result(names.get(address))
+
+
+def _flush_queued() -> None:
+    task = asyncio.create_task(_resolve_queued())
+    _lookup_tasks.add(task)
+    task.add_done_callback(_lookup_tasks.discard)
+
+
+async def get_name(address: ChecksumAddress) -> str | None:
+    if address in _names:
+        return _names[address]
+
+    # lookups started in the same loop iteration share one batch
+    if (future := _queued.get(address)) is None:
+        future = asyncio.get_running_loop().create_future()
+        if not _queued:
+            asyncio.get_running_loop().call_soon(_flush_queued)
+        _queued[address] = future
+    return await asyncio.shield(future)
 
 
-@cached(key_builder=lambda _, name: name)
 async def resolve_name(name: str) -> ChecksumAddress | None:
+    if name in _addresses:
+        return _addresses[name]
+
     log.debug(f"Resolving ENS name {name}")
     try:
         result: ChecksumAddress | None = await _client().address(name)
-        return result
     except Exception as e:
         log.warning(f"ENS address resolution failed for {name}: {e}")
         return None
+    _addresses[name] = result
+    return result
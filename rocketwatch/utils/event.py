@@ -46,6 +46,8 @@ class EventPlugin(commands.Cog):
         self.last_served_block = BlockNumber(cfg.events.genesis - 1)
         self._pending_block = self.last_served_block
         self._last_run = datetime.now() - rate_limit
+        # blocks at which the plugin rebuilt its filters (e.g. after a contract upgrade)
+        self.reconfigured_blocks: list[BlockNumber] = []
 
     def start_tracking(self, block: BlockNumber) -> None:
         self.last_served_block = BlockNumber(block - 1)
@@ -0,0 +1,109 @@
+"""Serialization of `event_queue` documents.
+
+Since schema version 2, embeds are stored as plain dicts and images as PNG
+bytes in the `event_images` collection, keyed by content hash so repeated
+images are only stored once. Rows written before versioning (no `schema`
+field) hold pickled objects and remain readable.
+"""
+
+import hashlib
+import pickle
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from rocketwatch.utils.embeds import Embed
+from rocketwatch.utils.event import Event
+from rocketwatch.utils.image import Image
+
+SCHEMA_VERSION = 2
+IMAGE_KEYS = ("image", "thumbnail")
+
+
+def encode_event(
+    event: Event, channel_id: int
+) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """Build the queue document for `event` and the images it references."""
+    images: dict[str, bytes] = {}
+
+    def store(image: Image | None) -> str | None:
+        if image is None:
+            return None
+        png = image.to_png()
+        digest = hashlib.sha256(png).hexdigest()
+        images[digest] = png
+        return digest
+
+    document = {
+        "_id": event.unique_id,
+        "schema": SCHEMA_VERSION,
+        "embed": event.embed.to_dict(),
+        "topic": event.topic,
+        "event_name": event.event_name,
+        "block_number": event.block_number,
+        "score": event.get_score(),
+        "time_seen": datetime.now(UTC),
+        "image": store(event.image),
+        "thumbnail": store(event.thumbnail),
+        "channel_id": channel_id,
+        "message_id": None,
+    }
+    return document, images
+
+
+async def store_images(
+    db: AsyncDatabase[dict[str, Any]], images: dict[str, bytes]
+) -> None:
+    if not images:
+        return
+    await db.event_images.bulk_write(
+        [
+            UpdateOne({"_id": digest}, {"$setOnInsert": {"data": png}}, upsert=True)
+            for digest, png in images.items()
+        ],
+        ordered=False,
+    )
+
+
+async def load_images(
+    db: AsyncDatabase[dict[str, Any]], entries: Iterable[dict[str, Any]]
+) -> dict[str, bytes]:
+    """Fetch all images referenced by versioned `entries` in a single query."""
+    digests = {
+        entry[key]
+        for entry in entries
+        if entry.get("schema")
+        for key in IMAGE_KEYS
+        if entry.get(key)
+    }
+    if not digests:
+        return {}
+    docs = await db.event_images.find({"_id": {"$in": list(digests)}}).to_list(None)
+    return {doc["_id"]: bytes(doc["data"]) for doc in docs}
+
+
+def decode_embed(entry: dict[str, Any]) -> Embed | None:
+    serialized = entry.get("embed")
+    if not serialized:
+        return None
+    if not entry.get("schema"):
+        embed: Embed = pickle.loads(serialized)
+        return embed
+    return Embed.from_dict(serialized)
+
+
+def decode_image(
+    entry: dict[str, Any], key: str, images: dict[str, bytes]
+) -> bytes | None:
+    serialized = entry.get(key)
+    if not serialized:
+        return None
+    if not entry.get("schema"):
+        image: Image = pickle.loads(serialized)
+        return image.to_png()
+    if serialized not in images:
+        raise KeyError(f"Missing {key} {serialized} for event {entry['_id']}")
+    return images[serialized]
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import logging
 import os
 from collections.abc import Sequence
@@ -7,20 +9,28 @@ from typing import Any, NamedTuple, cast
 from bidict import bidict
 from cachetools import LRUCache
 from eth_abi import abi
-from eth_typing import BlockIdentifier, ChecksumAddress
+from eth_typing import ABI, BlockIdentifier, ChecksumAddress
+from eth_utils.abi import abi_to_signature, get_abi_output_types
+from hexbytes import HexBytes
+from web3._utils.error_formatters_utils import raise_contract_logic_error_on_revert
 from web3.constants import ADDRESS_ZERO
 from web3.contract import AsyncContract
 from web3.contract.async_contract import AsyncContractFunction
+from web3.contract.utils import format_contract_call_return_data_curried
 from web3.exceptions import ContractLogicError
 from web3.types import TxData
 
 from rocketwatch.utils import solidity
+from rocketwatch.utils.call_cache import call_cache
 from rocketwatch.utils.config import cfg
 from rocketwatch.utils.readable import decode_abi
 from rocketwatch.utils.shared_w3 import w3, w3_mainnet
 
 log = logging.getLogger("rocketwatch.rocketpool")
 
+# Error(string)
+_ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")
+
 
 class ValidatorInfo(NamedTuple):
     last_assignment_time: int
@@ -43,13 +53,24 @@ class NoAddressFound(Exception):
     pass
 
 
+class _PendingCall(NamedTuple):
+    fn: AsyncContractFunction
+    future: asyncio.Future[Any]
+
+
 class RocketPool:
     ADDRESS_CACHE: LRUCache[str, ChecksumAddress] = LRUCache(maxsize=128)
     ABI_CACHE: LRUCache[str, str] = LRUCache(maxsize=128)
+    PARSED_ABI_CACHE: LRUCache[str, ABI] = LRUCache(maxsize=128)
+    CONTRACT_CACHE: LRUCache[
+        tuple[str, ChecksumAddress | None, bool], AsyncContract
+    ] = LRUCache(maxsize=512)
 
     def __init__(self) -> None:
         self.addresses: bidict[str, ChecksumAddress] = bidict()
         self._multicall: AsyncContract | None = None
+        self._call_batches: dict[BlockIdentifier, list[_PendingCall]] = {}
+        self._call_batch_tasks: set[asyncio.Task[None]] = set()
 
     async def async_init(self) -> None:
         await self._init_contract_addresses()
@@ -57,6 +78,8 @@ class RocketPool:
     async def flush(self) -> None:
         log.warning("FLUSHING RP CACHE")
         self.ABI_CACHE.clear()
+        self.PARSED_ABI_CACHE.clear()
+        self.CONTRACT_CACHE.clear()
         self.ADDRESS_CACHE.clear()
         self.addresses.clear()
         await self._init_contract_addresses()
@@ -157,10 +180,29 @@ class RocketPool:
             (fn.address, af, fn._encode_transaction_data())
             for fn, af in zip(fns, flags, strict=False)
         ]
-        assert self._multicall is not None
-        results = await self._multicall.functions.aggregate3(encoded).call(
-            block_identifier=block
-        )
+        keys = [
+            call_cache.make_key("aggregate3", False, address, data, block)
+            for address, _, data in encoded
+        ]
+        results: list[Any] = []
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            found, result = call_cache.get(key)
+            results.append(result)
+            if not found:
+                missing.append(i)
+
+        if missing:
+            assert self._multicall is not None
+            fetched = await self._multicall.functions.aggregate3(
+                [encoded[i] for i in missing]
+            ).call(block_identifier=block)
+            for i, result in zip(missing, fetched, strict=True):
+                # a cached revert would bypass require_success on later calls
+                if result[0]:
+                    call_cache.put(keys[i], result)
+                results[i] = result
+
         return [
             RocketPool._decode_fn_output(fns[i], data) if success else None
             for i, (success, data) in enumerate(results)
@@ -267,17 +309,29 @@ class RocketPool:
             raise Exception(f"No abi found for {name} contract")
         return str(decode_abi(compressed_string))
 
+    async def get_parsed_abi_by_name(self, name: str) -> ABI:
+        if name in self.PARSED_ABI_CACHE:
+            return self.PARSED_ABI_CACHE[name]
+        contract_abi: ABI = json.loads(await self.get_abi_by_name(name))
+        self.PARSED_ABI_CACHE[name] = contract_abi
+        return contract_abi
+
     async def assemble_contract(
         self,
         name: str,
         address: ChecksumAddress | None = None,
         mainnet: bool = False,
     ) -> AsyncContract:
-        contract_abi = await self.get_abi_by_name(name)
+        key = (name, address, mainnet)
+        if key in self.CONTRACT_CACHE:
+            return self.CONTRACT_CACHE[key]
+        contract_abi = await self.get_parsed_abi_by_name(name)
         provider = w3_mainnet if mainnet else w3
-        return cast(
+        contract = cast(
             AsyncContract, provider.eth.contract(address=address, abi=contract_abi)
         )
+        self.CONTRACT_CACHE[key] = contract
+        return contract
 
     def get_name_by_address(self, address: ChecksumAddress) -> str | None:
         return self.addresses.inverse.get(address, None)
@@ -308,13 +362,13 @@ class RocketPool:
             {"gas": 2**32}, block_identifier=block
         )
 
-    async def get_function(
+    async def _resolve_function(
         self,
         path: str,
-        *args: Any,
-        address: ChecksumAddress | None = None,
-        mainnet: bool = False,
-    ) -> AsyncContractFunction:
+        args: tuple[Any, ...],
+        address: ChecksumAddress | None,
+        mainnet: bool,
+    ) -> tuple[AsyncContract, str, tuple[Any, ...]]:
         name, function = path.rsplit(".", 1)
         if not address:
             address = await self.get_address_by_name(name)
@@ -323,6 +377,18 @@ class RocketPool:
             w3.to_checksum_address(a) if isinstance(a, str) and w3.is_address(a) else a
             for a in args
         )
+        return contract, function, args
+
+    async def get_function(
+        self,
+        path: str,
+        *args: Any,
+        address: ChecksumAddress | None = None,
+        mainnet: bool = False,
+    ) -> AsyncContractFunction:
+        contract, function, args = await self._resolve_function(
+            path, args, address, mainnet
+        )
         return contract.functions[function](*args)
 
     async def call(
@@ -334,8 +400,99 @@ class RocketPool:
         mainnet: bool = False,
     ) -> Any:
         log.debug(f"Calling {path} (block={block!r})")
-        fn = await self.get_function(path, *args, address=address, mainnet=mainnet)
-        return await fn.call(block_identifier=block)
+        contract, function, args = await self._resolve_function(
+            path, args, address, mainnet
+        )
+        fn = contract.functions[function](*args)
+        key = call_cache.make_key(
+            "call", mainnet, fn.address, contract.encode_abi(function, args), block
+        )
+        if mainnet or not cfg.rocketpool.coalesce_calls or self._multicall is None:
+            return await call_cache.fetch(key, lambda: fn.call(block_identifier=block))
+        return await call_cache.fetch(key, lambda: self._queue_call(fn, block))
+
+    def _queue_call(
+        self, fn: AsyncContractFunction, block: BlockIdentifier
+    ) -> asyncio.Future[Any]:
+        """Defer a call so it can share an aggregate3 with others issued in the same tick."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        if block not in self._call_batches:
+            self._call_batches[block] = []
+            loop.call_soon(self._flush_calls, block)
+        self._call_batches[block].append(_PendingCall(fn, future))
+        return future
+
+    def _flush_calls(self, block: BlockIdentifier) -> None:
+        batch = self._call_batches.pop(block)
+        task = asyncio.create_task(self._run_call_batch(batch, block))
+        self._call_batch_tasks.add(task)
+        task.add_done_callback(self._call_batch_tasks.discard)
+
+    async def _run_call_batch(
+        self, batch: list[_PendingCall], block: BlockIdentifier
+    ) -> None:
+        if len(batch) == 1:
+            await self._run_single_call(batch[0], block)
+            return
+
+        log.debug(f"Coalescing {len(batch)} calls into one multicall (block={block!r})")
+        assert self._multicall is not None
+        try:
+            results = await self._multicall.functions.aggregate3(
+                [(c.fn.address, True, c.fn._encode_transaction_data()) for c in batch]
+            ).call(block_identifier=block)
+        except Exception as err:
+            # e.g. the batch as a whole ran out of gas, retry one by one
+            log.warning(f"Coalesced multicall failed, falling back: {err!r}")
+            await asyncio.gather(*[self._run_single_call(c, block) for c in batch])
+            return
+
+        for pending, (success, data) in zip(batch, results, strict=True):
+            if pending.future.done():
+                continue
+            try:
+                pending.future.set_result(
+                    self._decode_call_result(pending.fn, success, data)
+                )
+            except Exception as err:
+                pending.future.set_exception(err)
+
+    @staticmethod
+    async def _run_single_call(pending: _PendingCall, block: BlockIdentifier) -> None:
+        try:
+            result = await pending.fn.call(block_identifier=block)
+        except Exception as err:
+            if not pending.future.done():
+                pending.future.set_exception(err)
+            return
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    @staticmethod
+    def _decode_call_result(
+        fn: AsyncContractFunction, success: bool, data: bytes
+    ) -> Any:
+        """Decode an aggregate3 result the same way `fn.call()` would."""
+        if not success:
+            # mirror the RPC error a node returns for a reverted eth_call
+            message = "execution reverted"
+            if data[:4] == _ERROR_STRING_SELECTOR:
+                message += f": {abi.decode(['string'], data[4:])[0]}"
+            revert_data = HexBytes(data).to_0x_hex()
+            raise_contract_logic_error_on_revert(
+                {"error": {"code": 3, "message": message, "data": revert_data}}
+            )
+            raise ContractLogicError(message, data=revert_data)
+        return format_contract_call_return_data_curried(
+            fn.w3,
+            False,
+            fn.abi,
+            abi_to_signature(fn.abi),
+            fn._return_data_normalizers or (),
+            get_abi_output_types(fn.abi),
+            data,
+        )
 
     async def get_annual_rpl_inflation(self) -> float:
         inflation_per_interval: float = solidity.to_float(
@@ -1,10 +1,16 @@
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
 from typing import Any
+from urllib.parse import urlsplit
 
-from aiohttp import ClientTimeout
+from aiohttp import ClientResponseError, ClientTimeout
 from eth_typing import URI
 from web3 import AsyncWeb3
 from web3.beacon import AsyncBeacon
+from web3.exceptions import Web3RPCError
 from web3.providers import AsyncBaseProvider, AsyncHTTPProvider
 from web3.types import RPCEndpoint, RPCResponse
 
@@ -13,11 +19,113 @@ from rocketwatch.utils.config import cfg
 log = logging.getLogger("rocketwatch.shared_w3")
 
 
+def _endpoint_name(url: str) -> str:
+    # keep API keys in URL paths out of logs and stats
+    return urlsplit(url).netloc or url
+
+
+def _is_answer(exc: Exception) -> bool:
+    """Whether `exc` is the endpoint's answer to the request rather than a failure."""
+    if isinstance(exc, Web3RPCError):
+        return True
+    if isinstance(exc, ClientResponseError):
+        # e.g. a beacon 404 for a missed slot; throttling is the endpoint's problem
+        return 400 <= exc.status < 500 and exc.status not in (
+            HTTPStatus.REQUEST_TIMEOUT,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        )
+    return False
+
+
+class EndpointHealth:
+    """Latency and error tracking for a single endpoint."""
+
+    FAILURE_THRESHOLD = 3
+    COOLDOWN = 30.0
+    LATENCY_WEIGHT = 0.2
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.latency: float | None = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.LATENCY_WEIGHT * (latency - self.latency)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.FAILURE_THRESHOLD:
+            if self.healthy:
+                log.warning(
+                    "Endpoint %s failed %d times in a row, pausing it for %ds",
+                    self.name,
+                    self.consecutive_failures,
+                    self.COOLDOWN,
+                )
+            self.open_until = time.monotonic() + self.COOLDOWN
+
+
+class EndpointPool[T]:
+    """Routes calls to the fastest healthy endpoint, falling back to the rest.
+
+    Endpoints that keep failing are skipped for a cooldown period, unless no
+    healthy endpoint is left, in which case all of them are tried in order.
+    Client errors and JSON-RPC errors are answers, not failures, and are
+    raised right away.
+    """
+
+    def __init__(self, endpoints: list[T], names: list[str]) -> None:
+        self.endpoints = endpoints
+        self.health = [EndpointHealth(name) for name in names]
+
+    def ordered(self) -> list[tuple[T, EndpointHealth]]:
+        entries = list(zip(self.endpoints, self.health, strict=True))
+        # unmeasured endpoints count as fast so they get probed; ties keep config order
+        return sorted(
+            entries,
+            key=lambda entry: (not entry[1].healthy, entry[1].latency or 0.0),
+        )
+
+    async def run[R](self, call: Callable[[T], Awaitable[R]]) -> R:
+        last_exc: Exception = RuntimeError("no fallback endpoints configured")
+        for endpoint, health in self.ordered():
+            start = time.perf_counter()
+            try:
+                result = await call(endpoint)
+            except Exception as exc:
+                if _is_answer(exc):
+                    # any other endpoint would answer the same
+                    health.record_success(time.perf_counter() - start)
+                    raise
+                health.record_failure()
+                log.warning("Endpoint %s failed: %s", health.name, exc)
+                last_exc = exc
+                continue
+            health.record_success(time.perf_counter() - start)
+            return result
+        raise last_exc
+
+
 class Bacon(AsyncBeacon):
     _fallback_urls: list[str]
 
     def __init__(self, base_url: list[str], request_timeout: float = 10.0) -> None:
         self._fallback_urls = base_url
+        self.pool = EndpointPool(base_url, [_endpoint_name(url) for url in base_url])
         super().__init__(base_url[0], request_timeout=request_timeout)
 
     async def _async_make_get_request(
@@ -25,17 +133,26 @@ class Bacon(AsyncBeacon):
         endpoint_uri: str,
         params: dict[str, str] | None = None,
     ) -> dict[str, Any]:
-        last_exc: Exception = RuntimeError("no fallback URLs configured")
-        for url in self._fallback_urls:
-            try:
-                uri = URI(url + endpoint_uri)
-                return await self._request_session_manager.async_json_make_get_request(
-                    uri, params=params, timeout=ClientTimeout(self.request_timeout)
-                )
-            except Exception as exc:
-                log.warning("Beacon %s failed: %s", url, exc)
-                last_exc = exc
-        raise last_exc
+        async def get(url: str) -> dict[str, Any]:
+            return await self._request_session_manager.async_json_make_get_request(
+                URI(url + endpoint_uri),
+                params=params,
+                timeout=ClientTimeout(self.request_timeout),
+            )
+
+        return await self.pool.run(get)
+
+    async def _async_make_post_request(
+        self, endpoint_uri: str, body: list[str] | dict[str, Any]
+    ) -> dict[str, Any]:
+        async def post(url: str) -> dict[str, Any]:
+            return await self._request_session_manager.async_json_make_post_request(
+                URI(url + endpoint_uri),
+                json=body,
+                timeout=ClientTimeout(self.request_timeout),
+            )
+
+        return await self.pool.run(post)
 
     async def get_validators_by_ids(
         self, state_id: str, ids: list[int]
@@ -45,6 +162,14 @@ class Bacon(AsyncBeacon):
             f"/eth/v1/beacon/states/{state_id}/validators?id={id_str}"
         )
 
+    async def post_validators_by_ids(
+        self, state_id: str, ids: list[str]
+    ) -> dict[str, Any]:
+        # no URL length limit, so a single request can carry thousands of ids
+        return await self._async_make_post_request(
+            f"/eth/v1/beacon/states/{state_id}/validators", {"ids": ids}
+        )
+
     async def get_sync_committee(self, epoch: int) -> dict[str, Any]:
         return await self._async_make_get_request(
             f"/eth/v1/beacon/states/head/sync_committees?epoch={epoch}"
@@ -52,19 +177,100 @@ class Bacon(AsyncBeacon):
 
 
 class AsyncFallbackProvider(AsyncBaseProvider):
-    def __init__(self, providers: list[AsyncHTTPProvider]) -> None:
+    """Tries providers in order until one answers.
+
+    With a positive `batch_window`, calls made within that many seconds of
+    each other are sent as a single JSON-RPC batch instead of one HTTP request
+    each. Per-item errors stay with their caller; a failed batch as a whole
+    moves on to the next provider.
+    """
+
+    def __init__(
+        self,
+        providers: list[AsyncHTTPProvider],
+        batch_window: float = 0.0,
+        max_batch_size: int = 100,
+    ) -> None:
         super().__init__()
         self._providers = providers
+        self.pool = EndpointPool(
+            providers, [_endpoint_name(str(p.endpoint_uri)) for p in providers]
+        )
+        self._batch_window = batch_window
+        self._max_batch_size = max(1, max_batch_size)
+        self._queue: list[tuple[RPCEndpoint, Any, asyncio.Future[RPCResponse]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
 
     async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
-        last_exc: Exception = RuntimeError("no fallback providers configured")
-        for provider in self._providers:
-            try:
-                return await provider.make_request(method, params)
-            except Exception as exc:
-                log.warning("Provider %s failed: %s", provider, exc)
-                last_exc = exc
-        raise last_exc
+        if self._batch_window <= 0:
+            return await self._make_single_request(method, params)
+
+        future: asyncio.Future[RPCResponse] = asyncio.get_running_loop().create_future()
+        self._queue.append((method, params, future))
+        if len(self._queue) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._batch_window, self._flush
+            )
+        return await future
+
+    async def _make_single_request(
+        self, method: RPCEndpoint, params: Any
+    ) -> RPCResponse:
+        async def request(provider: AsyncHTTPProvider) -> RPCResponse:
+            return await provider.make_request(method, params)
+
+        return await self.pool.run(request)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(
+        self, batch: list[tuple[RPCEndpoint, Any, asyncio.Future[RPCResponse]]]
+    ) -> None:
+        try:
+            if len(batch) == 1:
+                method, params, _ = batch[0]
+                responses = [await self._make_single_request(method, params)]
+            else:
+                responses = await self._make_batch_request(
+                    [(method, params) for method, params, _ in batch]
+                )
+        except Exception as exc:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (*_, future), response in zip(batch, responses, strict=True):
+            if not future.done():
+                future.set_result(response)
+
+    async def _make_batch_request(
+        self, requests: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse]:
+        async def request(provider: AsyncHTTPProvider) -> list[RPCResponse]:
+            responses = await provider.make_batch_request(requests)
+            if not isinstance(responses, list):
+                # the node rejected the batch as a whole
+                raise ValueError(responses.get("error", responses))
+            if len(responses) != len(requests):
+                raise ValueError(
+                    f"Expected {len(requests)} responses, got {len(responses)}"
+                )
+            return responses
+
+        return await self.pool.run(request)
 
     async def is_connected(self, show_traceback: bool = False) -> bool:
         for provider in self._providers:
@@ -77,7 +283,13 @@ def _get_web3(endpoint: list[str]) -> AsyncWeb3[Any]:
     providers = [
         AsyncHTTPProvider(ep, request_kwargs={"timeout": 60}) for ep in endpoint
     ]
-    return AsyncWeb3(AsyncFallbackProvider(providers))
+    return AsyncWeb3(
+        AsyncFallbackProvider(
+            providers,
+            batch_window=cfg.execution_layer.batch_window_ms / 1000,
+            max_batch_size=cfg.execution_layer.max_batch_size,
+        )
+    )
 
 
 class _W3Proxy:
@@ -136,3 +348,17 @@ class _BaconProxy:
 w3 = _W3Proxy()
 w3_mainnet = _W3MainnetProxy()
 bacon = _BaconProxy()
+
+
+def get_endpoint_health() -> dict[str, list[EndpointHealth]]:
+    """Health of every endpoint, by client, for clients that were built."""
+    clients: dict[str, list[EndpointHealth]] = {}
+    for label, proxy in (("Execution", w3), ("Execution (mainnet)", w3_mainnet)):
+        instance = object.__getattribute__(proxy, "_instance")
+        provider = getattr(instance, "provider", None)
+        if isinstance(provider, AsyncFallbackProvider):
+            clients[label] = provider.pool.health
+    beacon = object.__getattribute__(bacon, "_instance")
+    if isinstance(beacon, Bacon):
+        clients["Consensus"] = beacon.pool.health
+    return clients
@@ -27,7 +27,7 @@ from typing import (
 from eth_typing import ChecksumAddress
 
 from rocketwatch.utils import solidity
-from rocketwatch.utils.embeds import el_explorer_url
+from rocketwatch.utils.embeds import el_explorer_url, prefetch_explorer_urls
 from rocketwatch.utils.sea_creatures import get_sea_creature_for_address
 
 # ---------------------------------------------------------------------------
@@ -152,8 +152,9 @@ async def _addr(address: ChecksumAddress) -> str:
 async def auto_format(args: Mapping[str, Any], td_class: type) -> dict[str, Any]:
     """Format *args* based on ``Annotated`` markers on *td_class*.
 
-    Returns a **new** dict with converted values.  Address fields are
-    resolved concurrently via :func:`asyncio.gather`.
+    Returns a **new** dict with converted values.  Address lookups are
+    prefetched in bulk, then the links are built concurrently via
+    :func:`asyncio.gather`.
     """
     hints = get_type_hints(td_class, include_extras=True)
     result = dict(args)
@@ -175,6 +176,7 @@ async def auto_format(args: Mapping[str, Any], td_class: type) -> dict[str, Any]
                 async_tasks.append((key, _addr(raw)))
 
     if async_tasks:
+        await prefetch_explorer_urls(args[key] for key, _ in async_tasks)
         keys, coros = zip(*async_tasks, strict=True)
         values = await asyncio.gather(*coros)
         for k, v in zip(keys, values, strict=True):
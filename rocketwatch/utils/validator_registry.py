@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Any
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+log = logging.getLogger("rocketwatch.validator_registry")
+
+
+class ValidatorRegistry:
+    """Beacon chain indices of Rocket Pool validators and their node operators.
+
+    Loaded from the minipools and megapool_validators collections on first
+    use and rebuilt by DBUpkeepTask after every run, which is the only
+    thing that writes validator indices. Lookups are plain dict accesses,
+    so beacon-side loops don't need a DB round trip per validator.
+    """
+
+    def __init__(self) -> None:
+        self._node_operators: dict[int, str | None] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def clear(self) -> None:
+        self._node_operators = {}
+        self._loaded = False
+
+    async def refresh(self, db: AsyncDatabase[dict[str, Any]]) -> None:
+        node_operators: dict[int, str | None] = {}
+        # minipools go last so they win if an index somehow shows up twice
+        for collection in (db.megapool_validators, db.minipools):
+            docs = await collection.find(
+                {"validator_index": {"$ne": None}},
+                {"_id": 0, "validator_index": 1, "node_operator": 1},
+            ).to_list(None)
+            for doc in docs:
+                node_operators[int(doc["validator_index"])] = doc.get("node_operator")
+        self._node_operators = node_operators
+        self._loaded = True
+        log.debug(f"Loaded {len(node_operators)} validator indices")
+
+    async def ensure_loaded(self, db: AsyncDatabase[dict[str, Any]]) -> None:
+        # concurrent callers wait for one load instead of each querying
+        async with self._lock:
+            if not self._loaded:
+                await self.refresh(db)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._node_operators
+
+    def __len__(self) -> int:
+        return len(self._node_operators)
+
+    def get_node_operator(self, index: int) -> str | None:
+        return self._node_operators.get(index)
+
+
+validator_registry = ValidatorRegistry()
@@ -1,14 +1,28 @@
 import uuid
 from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from pymongo import AsyncMongoClient
 from pymongo.asynchronous.database import AsyncDatabase
 
-from rocketwatch.utils import rocketpool, shared_w3
+from rocketwatch.utils import (
+    address_labels,
+    address_roles,
+    block_time,
+    ens,
+    rocketpool,
+    shared_w3,
+)
+from rocketwatch.utils.beacon_cache import beacon_cache
+from rocketwatch.utils.block_cache import block_cache
+from rocketwatch.utils.call_cache import call_cache
+from rocketwatch.utils.chart_cache import chart_cache
+from rocketwatch.utils.chart_renderer import chart_renderer
 from rocketwatch.utils.config import cfg
+from rocketwatch.utils.validator_registry import validator_registry
 from tests.lib.beacon_script import ScriptedBeacon
 from tests.lib.cfg import make_cfg
 from tests.lib.event_log_script import EventLogScript
@@ -26,6 +40,54 @@ shared_w3.bacon._instance = MagicMock()
 cfg._instance = make_cfg()
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+    # These caches are module-global; don't leak chain data between tests.
+    block_cache.clear()
+    beacon_cache.clear()
+    call_cache.clear()
+    block_time._timestamps.clear()
+    address_roles.clear()
+    address_labels.clear()
+    chart_cache.clear()
+    validator_registry.clear()
+    ens.clear()
+    rocketpool.RocketPool.PARSED_ABI_CACHE.clear()
+    rocketpool.RocketPool.CONTRACT_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _offline_ens_cache(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    # The ENS name cache is persisted to Mongo; keep unit tests off the network.
+    collection = MagicMock()
+    collection.find.return_value.to_list = AsyncMock(return_value=[])
+    collection.bulk_write = AsyncMock()
+    monkeypatch.setattr(ens, "_get_collection", lambda: collection)
+    return collection
+
+
+@pytest.fixture(autouse=True)
+def _offline_address_labels(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    # Explorer links prefetch OLI labels; keep Mongo and OLI out of unit tests.
+    collection = MagicMock()
+    collection.find.return_value.to_list = AsyncMock(return_value=[])
+    collection.find_one = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    monkeypatch.setattr(address_labels, "_get_collection", lambda: collection)
+    monkeypatch.setattr(address_labels, "_fetch_from_oli", AsyncMock(return_value=None))
+    return collection
+
+
+_render_thread = ThreadPoolExecutor(max_workers=1)
+
+
+@pytest.fixture(autouse=True)
+def _inline_chart_renderer(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Spawned render workers can't see test patches or the baseline config;
+    # render on a thread instead.
+    monkeypatch.setattr(chart_renderer, "_executor", _render_thread)
+
+
 @pytest.fixture
 def mainnet_cfg(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(cfg, "_instance", make_cfg("mainnet"))
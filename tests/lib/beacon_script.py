@@ -127,6 +127,11 @@ class ScriptedBeacon:
                 data.append(rec)
         return {"data": data}
 
+    async def post_validators_by_ids(
+        self, state_id: str, ids: Sequence[str]
+    ) -> dict[str, Any]:
+        return await self.get_validators_by_ids(state_id, ids)
+
     async def get_block(self, slot_or_state: str) -> dict[str, Any]:
         if slot_or_state not in self._blocks:
             raise KeyError(f"No scripted block for {slot_or_state!r}")
@@ -185,6 +185,9 @@ class ScriptedRocketPool:
         # to return something truthy-or-empty; the calls resolve by address.
         return ""
 
+    async def get_parsed_abi_by_name(self, name: str) -> list[Any]:
+        return []
+
     def contract_at(self, address: ChecksumAddress) -> _ScriptedContract:
         """Scripted contract keyed by address, for code that builds contracts
         via `w3.eth.contract(address=..., abi=...)` rather than by name. Its
@@ -44,6 +44,7 @@ def _make_cog(bot: Any) -> BeaconEvents:
     cog = BeaconEvents.__new__(BeaconEvents)
     cog.bot = bot
     cog.finality_delay_threshold = 3
+    cog.batch_size = 4
     return cog
 
 
@@ -1,14 +1,19 @@
+import asyncio
+from datetime import timedelta
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
 
 from rocketwatch.plugins.db_upkeep_task import db_upkeep_task as dut
 from rocketwatch.plugins.db_upkeep_task.db_upkeep_task import (
     DBUpkeepTask,
+    _changed_fields,
     _derive_validator_status,
     _parse_epoch,
+    _unpack_beacon_validator,
     _unpack_validator_info,
     _unpack_validator_info_dynamic,
     safe_inv,
@@ -16,6 +21,8 @@ from rocketwatch.plugins.db_upkeep_task.db_upkeep_task import (
     safe_to_float,
     safe_to_hex,
 )
+from rocketwatch.plugins.db_upkeep_task.scheduler import Stage, StageScheduler
+from rocketwatch.utils.chart_cache import chart_cache
 from rocketwatch.utils.rocketpool import ValidatorInfo
 from tests.lib.beacon_script import ScriptedBeacon, make_validator_record
 from tests.lib.discord_harness import make_bot
@@ -47,6 +54,7 @@ def _make_cog(bot: Any) -> DBUpkeepTask:
     cog = DBUpkeepTask.__new__(DBUpkeepTask)
     cog.bot = bot
     cog.batch_size = 50
+    cog.beacon_batch_size = 50
     return cog
 
 
@@ -72,6 +80,30 @@ class TestPureHelpers:
         assert _parse_epoch(2**40) is None
         assert _parse_epoch(123) == 123
 
+    def test_unpack_beacon_validator_uses_dotted_paths(self) -> None:
+        fields = _unpack_beacon_validator(
+            make_validator_record(
+                pubkey="0xaa", index=7, balance_gwei=31_000_000_000, exit_epoch=2**40
+            )
+        )
+        assert fields["validator_index"] == 7
+        assert fields["beacon.balance"] == pytest.approx(31.0)
+        assert fields["beacon.exit_epoch"] is None
+
+    def test_changed_fields_only_returns_differences(self) -> None:
+        doc = {"validator_index": 7, "beacon": {"status": "active_ongoing"}}
+        fields = {
+            "validator_index": 7,
+            "beacon.status": "active_exiting",
+            "beacon.exit_epoch": None,
+        }
+        # exit_epoch is missing from the doc, so None still has to be written
+        assert _changed_fields(doc, fields) == {
+            "beacon.status": "active_exiting",
+            "beacon.exit_epoch": None,
+        }
+        assert _changed_fields({"validator_index": 7}, {"validator_index": 7}) == {}
+
     def test_derive_validator_status_priority(self) -> None:
         # Order in _derive_validator_status: dissolved > exited > in_queue >
         # prestake > locked > exiting > staked. Verify a couple of boundary cases.
@@ -168,6 +200,134 @@ class TestPureHelpers:
         assert out["assignment_time"] == 42
 
 
+def _recording_stage(
+    name: str,
+    log: list[str],
+    *depends_on: str,
+    interval: timedelta = timedelta(minutes=5),
+    fail: bool = False,
+) -> Stage:
+    async def run() -> None:
+        log.append(f"start {name}")
+        await asyncio.sleep(0)
+        log.append(f"end {name}")
+        if fail:
+            raise ValueError(name)
+
+    return Stage(name, run, interval, depends_on)
+
+
+class TestStageScheduler:
+    async def test_dependents_wait_for_their_dependencies(self) -> None:
+        log: list[str] = []
+        scheduler = StageScheduler(
+            [
+                _recording_stage("child", log, "parent"),
+                _recording_stage("parent", log),
+                _recording_stage("other", log),
+            ]
+        )
+        first = scheduler.start_due_stages()
+        await asyncio.gather(*first)
+        # independent stages ran side by side, the child had to wait
+        assert log == ["start parent", "start other", "end parent", "end other"]
+
+        second = scheduler.start_due_stages()
+        await asyncio.gather(*second)
+        assert log[4:] == ["start child", "end child"]
+        assert scheduler.start_due_stages() == []
+
+    async def test_failed_dependency_blocks_dependents(self) -> None:
+        log: list[str] = []
+        scheduler = StageScheduler(
+            [
+                _recording_stage("parent", log, fail=True),
+                _recording_stage("child", log, "parent"),
+            ]
+        )
+        await asyncio.gather(*scheduler.start_due_stages())
+        assert scheduler.start_due_stages() == []
+
+        stats = scheduler.stages["parent"].stats
+        assert (stats.runs, stats.failures) == (1, 1)
+        assert stats.last_error == "ValueError('parent')"
+        assert stats.last_duration is not None and not stats.running
+        assert scheduler.stages["child"].stats.runs == 0
+
+    async def test_stages_rerun_after_their_interval(self) -> None:
+        log: list[str] = []
+        scheduler = StageScheduler(
+            [
+                _recording_stage("fast", log, interval=timedelta(0)),
+                _recording_stage("slow", log, interval=timedelta(hours=1)),
+            ]
+        )
+        await asyncio.gather(*scheduler.start_due_stages())
+        await asyncio.gather(*scheduler.start_due_stages())
+        assert scheduler.stages["fast"].stats.runs == 2
+        assert scheduler.stages["slow"].stats.runs == 1
+
+    async def test_concurrency_is_capped(self) -> None:
+        running = peak = 0
+
+        async def run() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        scheduler = StageScheduler(
+            [Stage(f"s{i}", run, timedelta(minutes=5)) for i in range(5)],
+            max_concurrent=2,
+        )
+        await asyncio.gather(*scheduler.start_due_stages())
+        assert peak == 2
+        assert all(s.stats.runs == 1 for s in scheduler.stages.values())
+
+    def test_unknown_dependency_is_rejected(self) -> None:
+        with pytest.raises(ValueError, match="unknown stage"):
+            StageScheduler([_recording_stage("child", [], "missing")])
+
+    def test_upkeep_stage_graph_is_complete(self) -> None:
+        cog = _make_cog(make_bot())
+        stages = cog._build_stages()
+        # constructing the scheduler validates every dependency
+        scheduler = StageScheduler(stages)
+        assert len(scheduler.stages) == len(stages) == 14
+        assert scheduler.stages["refresh_validator_registry"].depends_on == (
+            "update_dynamic_minipool_beacon_data",
+            "update_dynamic_megapool_validator_beacon_data",
+        )
+
+    async def test_failed_stage_is_reported(self) -> None:
+        bot = make_bot()
+        cog = _make_cog(bot)
+        cog.monitor = MagicMock()
+        cog.add_untracked_minipools = AsyncMock(  # type: ignore[method-assign]
+            side_effect=ValueError("boom"), __name__="add_untracked_minipools"
+        )
+        stage = cog._stage(cog.add_untracked_minipools, timedelta(minutes=5))
+        with pytest.raises(ValueError, match="boom"):
+            await stage.run()
+        bot.report_error.assert_awaited_once()
+        assert cog.monitor.ping.call_args.kwargs["state"] == "fail"
+
+    @pytest.mark.parametrize(("written", "invalidated"), [(0, False), (3, True)])
+    async def test_only_stages_that_wrote_invalidate_charts(
+        self, written: int, invalidated: bool
+    ) -> None:
+        cog = _make_cog(make_bot())
+        cog.monitor = MagicMock()
+        cog.add_untracked_minipools = AsyncMock(  # type: ignore[method-assign]
+            return_value=written, __name__="add_untracked_minipools"
+        )
+        stage = cog._stage(cog.add_untracked_minipools, timedelta(minutes=5))
+        before = chart_cache._runs_of(["db_upkeep"])
+        await stage.run()
+        assert (chart_cache._runs_of(["db_upkeep"]) != before) is invalidated
+
+
 class TestUpdateMinipoolBeaconData:
     async def test_writes_decoded_beacon_state(
         self,
@@ -246,6 +406,46 @@ class TestUpdateMinipoolBeaconData:
         await cog.update_dynamic_minipool_beacon_data()
         # If bacon had been called, the empty script would raise KeyError.
 
+    async def test_unchanged_validators_are_not_written(
+        self,
+        mongo_db: AsyncDatabase[dict[str, Any]],
+        scripted_bacon: ScriptedBeacon,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        await mongo_db.minipools.insert_many(
+            [
+                {"_id": 1, "pubkey": "0xaa", "beacon": {"status": "active_ongoing"}},
+                {"_id": 2, "pubkey": "0xbb", "beacon": {"status": "active_ongoing"}},
+            ]
+        )
+        scripted_bacon.register_validators(
+            [
+                make_validator_record(pubkey="0xaa", index=1),
+                make_validator_record(pubkey="0xbb", index=2),
+            ]
+        )
+        cog = _make_cog(make_bot(db=mongo_db))
+        await cog.update_dynamic_minipool_beacon_data()
+
+        # only 0xbb's balance moved
+        scripted_bacon.register_validator(
+            make_validator_record(pubkey="0xbb", index=2, balance_gwei=33_000_000_000)
+        )
+        written: list[Any] = []
+        bulk_write = AsyncCollection.bulk_write
+
+        async def tracking_bulk_write(
+            self: AsyncCollection[Any], requests: list[Any], **kwargs: Any
+        ) -> Any:
+            written.extend(requests)
+            return await bulk_write(self, requests, **kwargs)
+
+        monkeypatch.setattr(AsyncCollection, "bulk_write", tracking_bulk_write)
+        await cog.update_dynamic_minipool_beacon_data()
+
+        assert [r._filter for r in written] == [{"_id": 2}]
+        assert written[0]._doc == {"$set": {"beacon.balance": pytest.approx(33.0)}}
+
 
 class TestUpdateMegapoolValidatorBeaconData:
     async def test_writes_decoded_beacon_state(
@@ -725,7 +925,9 @@ class TestAddStaticMinipoolDepositData:
             )
 
         monkeypatch.setattr(dut, "get_logs", fake_get_logs)
-        monkeypatch.setattr(dut, "ts_to_block", AsyncMock(return_value=100))
+        monkeypatch.setattr(
+            dut, "ts_to_blocks", AsyncMock(side_effect=lambda ts: [100 for _ in ts])
+        )
 
         cog = _make_cog(make_bot(db=mongo_db))
         await cog.add_static_minipool_deposit_data()
@@ -120,6 +120,58 @@ class TestEditEmbed:
         msg.edit.assert_awaited_once()
 
 
+class TestEndpointHealth:
+    async def test_lists_endpoint_stats(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from rocketwatch.plugins.debug import debug as debug_module
+        from rocketwatch.utils.shared_w3 import EndpointHealth
+
+        health = EndpointHealth("node:8545")
+        health.record_success(0.012)
+        health.record_failure()
+        monkeypatch.setattr(
+            debug_module, "get_endpoint_health", lambda: {"Execution": [health]}
+        )
+        cog = Debug(make_bot())
+        interaction = make_interaction()
+        await cog.endpoint_health.callback(cog, interaction)
+        embed = interaction.followup.send.call_args.kwargs["embed"]
+        assert embed.fields[0].name == "Execution"
+        assert "node:8545" in embed.fields[0].value
+        assert "12 ms" in embed.fields[0].value
+        assert "1/2 failed" in embed.fields[0].value
+
+
+class TestUpkeepStats:
+    async def test_lists_stage_stats(self) -> None:
+        from datetime import timedelta
+
+        from rocketwatch.plugins.db_upkeep_task.scheduler import Stage, StageScheduler
+
+        ok = Stage("add_untracked_minipools", AsyncMock(), timedelta(minutes=5))
+        ok.stats.runs, ok.stats.last_start, ok.stats.last_duration = 3, 1000.0, 1.25
+        never = Stage("refresh_validator_registry", AsyncMock(), timedelta(minutes=5))
+        bot = make_bot()
+        bot.get_cog = MagicMock(
+            return_value=MagicMock(scheduler=StageScheduler([ok, never]))
+        )
+        cog = Debug(bot)
+        interaction = make_interaction()
+        await cog.upkeep_stats.callback(cog, interaction)
+        embed = interaction.followup.send.call_args.kwargs["embed"]
+        lines = embed.description.split("\n")
+        assert lines[0] == "🟢 `add_untracked_minipools`: 1.2s <t:1000:R>, 0/3 failed"
+        assert lines[1] == "⚪ `refresh_validator_registry`"
+
+    async def test_missing_cog(self) -> None:
+        bot = make_bot()
+        bot.get_cog = MagicMock(return_value=None)
+        cog = Debug(bot)
+        interaction = make_interaction()
+        await cog.upkeep_stats.callback(cog, interaction)
+        embed = interaction.followup.send.call_args.kwargs["embed"]
+        assert "isn't loaded" in embed.description
+
+
 class TestDebugTransaction:
     async def test_reports_revert_reason(
         self, scripted_rp: ScriptedRocketPool, monkeypatch: pytest.MonkeyPatch
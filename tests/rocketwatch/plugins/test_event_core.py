@@ -0,0 +1,302 @@
+import asyncio
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from eth_typing import BlockNumber
+from pymongo import UpdateOne
+
+from rocketwatch.plugins.event_core.event_core import BlockWindow, EventCore
+from rocketwatch.utils.embeds import Embed
+from rocketwatch.utils.event import Event, EventPlugin
+from rocketwatch.utils.event_queue import encode_event
+from tests.lib.discord_harness import make_bot
+
+
+def _block(n: int) -> BlockNumber:
+    return cast(BlockNumber, n)
+
+
+def _event(block_number: int) -> Event:
+    return Event(
+        embed=Embed(),
+        topic="topic",
+        event_name="event_name",
+        unique_id=f"id-{block_number}",
+        block_number=_block(block_number),
+    )
+
+
+def _make_db() -> MagicMock:
+    db = MagicMock()
+    db.event_queue.distinct = AsyncMock(return_value=[])
+    db.event_queue.insert_many = AsyncMock()
+    db.last_checked_block.replace_one = AsyncMock()
+    return db
+
+
+def _make_cog(
+    bot: Any, *, head_block: int = 0, batch_size: int = 10, inflight: int = 4
+) -> EventCore:
+    # Sidestep __init__: it starts the task loop and a cronitor monitor.
+    cog = EventCore.__new__(EventCore)
+    cog.bot = bot
+    cog.channels = {"default": 1}
+    cog.head_block = _block(head_block)
+    cog.latest_block = _block(0)
+    cog.at_head = False
+    cog._catchup_start_block = None
+    cog.block_batch_size = batch_size
+    cog.max_inflight_batches = inflight
+    cog.suppressed_duplicates = 0
+    cog.message_flush_size = 20
+    return cog
+
+
+def _checked_blocks(db: MagicMock) -> list[int]:
+    return [
+        c.args[1]["block"] for c in db.last_checked_block.replace_one.call_args_list
+    ]
+
+
+class _ScriptedPlugin(EventPlugin):
+    """Emits one event per window; later windows finish first to stress ordering."""
+
+    def __init__(self, bot: Any, *, fail_from: int | None = None) -> None:
+        super().__init__(bot)
+        self.fail_from = fail_from
+        self.reconfigure_at: int | None = None
+
+    async def _get_new_events(self) -> list[Event]:
+        return []
+
+    async def get_past_events(
+        self, from_block: BlockNumber, to_block: BlockNumber
+    ) -> list[Event]:
+        await asyncio.sleep(0.01 * (100 - from_block) / 100)
+        if self.fail_from is not None and from_block >= self.fail_from:
+            raise RuntimeError("rpc down")
+        if self.reconfigure_at is not None and (
+            from_block <= self.reconfigure_at <= to_block
+        ):
+            self.reconfigured_blocks.append(_block(self.reconfigure_at))
+        return [_event(from_block)]
+
+
+class TestPlanWindows:
+    def test_far_behind_plans_full_batches_up_to_limit(self) -> None:
+        cog = _make_cog(make_bot(), head_block=100, batch_size=10, inflight=3)
+        windows = cog._plan_windows(_block(1_000))
+        assert windows == [
+            BlockWindow(_block(101), _block(110), False),
+            BlockWindow(_block(111), _block(120), False),
+            BlockWindow(_block(121), _block(130), False),
+        ]
+
+    def test_last_window_closes_to_head(self) -> None:
+        cog = _make_cog(make_bot(), head_block=100, batch_size=10, inflight=4)
+        windows = cog._plan_windows(_block(115))
+        assert windows == [
+            BlockWindow(_block(101), _block(110), False),
+            BlockWindow(_block(111), _block(115), True),
+        ]
+
+    def test_single_inflight_matches_sequential_walk(self) -> None:
+        cog = _make_cog(make_bot(), head_block=100, batch_size=10, inflight=1)
+        assert cog._plan_windows(_block(1_000)) == [
+            BlockWindow(_block(101), _block(110), False)
+        ]
+
+    def test_at_head_plans_nothing(self) -> None:
+        cog = _make_cog(make_bot(), head_block=100)
+        assert cog._plan_windows(_block(100)) == []
+
+
+class TestCatchUp:
+    async def test_commits_windows_in_block_order(self) -> None:
+        db = _make_db()
+        cog = _make_cog(make_bot(db=db), head_block=0, inflight=4)
+        plugin = _ScriptedPlugin(cog.bot)
+
+        await cog._catch_up([plugin], cog._plan_windows(_block(35)))
+
+        assert _checked_blocks(db) == [10, 20, 30, 35]
+        inserted = [
+            c.args[0][0]["block_number"]
+            for c in db.event_queue.insert_many.call_args_list
+        ]
+        assert inserted == [1, 11, 21, 31]
+        assert cog.head_block == 35
+        assert cog.at_head is True
+        # only the final window hands over to head tracking
+        assert plugin.last_served_block == 35
+
+    async def test_failure_keeps_committed_prefix(self) -> None:
+        db = _make_db()
+        cog = _make_cog(make_bot(db=db), head_block=0, inflight=4)
+        plugin = _ScriptedPlugin(cog.bot, fail_from=21)
+
+        with pytest.raises(RuntimeError):
+            await cog._catch_up([plugin], cog._plan_windows(_block(1_000)))
+
+        assert _checked_blocks(db) == [10, 20]
+        assert cog.head_block == 20
+        assert cog.at_head is False
+
+    async def test_reconfiguration_refetches_uncommitted_windows(self) -> None:
+        db = _make_db()
+        cog = _make_cog(make_bot(db=db), head_block=0, inflight=4)
+        plugin = _ScriptedPlugin(cog.bot)
+        plugin.reconfigure_at = 15
+        fetched: list[int] = []
+        get_past_events = plugin.get_past_events
+
+        async def tracking(from_block: BlockNumber, to_block: BlockNumber) -> Any:
+            fetched.append(from_block)
+            return await get_past_events(from_block, to_block)
+
+        plugin.get_past_events = tracking  # type: ignore[method-assign]
+
+        await cog._catch_up([plugin], cog._plan_windows(_block(1_000)))
+
+        # the first window was still in flight when the second one reconfigured,
+        # so every window is fetched again, in order
+        assert fetched[4:] == [1, 11, 21, 31]
+        assert _checked_blocks(db) == [10, 20, 30, 40]
+        assert cog.head_block == 40
+
+
+class TestStoreEvents:
+    async def test_dedups_batch_with_single_query(self) -> None:
+        db = _make_db()
+        db.event_queue.distinct = AsyncMock(return_value=["id-1"])
+        cog = _make_cog(make_bot(db=db))
+
+        await cog._store_events([[_event(1), _event(2)], [_event(2), _event(3)]])
+
+        db.event_queue.distinct.assert_awaited_once_with(
+            "_id", {"_id": {"$in": ["id-1", "id-2", "id-2", "id-3"]}}
+        )
+        inserted = db.event_queue.insert_many.await_args.args[0]
+        assert [e["_id"] for e in inserted] == ["id-2", "id-3"]
+        # one already queued, one repeated within the batch
+        assert cog.suppressed_duplicates == 2
+
+    async def test_empty_batch_skips_db(self) -> None:
+        db = _make_db()
+        cog = _make_cog(make_bot(db=db))
+
+        await cog._store_events([[], []])
+
+        db.event_queue.distinct.assert_not_awaited()
+        db.event_queue.insert_many.assert_not_awaited()
+
+
+def _queued(event_id: str, channel_id: int, score: int) -> dict[str, Any]:
+    document, _ = encode_event(_event(score), channel_id)
+    return {**document, "_id": event_id}
+
+
+def _make_queue_db(queue: dict[int, list[dict[str, Any]]]) -> MagicMock:
+    db = MagicMock()
+    db.event_queue.distinct = AsyncMock(return_value=list(queue))
+    db.event_queue.bulk_write = AsyncMock()
+
+    def find(query: dict[str, Any]) -> MagicMock:
+        cursor = MagicMock()
+        events = sorted(queue[query["channel_id"]], key=lambda e: e["score"])
+        cursor.sort.return_value.to_list = AsyncMock(return_value=events)
+        return cursor
+
+    db.event_queue.find.side_effect = find
+    db.state_messages.find.return_value.to_list = AsyncMock(return_value=[])
+    return db
+
+
+def _make_channel(*, fail_after: int | None = None) -> MagicMock:
+    channel = MagicMock(spec=discord.TextChannel)
+    sent: list[str] = []
+
+    async def send(*, embed: Embed, files: list[Any]) -> MagicMock:
+        if fail_after is not None and len(sent) >= fail_after:
+            raise RuntimeError("discord down")
+        sent.append(embed.title or "")
+        return MagicMock(id=len(sent))
+
+    channel.send = AsyncMock(side_effect=send)
+    return channel
+
+
+def _written(db: MagicMock) -> list[list[UpdateOne]]:
+    return [c.args[0] for c in db.event_queue.bulk_write.await_args_list]
+
+
+def _sent(event_id: str, message_id: int) -> UpdateOne:
+    return UpdateOne({"_id": event_id}, {"$set": {"message_id": message_id}})
+
+
+class TestProcessEventQueue:
+    async def test_dispatches_channels_with_one_bulk_write_each(self) -> None:
+        db = _make_queue_db(
+            {
+                1: [_queued("b", 1, 2), _queued("a", 1, 1)],
+                2: [_queued("c", 2, 3)],
+            }
+        )
+        bot = make_bot(db=db)
+        channels = {1: _make_channel(), 2: _make_channel()}
+        bot.get_or_fetch_channel = AsyncMock(side_effect=lambda cid: channels[cid])
+        cog = _make_cog(bot)
+
+        await cog.process_event_queue()
+
+        assert channels[1].send.await_count == 2
+        assert channels[2].send.await_count == 1
+        # ordered by score within the channel, one write per channel
+        writes = _written(db)
+        assert len(writes) == 2
+        assert [_sent("a", 1), _sent("b", 2)] in writes
+        assert [_sent("c", 1)] in writes
+
+    async def test_long_queue_is_flushed_in_batches(self) -> None:
+        db = _make_queue_db({1: [_queued(str(i), 1, i) for i in range(5)]})
+        bot = make_bot(db=db)
+        bot.get_or_fetch_channel = AsyncMock(return_value=_make_channel())
+        cog = _make_cog(bot)
+        cog.message_flush_size = 2
+
+        await cog.process_event_queue()
+
+        assert [len(write) for write in _written(db)] == [2, 2, 1]
+
+    async def test_cancelled_channel_is_not_swallowed(self) -> None:
+        db = _make_queue_db({1: [_queued("a", 1, 1)]})
+        bot = make_bot(db=db)
+        channel = _make_channel()
+        channel.send = AsyncMock(side_effect=asyncio.CancelledError)
+        bot.get_or_fetch_channel = AsyncMock(return_value=channel)
+        cog = _make_cog(bot)
+
+        with pytest.raises(asyncio.CancelledError):
+            await cog.process_event_queue()
+
+    async def test_failed_channel_keeps_sent_ids_and_others_proceed(self) -> None:
+        db = _make_queue_db(
+            {
+                1: [_queued("a", 1, 1), _queued("b", 1, 2)],
+                2: [_queued("c", 2, 3)],
+            }
+        )
+        bot = make_bot(db=db)
+        channels = {1: _make_channel(fail_after=1), 2: _make_channel()}
+        bot.get_or_fetch_channel = AsyncMock(side_effect=lambda cid: channels[cid])
+        cog = _make_cog(bot)
+
+        with pytest.raises(RuntimeError):
+            await cog.process_event_queue()
+
+        writes = _written(db)
+        assert len(writes) == 2
+        assert [_sent("a", 1)] in writes
+        assert [_sent("c", 1)] in writes
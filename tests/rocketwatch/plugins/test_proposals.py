@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import time
 from typing import Any
 from unittest.mock import AsyncMock
@@ -21,9 +23,31 @@ def _make_cog(bot: Any) -> Proposals:
     cog = Proposals.__new__(Proposals)
     cog.bot = bot
     cog.batch_size = 5
+    cog.slot_batch_size = 100
     return cog
 
 
+def _http_error(status: int) -> ClientResponseError:
+    return ClientResponseError(
+        request_info=RequestInfo(
+            url=URL("http://x"),
+            method="GET",
+            headers={},  # type: ignore[arg-type]
+            real_url=URL("http://x"),
+        ),
+        history=(),
+        status=status,
+    )
+
+
+def _duties(epoch: int, proposers: dict[int, int]) -> list[dict[str, Any]]:
+    # every slot of the epoch is assigned; unlisted slots go to a non-RP index
+    return [
+        {"slot": str(slot), "validator_index": str(proposers.get(slot, 9999))}
+        for slot in range(epoch * 32, epoch * 32 + 32)
+    ]
+
+
 def _hex_graffiti(text: str) -> str:
     # The beacon node returns graffiti as 32-byte hex.
     raw = text.encode("utf-8").ljust(32, b"\x00")
@@ -206,10 +230,8 @@ class TestFetchProposals:
     ) -> None:
         await mongo_db.last_checked_block.insert_one({"_id": "proposals", "slot": 100})
         scripted_bacon.set_block_header("finalized", {"slot": "102"})
-        # Neither slot belongs to an RP validator → fetch_proposal returns right
-        # after the header lookup, writing nothing.
-        scripted_bacon.set_block_header("101", {"proposer_index": "9999"})
-        scripted_bacon.set_block_header("102", {"proposer_index": "9999"})
+        # No RP validator has a duty in epoch 3 → no block is downloaded.
+        scripted_bacon.set_proposer_duties("3", _duties(3, {}))
 
         cog = _make_cog(make_bot(db=mongo_db))
         await cog.fetch_proposals()
@@ -225,7 +247,7 @@ class TestFetchProposals:
     ) -> None:
         # No last_checked_block doc → starts from the hardcoded pre-merge slot.
         scripted_bacon.set_block_header("finalized", {"slot": "4700013"})
-        scripted_bacon.set_block_header("4700013", {"proposer_index": "9999"})
+        scripted_bacon.set_proposer_duties("146875", _duties(146875, {}))
 
         cog = _make_cog(make_bot(db=mongo_db))
         await cog.fetch_proposals()
@@ -233,6 +255,126 @@ class TestFetchProposals:
         entry = await mongo_db.last_checked_block.find_one({"_id": "proposals"})
         assert entry is not None and entry["slot"] == 4700013
 
+    async def test_only_rp_duties_download_blocks(
+        self,
+        mongo_db: AsyncDatabase[dict[str, Any]],
+        scripted_bacon: ScriptedBeacon,
+    ) -> None:
+        await mongo_db.minipools.insert_one(
+            {"validator_index": 42, "node_operator": "0x" + "a" * 40}
+        )
+        await mongo_db.last_checked_block.insert_one({"_id": "proposals", "slot": 100})
+        scripted_bacon.set_block_header("finalized", {"slot": "140"})
+        # slot 99 is before the checkpoint, slot 150 after finality
+        scripted_bacon.set_proposer_duties("3", _duties(3, {99: 42, 120: 42}))
+        scripted_bacon.set_proposer_duties("4", _duties(4, {130: 42, 150: 42}))
+        # Only these blocks are scripted; any other download raises KeyError.
+        for slot in (120, 130):
+            scripted_bacon.set_block(
+                str(slot),
+                {
+                    "slot": str(slot),
+                    "proposer_index": "42",
+                    "body": {"graffiti": _hex_graffiti("RP-GL v1.0.0")},
+                },
+            )
+
+        cog = _make_cog(make_bot(db=mongo_db))
+        await cog.fetch_proposals()
+
+        slots = await mongo_db.proposals.distinct("slot")
+        assert sorted(slots) == [120, 130]
+        entry = await mongo_db.last_checked_block.find_one({"_id": "proposals"})
+        assert entry is not None and entry["slot"] == 140
+
+    async def test_checkpoints_after_every_batch(
+        self,
+        mongo_db: AsyncDatabase[dict[str, Any]],
+        scripted_bacon: ScriptedBeacon,
+    ) -> None:
+        await mongo_db.last_checked_block.insert_one({"_id": "proposals", "slot": 100})
+        scripted_bacon.set_block_header("finalized", {"slot": "140"})
+        scripted_bacon.set_proposer_duties("3", _duties(3, {}))
+        scripted_bacon.set_proposer_duties("4", _http_error(500))
+        scripted_bacon.set_block_header("128", _http_error(500))
+
+        cog = _make_cog(make_bot(db=mongo_db))
+        cog.batch_size = 1
+        with pytest.raises(ClientResponseError):
+            await cog.fetch_proposals()
+
+        # epoch 3 is done, the restart resumes at the first slot of epoch 4
+        entry = await mongo_db.last_checked_block.find_one({"_id": "proposals"})
+        assert entry is not None and entry["slot"] == 127
+
+    async def test_missed_rp_proposal_is_skipped(
+        self,
+        mongo_db: AsyncDatabase[dict[str, Any]],
+        scripted_bacon: ScriptedBeacon,
+    ) -> None:
+        await mongo_db.minipools.insert_one(
+            {"validator_index": 42, "node_operator": "0x" + "a" * 40}
+        )
+        await mongo_db.last_checked_block.insert_one({"_id": "proposals", "slot": 100})
+        scripted_bacon.set_block_header("finalized", {"slot": "110"})
+        scripted_bacon.set_proposer_duties("3", _duties(3, {105: 42}))
+        scripted_bacon.set_block("105", _http_error(404))
+
+        cog = _make_cog(make_bot(db=mongo_db))
+        await cog.fetch_proposals()
+
+        assert await mongo_db.proposals.count_documents({}) == 0
+        entry = await mongo_db.last_checked_block.find_one({"_id": "proposals"})
+        assert entry is not None and entry["slot"] == 110
+
+    async def test_unavailable_duties_fall_back_to_headers(
+        self,
+        mongo_db: AsyncDatabase[dict[str, Any]],
+        scripted_bacon: ScriptedBeacon,
+    ) -> None:
+        await mongo_db.last_checked_block.insert_one({"_id": "proposals", "slot": 100})
+        scripted_bacon.set_block_header("finalized", {"slot": "102"})
+        scripted_bacon.set_proposer_duties("3", _http_error(400))
+        scripted_bacon.set_block_header("101", {"proposer_index": "9999"})
+        scripted_bacon.set_block_header("102", {"proposer_index": "9999"})
+
+        cog = _make_cog(make_bot(db=mongo_db))
+        await cog.fetch_proposals()
+
+        entry = await mongo_db.last_checked_block.find_one({"_id": "proposals"})
+        assert entry is not None and entry["slot"] == 102
+
+    async def test_unavailable_duties_check_slots_in_bounded_batches(
+        self,
+        scripted_bacon: ScriptedBeacon,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        scripted_bacon.set_proposer_duties("3", _duties(3, {}))
+        scripted_bacon.set_proposer_duties("4", _http_error(400))
+        scripted_bacon.set_proposer_duties("5", _http_error(400))
+        cog = _make_cog(make_bot())
+        cog.slot_batch_size = 10
+        checked: list[int] = []
+        running = peak = 0
+
+        async def fetch_proposal(slot: int) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            checked.append(slot)
+
+        monkeypatch.setattr(cog, "fetch_proposal", fetch_proposal)
+        with caplog.at_level(logging.WARNING):
+            await cog.fetch_batch_proposals([3, 4, 5], range(96, 192))
+
+        # one failing epoch switches the whole batch to header lookups
+        assert sorted(checked) == list(range(96, 192))
+        assert peak == 10
+        assert len(caplog.records) == 1
+
 
 class TestGatherAttribute:
     async def test_merges_counts_by_attribute(
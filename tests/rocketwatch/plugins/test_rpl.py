@@ -1,9 +1,10 @@
 from typing import Any
 
+import numpy as np
 import pytest
 from pymongo.asynchronous.database import AsyncDatabase
 
-from rocketwatch.plugins.rpl.rpl import RPL
+from rocketwatch.plugins.rpl.rpl import RPL, WithdrawableRPL
 from tests.lib.discord_harness import make_bot, make_interaction, run_command
 from tests.lib.scripted_rocketpool import ScriptedRocketPool
 
@@ -12,6 +13,24 @@ pytestmark = pytest.mark.integration_db
 ETH = 10**18
 
 
+def _loop_withdrawable(
+    nodes: list[tuple[float, float]], price: float, min_stake: float
+) -> float:
+    # the per-node loop the model replaces
+    liquid_rpl = 0.0
+    for eth_stake, rpl_stake in nodes:
+        if eth_stake == 0:
+            liquid_rpl += rpl_stake
+            continue
+        collateral_percentage = rpl_stake * price / eth_stake
+        if collateral_percentage < min_stake:
+            continue
+        liquid_rpl += (
+            (collateral_percentage - min_stake) / collateral_percentage
+        ) * rpl_stake
+    return liquid_rpl
+
+
 @pytest.fixture
 def cog(
     mongo_db: AsyncDatabase[dict[str, Any]],
@@ -83,3 +102,43 @@ class TestWithdrawableRpl:
         # This command uses files=[...] (plural) rather than file=.
         call_kwargs = interaction.followup.send.call_args.kwargs
         assert call_kwargs["files"][0].filename == "graph.png"
+
+
+class TestWithdrawableRPLModel:
+    def _model(
+        self, nodes: list[tuple[float, float]], min_stake: float
+    ) -> WithdrawableRPL:
+        eth, rpl = zip(*nodes, strict=True)
+        return WithdrawableRPL(
+            np.array(eth, dtype=float), np.array(rpl, dtype=float), min_stake
+        )
+
+    def test_matches_loop_on_price_sweep(self) -> None:
+        rng = np.random.default_rng(7)
+        eth = rng.choice([0.0, 8.0, 16.0, 24.0, 48.0, 160.0], size=500)
+        rpl = rng.gamma(2.0, 1500.0, size=500)
+        rpl[::37] = 0.0
+        nodes = list(zip(eth.tolist(), rpl.tolist(), strict=True))
+        model = self._model(nodes, 0.1)
+
+        prices = 0.005 * np.arange(1, 31) / 10
+        expected = [_loop_withdrawable(nodes, p, 0.1) for p in prices]
+        np.testing.assert_allclose(model.at(prices), expected, rtol=1e-9)
+
+    def test_unbonded_nodes_withdraw_everything(self) -> None:
+        model = self._model([(0.0, 300.0), (16.0, 0.0)], 0.1)
+        np.testing.assert_allclose(model.at(np.array([0.001, 1.0])), [300.0, 300.0])
+
+    def test_node_below_threshold_frees_nothing(self) -> None:
+        # 1000 RPL at 0.001 ETH is 6.25% of 16 ETH
+        model = self._model([(16.0, 1000.0)], 0.1)
+        assert model.at(np.array(0.001)) == 0.0
+        # at 0.004 ETH it's 25%, so everything above 10% is free
+        assert model.at(np.array(0.004)) == pytest.approx(600.0)
+
+    def test_scalar_price(self) -> None:
+        nodes = [(16.0, 1000.0), (8.0, 50.0)]
+        model = self._model(nodes, 0.1)
+        assert float(model.at(np.array(0.01))) == pytest.approx(
+            _loop_withdrawable(nodes, 0.01, 0.1)
+        )
@@ -1,13 +1,20 @@
+import os
+import time
 from collections.abc import Iterator
 from typing import Any
 from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
 from pymongo.asynchronous.database import AsyncDatabase
 
 from rocketwatch.plugins.tvl.tvl import (
     TVL,
+    columns,
+    megapool_base_shares,
     megapool_split_rewards,
+    minipool_balance_totals,
+    minipool_split_rewards_array,
     minipool_split_rewards_logic,
 )
 from rocketwatch.utils import shared_w3
@@ -73,6 +80,182 @@ class TestMegapoolSplitRewards:
         assert sum(out.values()) == pytest.approx(10.0)
 
 
+def _loop_minipool_totals(
+    minipools: list[tuple[float, float, float, float, float]],
+) -> dict[str, dict[str, float]]:
+    # the per-minipool loop that minipool_balance_totals replaces
+    totals = {
+        part: {"node": 0.0, "reth": 0.0}
+        for part in ("stake", "beacon_rewards", "contract")
+    }
+    for node_share, commission, refund, contract, beacon in minipools:
+        if refund > 0:
+            if contract > 0:
+                paid = min(contract, refund)
+                contract -= paid
+                refund -= paid
+                totals["contract"]["node"] += paid
+            if refund > 0 and beacon > 0:
+                paid = min(beacon, refund)
+                beacon -= paid
+                totals["stake"]["node"] += paid
+        if beacon > 0:
+            d = minipool_split_rewards_logic(
+                beacon, node_share, commission, force_base=True
+            )
+            totals["stake"]["node"] += d["base"]["node"]
+            totals["stake"]["reth"] += d["base"]["reth"]
+            totals["beacon_rewards"]["node"] += d["rewards"]["node"]
+            totals["beacon_rewards"]["reth"] += d["rewards"]["reth"]
+        if contract > 0:
+            d = minipool_split_rewards_logic(contract, node_share, commission)
+            totals["contract"]["node"] += d["base"]["node"] + d["rewards"]["node"]
+            totals["contract"]["reth"] += d["base"]["reth"] + d["rewards"]["reth"]
+    return totals
+
+
+def _synthetic_minipools(
+    count: int, seed: int = 1
+) -> list[tuple[float, float, float, float, float]]:
+    rng = np.random.default_rng(seed)
+    node_share = rng.choice([0.25, 0.5], size=count)
+    commission = rng.choice([0.05, 0.1, 0.14, 0.15, 0.2], size=count)
+    refund = np.where(rng.random(count) < 0.1, rng.uniform(0, 40, count), 0.0)
+    contract = np.where(rng.random(count) < 0.5, rng.uniform(0, 40, count), 0.0)
+    beacon = rng.choice([0.0, 1.0, 16.0, 31.5, 32.0, 32.05, 33.0], size=count)
+    return list(
+        zip(
+            node_share.tolist(),
+            commission.tolist(),
+            refund.tolist(),
+            contract.tolist(),
+            beacon.tolist(),
+            strict=True,
+        )
+    )
+
+
+MINIPOOL_FIELDS = (
+    "node_share",
+    "node_fee",
+    "node_refund_balance",
+    "execution_balance",
+    "beacon_balance",
+)
+
+
+def _vectorized_minipool_totals(
+    minipools: list[tuple[float, float, float, float, float]],
+) -> dict[str, dict[str, float]]:
+    columns = np.array(minipools, dtype=float).reshape(-1, 5).T
+    return minipool_balance_totals(*columns)
+
+
+class TestMinipoolSplitRewardsArray:
+    @pytest.mark.parametrize("force_base", [False, True])
+    def test_matches_scalar_logic(self, force_base: bool) -> None:
+        balance = np.array([0.0, 0.5, 4.0, 8.0, 20.0, 31.9, 32.0, 36.0])
+        node_share = np.full(balance.shape, 0.25)
+        commission = np.full(balance.shape, 0.1)
+        out = minipool_split_rewards_array(
+            balance, node_share, commission, force_base=force_base
+        )
+        for i, b in enumerate(balance.tolist()):
+            expected = minipool_split_rewards_logic(b, 0.25, 0.1, force_base)
+            for part in ("base", "rewards"):
+                for share in ("node", "reth"):
+                    assert out[part][share][i] == pytest.approx(expected[part][share])
+
+
+class TestMinipoolBalanceTotals:
+    def test_refund_spills_from_contract_into_beacon(self) -> None:
+        totals = _vectorized_minipool_totals([(0.25, 0.1, 2.0, 0.5, 33.0)])
+        # 0.5 ETH from the contract, 1.5 ETH from the beacon balance
+        assert totals["contract"] == {"node": 0.5, "reth": 0.0}
+        # 31.5 ETH left on the beacon chain: 24 rETH base, 7.5 node base
+        assert totals["stake"]["reth"] == pytest.approx(24.0)
+        assert totals["stake"]["node"] == pytest.approx(1.5 + 7.5)
+        assert totals["beacon_rewards"] == {"node": 0.0, "reth": 0.0}
+
+    def test_empty(self) -> None:
+        totals = _vectorized_minipool_totals([])
+        assert all(v == 0 for part in totals.values() for v in part.values())
+
+    def test_matches_loop(self) -> None:
+        minipools = _synthetic_minipools(2_000)
+        expected = _loop_minipool_totals(minipools)
+        totals = _vectorized_minipool_totals(minipools)
+        for part, shares in expected.items():
+            for share, value in shares.items():
+                assert totals[part][share] == pytest.approx(value, rel=1e-12)
+
+
+class TestMegapoolBaseShares:
+    def test_node_absorbs_penalties_first(self) -> None:
+        reth, node = megapool_base_shares(
+            np.array([8.0, 8.0, 4.0, 4.0]), np.array([32.0, 30.0, 20.0, 40.0])
+        )
+        np.testing.assert_allclose(reth, [24.0, 24.0, 20.0, 28.0])
+        np.testing.assert_allclose(node, [8.0, 6.0, 0.0, 4.0])
+
+    def test_split_rewards_accepts_arrays(self) -> None:
+        rewards = np.array([1.0, 2.0])
+        capital_ratio = np.array([0.25, 0.125])
+        out = megapool_split_rewards(rewards, capital_ratio, 0.05, 0.02, 0.01)
+        for i in range(2):
+            expected = megapool_split_rewards(
+                float(rewards[i]), float(capital_ratio[i]), 0.05, 0.02, 0.01
+            )
+            for key, value in expected.items():
+                assert out[key][i] == pytest.approx(value)
+
+
+class TestColumns:
+    def test_one_row_per_field(self) -> None:
+        docs = [{"a": 1, "b": 2.5}, {"a": 3, "b": 4.0}]
+        a, b = columns(docs, "a", "b")
+        assert a.tolist() == [1, 3]
+        assert b.tolist() == [2.5, 4.0]
+
+    def test_empty(self) -> None:
+        assert columns([], "refund_value", "debt").shape == (2, 0)
+
+
+class TestVectorizedMinipoolTotals:
+    def test_matches_loop_on_50k_minipools(self) -> None:
+        minipools = _synthetic_minipools(50_000, seed=2)
+        expected = _loop_minipool_totals(minipools)
+        totals = _vectorized_minipool_totals(minipools)
+        for part, shares in expected.items():
+            for share, value in shares.items():
+                assert totals[part][share] == pytest.approx(value, rel=1e-12)
+
+    @pytest.mark.benchmark
+    @pytest.mark.skipif(
+        not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run"
+    )
+    def test_benchmark_50k_minipool_docs(self) -> None:
+        docs = [
+            dict(zip(MINIPOOL_FIELDS, minipool, strict=True))
+            for minipool in _synthetic_minipools(50_000, seed=2)
+        ]
+
+        start = time.perf_counter()
+        _loop_minipool_totals(
+            [tuple(doc[field] for field in MINIPOOL_FIELDS) for doc in docs]
+        )
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        minipool_balance_totals(*columns(docs, *MINIPOOL_FIELDS))
+        vectorized_time = time.perf_counter() - start
+
+        print(
+            f"50k minipools: loop {loop_time * 1000:.1f} ms, "
+            f"vectorized {vectorized_time * 1000:.1f} ms"
+        )
+
+
 @pytest.fixture
 def _stub_tvl_externals(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
     # rp.get_eth_usdc_price isn't part of ScriptedRocketPool; w3.eth.get_balance
@@ -159,6 +342,15 @@ class TestTvlCommand:
                 "beacon": {"balance": 34.0},
             }
         )
+        # A staking minipool whose balances haven't been synced yet.
+        await mongo_db.minipools.insert_one(
+            {
+                "status": "staking",
+                "node_deposit_balance": 8.0,
+                "node_fee": None,
+                "beacon": {"balance": None},
+            }
+        )
         # A dissolved minipool (separate aggregation branch).
         await mongo_db.minipools.insert_one(
             {
@@ -185,6 +377,7 @@ class TestTvlCommand:
         assert embed.title == "Protocol TVL"
         # Tree should show non-zero ETH somewhere.
         assert "ETH" in (embed.description or "")
+        assert "nan" not in (embed.description or "").lower()
 
     async def test_refund_and_megapool_balance_branches(
         self,
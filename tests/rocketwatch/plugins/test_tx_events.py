@@ -1,7 +1,9 @@
+import asyncio
 from typing import Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import web3.exceptions
 from hexbytes import HexBytes
 
 from rocketwatch.plugins.tx_events.event_definitions import TRANSACTION_REGISTRY
@@ -209,3 +211,220 @@ class TestGetEventsForBlock:
         cog = TxEvents(make_bot())
         cog.addresses = []
         assert await cog.get_events_for_block(123) == []
+
+
+class _ScannerTest:
+    TRACKED = addr("0x" + "11" * 20)
+    OTHER = addr("0x" + "22" * 20)
+
+    def _patch_chain(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        blocks: dict[int, list[dict[str, Any]]],
+        traces: Any = None,
+    ) -> AsyncMock:
+        from rocketwatch.plugins.tx_events import tx_events as txm
+
+        self.fetched: list[int] = []
+
+        async def get_block(number: int, full_transactions: bool = False) -> Any:
+            self.fetched.append(number)
+            # later blocks answer first, output must still be in block order
+            await asyncio.sleep(0.001 * (len(blocks) - number))
+            return {"number": number, "transactions": blocks[number]}
+
+        get_receipt = AsyncMock(side_effect=lambda h: {"transactionHash": h})
+        monkeypatch.setattr(
+            txm.w3,
+            "eth",
+            AsyncMock(get_block=get_block, get_transaction_receipt=get_receipt),
+            raising=False,
+        )
+        if traces is None:
+            traces = web3.exceptions.MethodUnavailable("trace_filter")
+        self.trace_filter = AsyncMock(
+            side_effect=traces if isinstance(traces, Exception) else [traces]
+        )
+        monkeypatch.setattr(
+            txm.w3, "manager", MagicMock(coro_request=self.trace_filter), raising=False
+        )
+        return get_receipt
+
+    def _tx(self, n: int, to: str) -> dict[str, Any]:
+        return _txn(hash=HexBytes(bytes([n]) * 32), to=to, input=HexBytes(b""))
+
+
+class TestGetPastEvents(_ScannerTest):
+    async def test_matches_in_block_order_and_fetches_only_their_receipts(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        blocks = {
+            0: [self._tx(1, self.TRACKED), self._tx(2, self.OTHER)],
+            1: [self._tx(3, self.OTHER)],
+            2: [self._tx(4, self.TRACKED), {"hash": HexBytes(b"\x05" * 32)}],
+            3: [self._tx(6, self.TRACKED)],
+        }
+        get_receipt = self._patch_chain(monkeypatch, blocks)
+        cog = TxEvents(make_bot())
+        cog.addresses = [self.TRACKED]
+        seen: list[tuple[int, int]] = []
+
+        async def process(block: Any, txn: Any, *_: Any) -> list[Any]:
+            seen.append((block["number"], txn["hash"][0]))
+            return [txn["hash"][0]]
+
+        monkeypatch.setattr(cog, "process_transaction", process)
+
+        # the upper bound is exclusive
+        events = await cog.get_past_events(0, 3)
+
+        assert events == [1, 4]
+        assert seen == [(0, 1), (2, 4)]
+        assert get_receipt.await_count == 2
+
+    async def test_upgrade_rescans_remaining_blocks(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        new_address = addr("0x" + "33" * 20)
+        blocks = {
+            0: [self._tx(1, self.TRACKED)],
+            1: [self._tx(2, new_address)],
+        }
+        self._patch_chain(monkeypatch, blocks)
+        cog = TxEvents(make_bot())
+        cog.addresses = [self.TRACKED]
+
+        async def process(block: Any, txn: Any, to: Any, *_: Any) -> list[Any]:
+            if to not in (cog.addresses or []):
+                return []
+            if block["number"] == 0:
+                cog.addresses = [new_address]
+            return [txn["hash"][0]]
+
+        monkeypatch.setattr(cog, "process_transaction", process)
+
+        assert await cog.get_past_events(0, 2) == [1, 2]
+
+    async def test_upgrade_rematches_rest_of_block(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        new_address = addr("0x" + "33" * 20)
+        blocks = {
+            0: [
+                _txn(hash=HexBytes(b"\x01" * 32), to=self.TRACKED, transactionIndex=0),
+                _txn(hash=HexBytes(b"\x02" * 32), to=new_address, transactionIndex=1),
+                _txn(hash=HexBytes(b"\x03" * 32), to=self.TRACKED, transactionIndex=2),
+            ],
+        }
+        self._patch_chain(monkeypatch, blocks)
+        cog = TxEvents(make_bot())
+        cog.addresses = [self.TRACKED]
+
+        async def process(block: Any, txn: Any, to: Any, *_: Any) -> list[Any]:
+            if to not in (cog.addresses or []):
+                return []
+            if txn["hash"][0] == 1:
+                cog.addresses = [self.TRACKED, new_address]
+            return [txn["hash"][0]]
+
+        monkeypatch.setattr(cog, "process_transaction", process)
+
+        assert await cog.get_past_events(0, 1) == [1, 2, 3]
+
+
+class TestTraceFilter(_ScannerTest):
+    def _cog(self, monkeypatch: pytest.MonkeyPatch) -> TxEvents:
+        cog = TxEvents(make_bot())
+        cog.addresses = [self.TRACKED]
+
+        async def process(block: Any, txn: Any, *_: Any) -> list[Any]:
+            return [txn["hash"][0]]
+
+        monkeypatch.setattr(cog, "process_transaction", process)
+        return cog
+
+    async def test_only_candidate_blocks_are_fetched(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        blocks = {n: [] for n in range(10)}
+        blocks[7] = [self._tx(1, self.TRACKED)]
+        traces = [
+            {"blockNumber": 7, "traceAddress": []},
+            # internal call, the transaction itself went elsewhere
+            {"blockNumber": 3, "traceAddress": [0]},
+        ]
+        self._patch_chain(monkeypatch, blocks, traces)
+        cog = self._cog(monkeypatch)
+
+        assert await cog.get_past_events(0, 10) == [1]
+        assert self.fetched == [7]
+        params = self.trace_filter.await_args.args[1][0]
+        assert params == {
+            "fromBlock": "0x0",
+            "toBlock": "0x9",
+            "toAddress": [self.TRACKED],
+        }
+
+    @pytest.mark.parametrize("upgrade_block", [3, 7])
+    async def test_upgrade_rescans_every_later_block(
+        self, monkeypatch: pytest.MonkeyPatch, upgrade_block: int
+    ) -> None:
+        new_address = addr("0x" + "33" * 20)
+        blocks: dict[int, list[dict[str, Any]]] = {n: [] for n in range(10)}
+        blocks[3] = [self._tx(1, self.TRACKED)]
+        blocks[5] = [self._tx(2, new_address)]
+        blocks[7] = [self._tx(3, self.TRACKED)]
+        blocks[8] = [self._tx(4, new_address)]
+        self._patch_chain(monkeypatch, blocks, [])
+
+        async def trace_filter(_: Any, params: list[dict[str, Any]]) -> Any:
+            (query,) = params
+            return [
+                {"blockNumber": n, "traceAddress": []}
+                for n in range(
+                    int(query["fromBlock"], 16), int(query["toBlock"], 16) + 1
+                )
+                if any(txn["to"] in query["toAddress"] for txn in blocks[n])
+            ]
+
+        self.trace_filter.side_effect = trace_filter
+        cog = TxEvents(make_bot())
+        cog.addresses = [self.TRACKED]
+
+        async def process(block: Any, txn: Any, to: Any, *_: Any) -> list[Any]:
+            if to not in (cog.addresses or []):
+                return []
+            if block["number"] == upgrade_block:
+                cog.addresses = [self.TRACKED, new_address]
+            return [txn["hash"][0]]
+
+        monkeypatch.setattr(cog, "process_transaction", process)
+
+        events = await cog.get_past_events(0, 10)
+
+        rescan = self.trace_filter.await_args_list[1].args[1][0]
+        assert rescan["fromBlock"] == hex(upgrade_block + 1)
+        assert rescan["toAddress"] == [self.TRACKED, new_address]
+        assert events == ([1, 2, 3, 4] if upgrade_block == 3 else [1, 3, 4])
+
+    async def test_unsupported_node_falls_back_for_good(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._patch_chain(monkeypatch, {0: [], 1: [self._tx(1, self.TRACKED)]})
+        cog = self._cog(monkeypatch)
+
+        assert await cog.get_past_events(0, 2) == [1]
+        assert await cog.get_past_events(0, 2) == [1]
+        assert sorted(self.fetched) == [0, 0, 1, 1]
+        self.trace_filter.assert_awaited_once()
+
+    async def test_transient_failure_falls_back_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._patch_chain(
+            monkeypatch, {0: [self._tx(1, self.TRACKED)]}, RuntimeError("timeout")
+        )
+        cog = self._cog(monkeypatch)
+
+        assert await cog.get_past_events(0, 1) == [1]
+        assert cog._use_trace_filter is True
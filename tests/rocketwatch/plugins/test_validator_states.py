@@ -10,6 +10,7 @@ from rocketwatch.plugins.validator_states.validator_states import (
     _classify_collection,
     _collapse_tree,
 )
+from rocketwatch.utils.chart_cache import chart_cache
 from tests.lib.discord_harness import (
     captured_embed,
     make_bot,
@@ -179,6 +180,28 @@ class TestValidatorStatesCommand:
         assert "Active:" in embed.description
         assert "Validators:" in embed.description
 
+    async def test_served_from_cache_until_upkeep_finishes(
+        self, mongo_db: AsyncDatabase[dict[str, Any]]
+    ) -> None:
+        exiting = {
+            "beacon": {"status": "active_exiting", "slashed": False},
+            "status": "staking",
+            "node_operator": "0x" + "a" * 40,
+        }
+        await mongo_db.minipools.insert_one({**exiting, "validator_index": 1234})
+        cog = ValidatorStates(make_bot(db=mongo_db))
+        await run_command(cog, "validator_states", make_interaction())
+
+        await mongo_db.minipools.insert_one({**exiting, "validator_index": 5678})
+        embed = await run_command(cog, "validator_states", make_interaction())
+        assert embed.description is not None
+        assert "5678" not in embed.description
+
+        chart_cache.invalidate("db_upkeep")
+        embed = await run_command(cog, "validator_states", make_interaction())
+        assert embed.description is not None
+        assert "5678" in embed.description
+
     async def test_few_exiting_validators_inline_listed(
         self, mongo_db: AsyncDatabase[dict[str, Any]]
     ) -> None:
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -13,6 +14,7 @@ from rocketwatch.utils.address_labels import (
     _most_attested,
     _pick_display_name,
     get_address_name,
+    prefetch_address_names,
 )
 
 
@@ -294,3 +296,167 @@ class TestGetAddressName:
         )
 
         assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Resilient"
+
+
+@pytest.fixture
+def offline_collection(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    collection = MagicMock()
+    collection.find.return_value.to_list = AsyncMock(return_value=[])
+    collection.find_one = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    monkeypatch.setattr(al_module, "_get_collection", lambda: collection)
+    return collection
+
+
+class TestInMemoryLayer:
+    async def test_repeat_lookup_skips_mongo(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        oli = AsyncMock(return_value="Looked Up")
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Looked Up"
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Looked Up"
+        assert offline_collection.find_one.await_count == 1
+        assert oli.await_count == 1
+
+    async def test_negative_result_is_remembered(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        oli = AsyncMock(return_value=None)
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) is None
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) is None
+        assert oli.await_count == 1
+
+    async def test_oli_failure_is_not_remembered(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        oli = AsyncMock(side_effect=[RuntimeError("OLI down"), "Recovered"])
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) is None
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Recovered"
+
+    async def test_concurrent_lookups_share_one_fetch(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        release = asyncio.Event()
+
+        async def slow_oli(address: ChecksumAddress) -> str:
+            await release.wait()
+            return "Shared"
+
+        oli = AsyncMock(side_effect=slow_oli)
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        lookups = [
+            asyncio.create_task(get_address_name(ChecksumAddress(ADDR_FRESH)))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*lookups) == ["Shared"] * 5
+        assert oli.await_count == 1
+        assert offline_collection.find_one.await_count == 1
+
+
+class TestPrefetchAddressNames:
+    async def test_single_mongo_query_then_oli_for_misses(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        offline_collection.find.return_value.to_list = AsyncMock(
+            return_value=[
+                {
+                    "_id": ADDR_CACHED,
+                    "name": "Cached Label",
+                    "fetched_at": datetime.now(UTC),
+                }
+            ]
+        )
+        oli = AsyncMock(return_value="Fresh Label")
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        await prefetch_address_names(
+            [ChecksumAddress(ADDR_CACHED), ChecksumAddress(ADDR_FRESH)]
+        )
+
+        offline_collection.find.assert_called_once_with(
+            {"_id": {"$in": [ADDR_CACHED, ADDR_FRESH]}}
+        )
+        oli.assert_awaited_once_with(ADDR_FRESH)
+        offline_collection.find_one.assert_not_awaited()
+        offline_collection.update_one.assert_awaited_once()
+
+        assert await get_address_name(ChecksumAddress(ADDR_CACHED)) == "Cached Label"
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Fresh Label"
+        offline_collection.find_one.assert_not_awaited()
+        assert oli.await_count == 1
+
+    async def test_stale_negative_entry_is_refetched(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        offline_collection.find.return_value.to_list = AsyncMock(
+            return_value=[
+                {
+                    "_id": ADDR_CACHED,
+                    "name": None,
+                    "fetched_at": datetime.now(UTC) - timedelta(days=30),
+                }
+            ]
+        )
+        oli = AsyncMock(return_value="Now Labelled")
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+
+        await prefetch_address_names([ChecksumAddress(ADDR_CACHED)])
+
+        oli.assert_awaited_once_with(ADDR_CACHED)
+        assert await get_address_name(ChecksumAddress(ADDR_CACHED)) == "Now Labelled"
+
+    async def test_skips_manual_and_known_addresses(
+        self,
+        manual_override: None,
+        offline_collection: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(al_module, "_fetch_from_oli", AsyncMock(return_value=None))
+        await get_address_name(ChecksumAddress(ADDR_FRESH))
+        offline_collection.find.reset_mock()
+
+        await prefetch_address_names(
+            [ChecksumAddress(ADDR_MANUAL), ChecksumAddress(ADDR_FRESH)]
+        )
+        offline_collection.find.assert_not_called()
+
+    async def test_limits_concurrent_oli_requests(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        in_flight = peak = 0
+
+        async def oli(address: ChecksumAddress) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        monkeypatch.setattr(al_module, "_fetch_from_oli", oli)
+        addresses = [ChecksumAddress(f"0x{i:040x}") for i in range(20)]
+
+        await prefetch_address_names(addresses)
+
+        assert peak == al_module._OLI_CONCURRENCY
+
+    async def test_mongo_failure_falls_through_to_oli(
+        self, offline_collection: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        offline_collection.find.return_value.to_list = AsyncMock(
+            side_effect=RuntimeError("mongo unreachable")
+        )
+        monkeypatch.setattr(
+            al_module, "_fetch_from_oli", AsyncMock(return_value="Resilient")
+        )
+
+        await prefetch_address_names([ChecksumAddress(ADDR_FRESH)])
+        assert await get_address_name(ChecksumAddress(ADDR_FRESH)) == "Resilient"
@@ -0,0 +1,118 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from web3.constants import ADDRESS_ZERO
+
+from rocketwatch.utils import address_roles
+from rocketwatch.utils.address_roles import (
+    AddressRoles,
+    get_address_roles,
+    prefetch_address_roles,
+)
+from rocketwatch.utils.call_cache import call_cache
+from tests.lib.scripted_rocketpool import ScriptedRocketPool, addr
+
+NODE = addr("0xNODE")
+MEGAPOOL = addr("0xMEGA")
+MINIPOOL = addr("0xMINI")
+WALLET = addr("0xWALLET")
+
+
+@pytest.fixture
+def chain(scripted_rp: ScriptedRocketPool, scripted_w3: MagicMock) -> MagicMock:
+    """A node with a megapool, its megapool, a minipool and a plain wallet.
+
+    Returns the spy on `rp.multicall` so tests can count round trips.
+    """
+    scripted_rp.set_address("rocketStorage", addr("0xSTORAGE"))
+    scripted_w3.solidity_keccak = lambda types, values: tuple(values)
+    scripted_w3.eth.get_code = AsyncMock(
+        side_effect=lambda a: b"\x60\x80" if a in (MEGAPOOL, MINIPOOL) else b""
+    )
+    scripted_rp.set_call("rocketNodeManager.getNodeExists", lambda a: a == NODE)
+    scripted_rp.set_call(
+        "rocketStorage.getBool", lambda key: key == ("megapool.exists", MEGAPOOL)
+    )
+    scripted_rp.set_call(
+        "rocketMinipoolManager.getMinipoolExists", lambda a: a == MINIPOOL
+    )
+    scripted_rp.set_call(
+        "rocketNodeManager.getMegapoolAddress",
+        lambda a: MEGAPOOL if a == NODE else ADDRESS_ZERO,
+    )
+    scripted_rp.set_call(
+        "rocketNodeManager.getSmoothingPoolRegistrationState", lambda a: True
+    )
+    scripted_rp.set_call("rocketDAONodeTrusted.getMemberID", lambda a: "")
+    scripted_rp.set_call("rocketDAOSecurity.getMemberID", lambda a: "guardian")
+
+    spy = MagicMock(wraps=scripted_rp.multicall)
+
+    async def multicall(*args, **kwargs):
+        return await spy(*args, **kwargs)
+
+    scripted_rp.multicall = multicall  # type: ignore[method-assign]
+    return spy
+
+
+class TestGetAddressRoles:
+    async def test_resolves_every_role_in_two_multicalls(self, chain):
+        roles = await get_address_roles([NODE, MEGAPOOL, MINIPOOL, WALLET])
+
+        assert roles[NODE] == AddressRoles(
+            node=True,
+            node_megapool=MEGAPOOL,
+            smoothing_pool=True,
+            security_member_id="guardian",
+        )
+        assert roles[MEGAPOOL] == AddressRoles(megapool=True, contract=True)
+        assert roles[MINIPOOL] == AddressRoles(minipool=True, contract=True)
+        assert roles[WALLET] == AddressRoles()
+        # one for registrations, one for node membership at the requested block
+        assert chain.call_count == 2
+
+    async def test_node_facts_use_requested_block(self, chain):
+        await get_address_roles([NODE], block=123)
+        assert chain.call_args_list[0].kwargs.get("block", "latest") == "latest"
+        assert chain.call_args_list[1].kwargs["block"] == 123
+
+    async def test_duplicates_are_resolved_once(self, chain):
+        roles = await get_address_roles([WALLET, WALLET])
+        assert list(roles) == [WALLET]
+        assert len(chain.call_args_list[0].args[0]) == 4
+
+    async def test_known_registrations_are_not_queried_again(self, chain):
+        await get_address_roles([MEGAPOOL, MINIPOOL])
+        await get_address_roles([MEGAPOOL, MINIPOOL])
+        assert chain.call_count == 1
+
+    async def test_unregistered_addresses_are_rechecked(self, chain):
+        # an address may register as a node later on
+        await get_address_roles([WALLET])
+        await get_address_roles([WALLET])
+        assert chain.call_count == 2
+
+    async def test_contract_code_is_remembered(self, chain, scripted_w3):
+        await get_address_roles([MEGAPOOL])
+        call_cache.clear()
+        await get_address_roles([MEGAPOOL])
+        scripted_w3.eth.get_code.assert_awaited_once_with(MEGAPOOL)
+
+    async def test_reverted_lookups_count_as_unset(self, chain, scripted_rp):
+        async def reverted(calls, require_success=True, block="latest"):
+            return [None] * len(calls)
+
+        scripted_rp.multicall = reverted  # type: ignore[method-assign]
+        roles = await get_address_roles([NODE])
+        assert roles[NODE] == AddressRoles()
+
+    async def test_empty_input(self, chain):
+        assert await get_address_roles([]) == {}
+        assert chain.call_count == 0
+
+
+class TestPrefetchAddressRoles:
+    async def test_failures_are_swallowed(self, chain, scripted_rp):
+        scripted_rp.multicall = AsyncMock(side_effect=RuntimeError("rpc down"))  # type: ignore[method-assign]
+        await prefetch_address_roles([NODE])
+        assert address_roles._kinds.get(NODE) is None
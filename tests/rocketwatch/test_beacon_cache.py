@@ -0,0 +1,162 @@
+import asyncio
+from typing import Any
+
+import pytest
+from aiohttp import ClientResponseError, RequestInfo
+from yarl import URL
+
+from rocketwatch.utils.beacon_cache import BeaconCache
+from tests.lib.beacon_script import ScriptedBeacon
+
+
+def _http_error(status: int) -> ClientResponseError:
+    return ClientResponseError(
+        request_info=RequestInfo(
+            url=URL("http://x"),
+            method="GET",
+            headers={},  # type: ignore[arg-type]
+            real_url=URL("http://x"),
+        ),
+        history=(),
+        status=status,
+    )
+
+
+def _block(slot: int, proposer_index: int = 1) -> dict[str, Any]:
+    return {
+        "slot": str(slot),
+        "proposer_index": str(proposer_index),
+        "body": {
+            "graffiti": "0x" + "00" * 32,
+            "attestations": [{"data": "..."}],
+            "execution_payload": {
+                "block_number": "1",
+                "timestamp": "2",
+                "transactions": ["0x00"],
+            },
+        },
+    }
+
+
+def _duties(epoch: int, proposer_index: int) -> list[dict[str, Any]]:
+    return [
+        {"slot": str(slot), "validator_index": str(proposer_index)}
+        for slot in range(epoch * 32, epoch * 32 + 32)
+    ]
+
+
+class TestGetBlock:
+    async def test_drops_attestations_and_transactions(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        scripted_bacon.set_block("10", _block(10))
+        block = await BeaconCache().get_block(10)
+        assert block is not None
+        assert "attestations" not in block["body"]
+        assert block["body"]["execution_payload"] == {
+            "block_number": "1",
+            "timestamp": "2",
+        }
+
+    async def test_finalized_blocks_are_cached(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        cache = BeaconCache()
+        cache.set_finalized_slot(10)
+        scripted_bacon.set_block("10", _block(10, proposer_index=1))
+        await cache.get_block(10)
+        scripted_bacon.set_block("10", _block(10, proposer_index=2))
+        block = await cache.get_block(10)
+        assert block is not None and block["proposer_index"] == "1"
+
+    async def test_unfinalized_blocks_are_refetched(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        cache = BeaconCache()
+        cache.set_finalized_slot(9)
+        scripted_bacon.set_block("10", _block(10, proposer_index=1))
+        await cache.get_block(10)
+        scripted_bacon.set_block("10", _block(10, proposer_index=2))
+        block = await cache.get_block(10)
+        assert block is not None and block["proposer_index"] == "2"
+
+    async def test_missed_slot_returns_none(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        cache = BeaconCache()
+        cache.set_finalized_slot(10)
+        scripted_bacon.set_block("10", _http_error(404))
+        assert await cache.get_block(10) is None
+        # the empty slot is final too
+        scripted_bacon.set_block("10", _block(10))
+        assert await cache.get_block(10) is None
+
+    async def test_other_http_errors_propagate(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        scripted_bacon.set_block("10", _http_error(500))
+        with pytest.raises(ClientResponseError):
+            await BeaconCache().get_block(10)
+
+    async def test_concurrent_lookups_share_one_request(
+        self, scripted_bacon: ScriptedBeacon, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        scripted_bacon.set_block("10", _block(10))
+        get_block = scripted_bacon.get_block
+        calls = 0
+
+        async def slow_get_block(slot: str) -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return await get_block(slot)
+
+        monkeypatch.setattr(scripted_bacon, "get_block", slow_get_block)
+        cache = BeaconCache()
+        blocks = await asyncio.gather(*[cache.get_block(10) for _ in range(3)])
+        assert all(b is blocks[0] for b in blocks)
+        assert calls == 1
+
+
+class TestGetProposerDuties:
+    async def test_maps_slots_to_validators(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        scripted_bacon.set_proposer_duties("2", _duties(2, 7))
+        duties = await BeaconCache().get_proposer_duties(2)
+        assert duties == dict.fromkeys(range(64, 96), 7)
+
+    async def test_duties_with_final_dependent_root_are_cached(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        cache = BeaconCache(duties_ttl=0)
+        cache.set_finalized_slot(63)
+        scripted_bacon.set_proposer_duties("2", _duties(2, 7))
+        await cache.get_proposer_duties(2)
+        scripted_bacon.set_proposer_duties("2", _duties(2, 8))
+        assert (await cache.get_proposer_duties(2))[64] == 7
+
+    async def test_later_duties_expire(self, scripted_bacon: ScriptedBeacon) -> None:
+        cache = BeaconCache(duties_ttl=0)
+        cache.set_finalized_slot(62)
+        scripted_bacon.set_proposer_duties("2", _duties(2, 7))
+        await cache.get_proposer_duties(2)
+        scripted_bacon.set_proposer_duties("2", _duties(2, 8))
+        assert (await cache.get_proposer_duties(2))[64] == 8
+
+    async def test_later_duties_are_reused_briefly(
+        self, scripted_bacon: ScriptedBeacon
+    ) -> None:
+        cache = BeaconCache()
+        scripted_bacon.set_proposer_duties("2", _duties(2, 7))
+        await cache.get_proposer_duties(2)
+        scripted_bacon.set_proposer_duties("2", _duties(2, 8))
+        assert (await cache.get_proposer_duties(2))[64] == 7
+
+
+class TestFinalizedSlot:
+    def test_never_moves_backwards(self) -> None:
+        cache = BeaconCache()
+        cache.set_finalized_slot(100)
+        cache.set_finalized_slot(50)
+        assert cache.finalized_slot == 100
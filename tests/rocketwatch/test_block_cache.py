@@ -0,0 +1,172 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from eth_typing import BlockNumber
+from hexbytes import HexBytes
+
+from rocketwatch.utils import shared_w3
+from rocketwatch.utils.block_cache import BlockCache
+
+
+def _receipt(tx: int, block: int, block_hash: bytes = b"\x01") -> dict[str, Any]:
+    return {
+        "transactionHash": HexBytes(tx.to_bytes(32, "big")),
+        "blockNumber": block,
+        "blockHash": HexBytes(block_hash),
+    }
+
+
+def _tx_hash(tx: int) -> HexBytes:
+    return HexBytes(tx.to_bytes(32, "big"))
+
+
+@pytest.fixture
+def eth(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    w3_stub = MagicMock()
+    monkeypatch.setattr(shared_w3.w3, "_instance", w3_stub)
+    return w3_stub.eth
+
+
+class TestReceipts:
+    async def test_repeated_lookups_hit_the_node_once(self, eth: MagicMock) -> None:
+        eth.get_transaction_receipt = AsyncMock(return_value=_receipt(1, 100))
+        cache = BlockCache()
+
+        first = await cache.get_transaction_receipt(_tx_hash(1))
+        second = await cache.get_transaction_receipt(_tx_hash(1).hex())
+
+        assert first is second
+        eth.get_transaction_receipt.assert_awaited_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_concurrent_lookups_are_coalesced(self, eth: MagicMock) -> None:
+        async def slow_receipt(_: Any) -> dict[str, Any]:
+            await asyncio.sleep(0.01)
+            return _receipt(1, 100)
+
+        eth.get_transaction_receipt = AsyncMock(side_effect=slow_receipt)
+        cache = BlockCache()
+
+        results = await asyncio.gather(
+            *[cache.get_transaction_receipt(_tx_hash(1)) for _ in range(5)]
+        )
+
+        assert all(r is results[0] for r in results)
+        eth.get_transaction_receipt.assert_awaited_once()
+
+    async def test_failures_are_not_cached(self, eth: MagicMock) -> None:
+        eth.get_transaction_receipt = AsyncMock(
+            side_effect=[RuntimeError("rpc down"), _receipt(1, 100)]
+        )
+        cache = BlockCache()
+
+        with pytest.raises(RuntimeError):
+            await cache.get_transaction_receipt(_tx_hash(1))
+        assert (await cache.get_transaction_receipt(_tx_hash(1)))["blockNumber"] == 100
+
+    async def test_cancelled_owner_releases_waiters(self, eth: MagicMock) -> None:
+        started = asyncio.Event()
+
+        async def hanging_receipt(_: Any) -> dict[str, Any]:
+            started.set()
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        eth.get_transaction_receipt = AsyncMock(side_effect=hanging_receipt)
+        cache = BlockCache()
+
+        owner = asyncio.create_task(cache.get_transaction_receipt(_tx_hash(1)))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_transaction_receipt(_tx_hash(1)))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_block_prefetch_serves_single_lookups(self, eth: MagicMock) -> None:
+        eth.get_block_receipts = AsyncMock(
+            return_value=[_receipt(1, 100), _receipt(2, 100)]
+        )
+        eth.get_transaction_receipt = AsyncMock()
+        cache = BlockCache()
+
+        await cache.prefetch_block_receipts([100, 100])
+        await cache.get_transaction_receipt(_tx_hash(2))
+
+        eth.get_block_receipts.assert_awaited_once_with(100)
+        eth.get_transaction_receipt.assert_not_awaited()
+
+    async def test_prefetch_failure_falls_back(self, eth: MagicMock) -> None:
+        eth.get_block_receipts = AsyncMock(side_effect=ValueError("unsupported"))
+        eth.get_transaction_receipt = AsyncMock(return_value=_receipt(1, 100))
+        cache = BlockCache()
+
+        await cache.prefetch_block_receipts([100])
+        await cache.get_transaction_receipt(_tx_hash(1))
+
+        eth.get_transaction_receipt.assert_awaited_once()
+
+
+class TestInvalidation:
+    async def test_new_cycle_drops_blocks_near_head(self, eth: MagicMock) -> None:
+        eth.get_transaction_receipt = AsyncMock(
+            side_effect=lambda h: _receipt(
+                int.from_bytes(h, "big"), int.from_bytes(h, "big")
+            )
+        )
+        cache = BlockCache()
+        await cache.get_transaction_receipt(_tx_hash(10))
+        await cache.get_transaction_receipt(_tx_hash(95))
+
+        cache.start_cycle(BlockNumber(100))
+        await cache.get_transaction_receipt(_tx_hash(10))
+        await cache.get_transaction_receipt(_tx_hash(95))
+
+        # only the receipt within the lookback distance was refetched
+        assert eth.get_transaction_receipt.await_count == 3
+
+    async def test_hash_mismatch_invalidates_reorged_blocks(
+        self, eth: MagicMock
+    ) -> None:
+        eth.get_transaction_receipt = AsyncMock(return_value=_receipt(1, 101))
+        eth.get_block = AsyncMock(
+            return_value={"number": 100, "hash": HexBytes(b"\x02"), "timestamp": 1}
+        )
+        cache = BlockCache()
+        await cache.get_transaction_receipt(_tx_hash(1))
+        cache._observe_block(100, HexBytes(b"\x01"))
+
+        # block 100 comes back with a different hash, so 101 is stale as well
+        await cache.get_block(BlockNumber(100))
+        await cache.get_transaction_receipt(_tx_hash(1))
+
+        assert eth.get_transaction_receipt.await_count == 2
+
+
+class TestTransactions:
+    async def test_full_block_seeds_transactions(self, eth: MagicMock) -> None:
+        txn = {"hash": _tx_hash(1), "blockNumber": 100, "blockHash": b"\x01"}
+        eth.get_block = AsyncMock(
+            return_value={"number": 100, "hash": b"\x01", "transactions": [txn]}
+        )
+        eth.get_transaction = AsyncMock()
+        cache = BlockCache()
+
+        await cache.get_block(BlockNumber(100), full_transactions=True)
+
+        assert await cache.get_transaction(_tx_hash(1)) is txn
+        eth.get_transaction.assert_not_awaited()
+
+    async def test_pending_transactions_are_not_cached(self, eth: MagicMock) -> None:
+        eth.get_transaction = AsyncMock(
+            return_value={"hash": _tx_hash(1), "blockNumber": None}
+        )
+        cache = BlockCache()
+
+        await cache.get_transaction(_tx_hash(1))
+        await cache.get_transaction(_tx_hash(1))
+
+        assert eth.get_transaction.await_count == 2
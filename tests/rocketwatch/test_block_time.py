@@ -1,9 +1,20 @@
-from unittest.mock import AsyncMock
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from rocketwatch.utils import block_time
-from rocketwatch.utils.block_time import ts_to_block
+from rocketwatch.utils.block_time import ts_to_block, ts_to_blocks
+
+
+@pytest.fixture(autouse=True)
+def index(monkeypatch):
+    """Empty persistent index; tests script `find_one` to seed it."""
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.bulk_write = AsyncMock()
+    monkeypatch.setattr(block_time, "_get_collection", lambda: collection)
+    return collection
 
 
 @pytest.fixture
@@ -15,8 +26,11 @@ def fake_chain(monkeypatch):
     and ``w3.eth.get_block_number`` is stubbed to return ``latest``.
     """
 
-    def configure(ts_map: dict[int, int], latest: int) -> None:
+    probes: list[int] = []
+
+    def configure(ts_map: dict[int, int], latest: int) -> list[int]:
         async def fake_block_to_ts(n: int) -> int:
+            probes.append(n)
             return ts_map[n]
 
         monkeypatch.setattr(block_time, "block_to_ts", fake_block_to_ts)
@@ -25,6 +39,7 @@ def fake_chain(monkeypatch):
             "get_block_number",
             AsyncMock(return_value=latest),
         )
+        return probes
 
     return configure
 
@@ -76,3 +91,87 @@ class TestTsToBlock:
         for target in [11, 20, 33, 60, 150, 220, 245, 1_000_000]:
             result = await ts_to_block(target)
             assert result in ts_map, f"target={target} produced non-block {result}"
+
+
+class _SlotChain(dict[int, int]):
+    """Post-merge style chain: block n at 1000 + 12 * n."""
+
+    def __missing__(self, n: int) -> int:
+        return 1000 + 12 * n
+
+
+class TestInterpolationSearch:
+    async def test_regular_slots_need_few_probes(self, fake_chain):
+        probes = fake_chain(_SlotChain(), latest=20_000_000)
+        assert await ts_to_block(1000 + 12 * 12_345_678) == 12_345_678
+        # genesis, head and a single guess
+        assert len(probes) <= 3
+
+    async def test_off_slot_target_picks_closer_block(self, fake_chain):
+        probes = fake_chain(_SlotChain(), latest=20_000_000)
+        assert await ts_to_block(1000 + 12 * 5_000_000 + 7) == 5_000_001
+        assert len(probes) <= 6
+
+    async def test_uneven_block_times_still_converge(self, fake_chain):
+        # long empty stretch followed by dense blocks defeats interpolation
+        ts_map = {n: n for n in range(1, 1001)}
+        ts_map.update({n: 1_000_000 + n for n in range(1001, 2001)})
+        fake_chain(ts_map, latest=2000)
+        for target in (500, 999, 1_001_500, 1_002_000):
+            result = await ts_to_block(target)
+            assert ts_map[result] == target
+
+
+class TestTsToBlocks:
+    async def test_results_follow_input_order(self, fake_chain):
+        fake_chain({1: 10, 2: 30, 3: 50, 4: 70, 5: 90}, latest=5)
+        assert await ts_to_blocks([70, 5, 30, 70]) == [4, 0, 2, 4]
+
+    async def test_empty_input(self, fake_chain):
+        probes = fake_chain({1: 10}, latest=1)
+        assert await ts_to_blocks([]) == []
+        assert probes == []
+
+    async def test_one_head_lookup_per_pass(self, fake_chain):
+        fake_chain(_SlotChain(), latest=1_000_000)
+        await ts_to_blocks([1000 + 12 * n for n in (10, 500, 90_000)])
+        block_time.w3.eth.get_block_number.assert_awaited_once()
+
+
+class TestPersistentIndex:
+    async def test_known_bracket_skips_rpc(self, fake_chain, index):
+        probes = fake_chain(_SlotChain(), latest=20_000_000)
+
+        async def find_one(query: dict[str, Any], sort: Any) -> dict[str, Any]:
+            if "$lte" in query["timestamp"]:
+                return {"_id": 100, "timestamp": 2200}
+            return {"_id": 101, "timestamp": 2212}
+
+        index.find_one.side_effect = find_one
+        assert await ts_to_block(2210) == 101
+        assert probes == []
+        block_time.w3.eth.get_block_number.assert_not_awaited()
+
+    async def test_only_final_blocks_are_written(self, fake_chain, index):
+        fake_chain(_SlotChain(), latest=1_000)
+        await ts_to_blocks([1000 + 12 * 500, 1000 + 12 * 990])
+
+        ops = index.bulk_write.await_args.args[0]
+        written = {op._filter["_id"] for op in ops}
+        assert 500 in written
+        assert 990 not in written
+
+    async def test_index_failure_falls_back_to_rpc(self, fake_chain, index):
+        fake_chain({1: 10, 2: 30, 3: 50, 4: 70, 5: 90}, latest=5)
+        index.find_one.side_effect = RuntimeError("mongo down")
+        index.bulk_write.side_effect = RuntimeError("mongo down")
+        assert await ts_to_block(50) == 3
+
+
+class TestBlockToTs:
+    async def test_timestamps_are_cached(self, monkeypatch):
+        get_block = AsyncMock(return_value={"timestamp": 1234})
+        monkeypatch.setattr(block_time.w3.eth, "get_block", get_block)
+        assert await block_time.block_to_ts(7) == 1234
+        assert await block_time.block_to_ts(7) == 1234
+        get_block.assert_awaited_once_with(7)
@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from eth_typing import BlockNumber
+
+from rocketwatch.utils.call_cache import CallCache
+from rocketwatch.utils.config import cfg
+
+
+def _key(block: object = "latest", calldata: bytes = b"\x01") -> tuple:
+    return CallCache.make_key("call", False, "0xa", calldata, block)  # type: ignore[arg-type]
+
+
+class TestCallCache:
+    async def test_pinned_calls_survive_head_advance(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(return_value=1)
+        cache.advance_head(BlockNumber(100 + cfg.events.lookback_distance))
+
+        await cache.fetch(_key(100), fetch)
+        cache.advance_head(BlockNumber(101 + cfg.events.lookback_distance))
+        cache.advance_head(BlockNumber(102 + cfg.events.lookback_distance))
+        assert await cache.fetch(_key(100), fetch) == 1
+
+        fetch.assert_awaited_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_latest_calls_expire_when_head_advances(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(side_effect=[1, 2])
+        cache.advance_head(BlockNumber(100))
+
+        assert await cache.fetch(_key(), fetch) == 1
+        cache.advance_head(BlockNumber(100))
+        assert await cache.fetch(_key(), fetch) == 1
+        cache.advance_head(BlockNumber(101))
+        assert await cache.fetch(_key(), fetch) == 2
+
+    async def test_blocks_within_lookback_expire_when_head_advances(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(side_effect=[1, 2, 3])
+        cache.advance_head(BlockNumber(100))
+
+        assert await cache.fetch(_key(95), fetch) == 1
+        assert await cache.fetch(_key(95), fetch) == 1
+        cache.advance_head(BlockNumber(101))
+        assert await cache.fetch(_key(95), fetch) == 2
+
+    async def test_blocks_are_not_pinned_without_a_head(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(side_effect=[1, 2])
+
+        assert await cache.fetch(_key(100), fetch) == 1
+        cache.advance_head(BlockNumber(101))
+        assert await cache.fetch(_key(100), fetch) == 2
+
+    async def test_block_hashes_are_pinned(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(return_value=1)
+        cache.advance_head(BlockNumber(100))
+
+        await cache.fetch(_key(b"\xab" * 32), fetch)
+        cache.advance_head(BlockNumber(101))
+        assert await cache.fetch(_key(b"\xab" * 32), fetch) == 1
+        fetch.assert_awaited_once()
+
+    async def test_calldata_and_block_are_part_of_the_key(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(side_effect=[1, 2, 3])
+
+        await cache.fetch(_key(100), fetch)
+        await cache.fetch(_key(101), fetch)
+        await cache.fetch(_key(100, calldata=b"\x02"), fetch)
+
+        assert fetch.await_count == 3
+
+    def test_numeric_block_strings_share_entries(self) -> None:
+        assert _key("100") == _key(100)
+
+    async def test_concurrent_calls_are_coalesced(self) -> None:
+        cache = CallCache()
+
+        async def slow() -> int:
+            await asyncio.sleep(0.01)
+            return 1
+
+        fetch = AsyncMock(side_effect=slow)
+        results = await asyncio.gather(
+            *[cache.fetch(_key(100), fetch) for _ in range(3)]
+        )
+
+        assert results == [1, 1, 1]
+        fetch.assert_awaited_once()
+
+    async def test_cancelled_owner_releases_waiters(self) -> None:
+        cache = CallCache()
+        started = asyncio.Event()
+
+        async def hang() -> int:
+            started.set()
+            await asyncio.Event().wait()
+            return 1
+
+        owner = asyncio.create_task(cache.fetch(_key(100), hang))
+        await started.wait()
+        waiter = asyncio.create_task(cache.fetch(_key(100), hang))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_errors_are_not_cached(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(side_effect=[RuntimeError("revert"), 1])
+
+        with pytest.raises(RuntimeError):
+            await cache.fetch(_key(100), fetch)
+        assert await cache.fetch(_key(100), fetch) == 1
+
+    async def test_hits_return_copies(self) -> None:
+        cache = CallCache()
+        fetch = AsyncMock(return_value=[1, 2])
+
+        (await cache.fetch(_key(100), fetch)).append(3)
+        assert await cache.fetch(_key(100), fetch) == [1, 2]
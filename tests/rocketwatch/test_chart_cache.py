@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from discord import Embed
+
+from rocketwatch.utils.chart_cache import ChartCache, ChartResponse
+
+
+class _Builder:
+    def __init__(self, title: str = "chart") -> None:
+        self.title = title
+        self.calls = 0
+
+    async def __call__(self) -> ChartResponse:
+        self.calls += 1
+        return ChartResponse(
+            [Embed(title=f"{self.title} {self.calls}")],
+            [("chart.png", b"png")],
+        )
+
+
+class TestChartResponse:
+    def test_files_are_fresh_per_call(self) -> None:
+        response = ChartResponse([Embed()], [("chart.png", b"png")])
+        first, second = response.get_files(), response.get_files()
+        assert first[0] is not second[0]
+        assert first[0].fp.read() == second[0].fp.read() == b"png"
+        assert first[0].filename == "chart.png"
+
+    def test_embeds_are_copies(self) -> None:
+        response = ChartResponse([Embed(title="a")])
+        (embed,) = response.get_embeds()
+        embed.title = "b"
+        assert response.embeds[0].title == "a"
+
+
+class TestFetch:
+    async def test_repeat_request_is_served_from_cache(self) -> None:
+        cache, build = ChartCache(), _Builder()
+        first = await cache.fetch("cmd", (), ("db_upkeep",), build)
+        second = await cache.fetch("cmd", (), ("db_upkeep",), build)
+        assert first is second
+        assert build.calls == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_arguments_and_fingerprint_are_part_of_the_key(self) -> None:
+        cache, build = ChartCache(), _Builder()
+        await cache.fetch("cmd", (1,), ("db_upkeep",), build)
+        await cache.fetch("cmd", (2,), ("db_upkeep",), build)
+        await cache.fetch("cmd", (1,), ("db_upkeep",), build, fingerprint=7)
+        await cache.fetch("other", (1,), ("db_upkeep",), build)
+        assert build.calls == 4
+
+    async def test_errors_are_not_cached(self) -> None:
+        cache = ChartCache()
+        calls = 0
+
+        async def broken() -> ChartResponse:
+            nonlocal calls
+            calls += 1
+            raise ValueError("no data")
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="no data"):
+                await cache.fetch("cmd", (), ("db_upkeep",), broken)
+        assert calls == 2
+
+    async def test_concurrent_requests_share_one_build(self) -> None:
+        cache = ChartCache()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow() -> ChartResponse:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return ChartResponse([Embed()])
+
+        tasks = [
+            asyncio.create_task(cache.fetch("cmd", (), ("db_upkeep",), slow))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        assert calls == 1
+        assert all(r is responses[0] for r in responses)
+
+
+class TestInvalidate:
+    async def test_drops_entries_built_from_source(self) -> None:
+        cache = ChartCache()
+        apr, states = _Builder("apr"), _Builder("states")
+        await cache.fetch("apr", (), ("reth_apr", "db_upkeep"), apr)
+        await cache.fetch("states", (), ("db_upkeep",), states)
+
+        cache.invalidate("reth_apr")
+        await cache.fetch("apr", (), ("reth_apr", "db_upkeep"), apr)
+        await cache.fetch("states", (), ("db_upkeep",), states)
+        assert (apr.calls, states.calls) == (2, 1)
+
+        cache.invalidate("db_upkeep")
+        await cache.fetch("apr", (), ("reth_apr", "db_upkeep"), apr)
+        await cache.fetch("states", (), ("db_upkeep",), states)
+        assert (apr.calls, states.calls) == (3, 2)
+
+    async def test_build_racing_invalidation_is_not_kept(self) -> None:
+        cache = ChartCache()
+        calls = 0
+
+        async def build() -> ChartResponse:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                cache.invalidate("proposals")
+            return ChartResponse([Embed()])
+
+        await cache.fetch("cmd", (), ("proposals",), build)
+        await cache.fetch("cmd", (), ("proposals",), build)
+        await cache.fetch("cmd", (), ("proposals",), build)
+        assert calls == 2
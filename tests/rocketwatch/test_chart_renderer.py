@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+from rocketwatch.plugins.rpl.charts import plot_staked_rpl
+from rocketwatch.utils.chart_renderer import ChartRenderer
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _line(values: list[float]) -> Figure:
+    fig, ax = plt.subplots()
+    ax.plot(values)
+    return fig
+
+
+def _threaded(**kwargs: Any) -> ChartRenderer:
+    renderer = ChartRenderer(**kwargs)
+    renderer._executor = ThreadPoolExecutor(max_workers=4)
+    return renderer
+
+
+class TestRender:
+    async def test_returns_png_bytes(self) -> None:
+        renderer = _threaded()
+        png = await renderer.render(_line, [1.0, 2.0, 3.0])
+        assert png.startswith(PNG_MAGIC)
+        renderer.shutdown()
+
+    async def test_closes_figure_after_encoding(self) -> None:
+        renderer = _threaded()
+        before = len(plt.get_fignums())
+        await renderer.render(_line, [1.0, 2.0])
+        assert len(plt.get_fignums()) == before
+        renderer.shutdown()
+
+    async def test_passes_savefig_kwargs(self) -> None:
+        renderer = _threaded()
+        small = await renderer.render(_line, [1.0], savefig_kwargs={"dpi": 20})
+        large = await renderer.render(_line, [1.0], savefig_kwargs={"dpi": 200})
+        assert len(small) < len(large)
+        renderer.shutdown()
+
+    async def test_render_file_uses_filename(self) -> None:
+        renderer = _threaded()
+        file = await renderer.render_file(_line, [1.0], filename="chart.png")
+        assert file.filename == "chart.png"
+        assert file.fp.read().startswith(PNG_MAGIC)
+        renderer.shutdown()
+
+    async def test_plot_errors_propagate(self) -> None:
+        def broken() -> Figure:
+            raise ValueError("bad data")
+
+        renderer = _threaded()
+        with pytest.raises(ValueError, match="bad data"):
+            await renderer.render(broken)
+        renderer.shutdown()
+
+
+class TestLimits:
+    async def test_times_out_slow_jobs(self) -> None:
+        release = threading.Event()
+
+        def slow() -> Figure:
+            release.wait(5)
+            return _line([1.0])
+
+        renderer = _threaded(timeout=0.05)
+        with pytest.raises(TimeoutError):
+            await renderer.render(slow)
+        release.set()
+        renderer.shutdown()
+
+    async def test_caps_concurrent_jobs(self) -> None:
+        running = peak = 0
+        lock = threading.Lock()
+
+        def tracked() -> Figure:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return _line([1.0])
+
+        renderer = _threaded(max_jobs=2)
+        await asyncio.gather(*(renderer.render(tracked) for _ in range(6)))
+        assert peak == 2
+        renderer.shutdown()
+
+
+class TestProcessPool:
+    async def test_renders_in_worker_process(self) -> None:
+        renderer = ChartRenderer(max_workers=1)
+        try:
+            png = await renderer.render(plot_staked_rpl, [4.0, 1.0, 0.5, 2.0])
+        finally:
+            renderer.shutdown()
+        assert png.startswith(PNG_MAGIC)
+
+    async def test_timeout_frees_the_worker(self) -> None:
+        renderer = ChartRenderer(max_workers=1, timeout=2)
+        executor = renderer._get_executor()
+        try:
+            with pytest.raises(TimeoutError):
+                await renderer.render(time.sleep, 60)
+            # the single worker would still be sleeping if the job kept running
+            renderer.timeout = 30
+            png = await renderer.render(plot_staked_rpl, [4.0, 1.0, 0.5, 2.0])
+            assert renderer._executor is executor
+        finally:
+            renderer.shutdown()
+        assert png.startswith(PNG_MAGIC)
@@ -0,0 +1,74 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rocketwatch.utils.coalesce import Coalescer
+
+
+class TestCoalescer:
+    async def test_concurrent_lookups_share_one_request(self) -> None:
+        pending: Coalescer[str] = Coalescer()
+
+        async def slow() -> int:
+            await asyncio.sleep(0.01)
+            return 1
+
+        fetch = AsyncMock(side_effect=slow)
+        results = await asyncio.gather(*[pending.run("a", fetch) for _ in range(3)])
+
+        assert results == [1, 1, 1]
+        fetch.assert_awaited_once()
+        assert "a" not in pending
+
+    async def test_errors_reach_every_waiter_and_are_not_kept(self) -> None:
+        pending: Coalescer[str] = Coalescer()
+
+        async def fail() -> int:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            pending.run("a", fail), pending.run("a", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await pending.run("a", AsyncMock(return_value=2)) == 2
+
+    async def test_cancelled_owner_releases_waiters(self) -> None:
+        pending: Coalescer[str] = Coalescer()
+        started = asyncio.Event()
+
+        async def hang() -> int:
+            started.set()
+            await asyncio.Event().wait()
+            return 1
+
+        owner = asyncio.create_task(pending.run("a", hang))
+        await started.wait()
+        waiter = asyncio.create_task(pending.run("a", hang))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert "a" not in pending
+
+    async def test_cancelled_waiter_keeps_the_request_running(self) -> None:
+        pending: Coalescer[str] = Coalescer()
+        release = asyncio.Event()
+
+        async def wait() -> int:
+            await release.wait()
+            return 1
+
+        owner = asyncio.create_task(pending.run("a", wait))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(pending.run("a", wait))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+
+        assert await owner == 1
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
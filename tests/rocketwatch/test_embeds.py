@@ -5,6 +5,7 @@ from discord import Color
 from ens import InvalidName
 
 from rocketwatch.utils import embeds
+from rocketwatch.utils.address_roles import AddressRoles
 from rocketwatch.utils.embeds import (
     CustomColors,
     Embed,
@@ -499,6 +500,34 @@ def explorer_mocks(monkeypatch, fake_ens_module):
     monkeypatch.setattr(embeds, "get_address_name", AsyncMock(return_value=None))
     monkeypatch.setattr(embeds, "get_pdao_delegates", AsyncMock(return_value={}))
 
+    async def fake_roles(addresses, block="latest"):
+        # Derive roles from the per-fact mocks above so tests can keep
+        # scripting them individually.
+        from web3.constants import ADDRESS_ZERO
+
+        roles = {}
+        for a in addresses:
+            node = await embeds.rp.is_node(a)
+            megapool = await embeds.rp.call("rocketNodeManager.getMegapoolAddress", a)
+            roles[a] = AddressRoles(
+                node=node,
+                megapool=await embeds.rp.is_megapool(a),
+                minipool=await embeds.rp.is_minipool(a),
+                contract=bool(await embeds.w3.eth.get_code(a)),
+                node_megapool=megapool if node and megapool != ADDRESS_ZERO else None,
+                smoothing_pool=node
+                and await embeds.rp.call(
+                    "rocketNodeManager.getSmoothingPoolRegistrationState", a
+                ),
+                odao_member_id=node
+                and await embeds.rp.call("rocketDAONodeTrusted.getMemberID", a),
+                security_member_id=node
+                and await embeds.rp.call("rocketDAOSecurity.getMemberID", a),
+            )
+        return roles
+
+    monkeypatch.setattr(embeds, "get_address_roles", fake_roles)
+
     from types import SimpleNamespace
 
     return SimpleNamespace(
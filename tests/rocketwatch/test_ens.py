@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from rocketwatch.utils import ens
+from tests.lib.scripted_rocketpool import ScriptedRocketPool, addr
+
+ALICE = addr("0xA11CE")
+BOB = addr("0xB0B")
+CAROL = addr("0xCA201")
+
+NAMES = {ALICE: "alice.eth", BOB: "", CAROL: "carol.eth"}
+
+
+@pytest.fixture
+def reverse_records(scripted_rp: ScriptedRocketPool) -> list[list[str]]:
+    """Script ReverseRecords.getNames and record the batches it is called with."""
+    batches: list[list[str]] = []
+
+    def get_names(batch: list[str]) -> list[str]:
+        batches.append(list(batch))
+        return [NAMES[a] for a in batch]
+
+    scripted_rp.set_call("ENSReverseRecords.getNames", get_names)
+    return batches
+
+
+class TestGetNames:
+    async def test_resolves_all_addresses_in_one_call(self, reverse_records):
+        names = await ens.get_names([ALICE, BOB, CAROL])
+        assert names == {ALICE: "alice.eth", BOB: None, CAROL: "carol.eth"}
+        assert reverse_records == [[ALICE, BOB, CAROL]]
+
+    async def test_large_lookups_are_split(self, reverse_records, monkeypatch):
+        monkeypatch.setattr(ens, "_BATCH_SIZE", 2)
+        await ens.get_names([ALICE, BOB, CAROL])
+        assert reverse_records == [[ALICE, BOB], [CAROL]]
+
+    async def test_results_are_cached_in_memory(self, reverse_records):
+        await ens.get_names([ALICE, BOB])
+        assert await ens.get_names([BOB, CAROL]) == {BOB: None, CAROL: "carol.eth"}
+        assert reverse_records == [[ALICE, BOB], [CAROL]]
+
+    async def test_results_are_persisted(self, reverse_records, _offline_ens_cache):
+        await ens.get_names([ALICE, BOB])
+        ops = _offline_ens_cache.bulk_write.await_args.args[0]
+        assert {op._filter["_id"] for op in ops} == {ALICE, BOB}
+
+    async def test_persisted_names_skip_the_chain(
+        self, reverse_records, _offline_ens_cache
+    ):
+        _offline_ens_cache.find.return_value.to_list = AsyncMock(
+            return_value=[{"_id": ALICE, "name": "stored.eth"}]
+        )
+        assert await ens.get_names([ALICE]) == {ALICE: "stored.eth"}
+        assert reverse_records == []
+
+    async def test_mongo_failure_falls_through_to_chain(
+        self, reverse_records, _offline_ens_cache
+    ):
+        _offline_ens_cache.find.side_effect = RuntimeError("mongo down")
+        _offline_ens_cache.bulk_write.side_effect = RuntimeError("mongo down")
+        assert await ens.get_names([ALICE]) == {ALICE: "alice.eth"}
+
+    async def test_falls_back_to_single_lookups(self, scripted_rp, monkeypatch):
+        scripted_rp.set_call(
+            "ENSReverseRecords.getNames", MagicMock(side_effect=RuntimeError("boom"))
+        )
+
+        async def lookup(address: str) -> str | None:
+            if address == BOB:
+                raise RuntimeError("rpc down")
+            return NAMES[address]
+
+        monkeypatch.setattr(ens, "_lookup_name", lookup)
+        names = await ens.get_names([ALICE, BOB])
+        assert names == {ALICE: "alice.eth", BOB: None}
+        # a failed lookup must not be cached as "no name"
+        assert BOB not in ens._names
+
+
+class TestGetName:
+    async def test_concurrent_lookups_share_one_call(self, reverse_records):
+        names = await asyncio.gather(
+            ens.get_name(ALICE), ens.get_name(BOB), ens.get_name(ALICE)
+        )
+        assert names == ["alice.eth", None, "alice.eth"]
+        assert reverse_records == [[ALICE, BOB]]
+
+
+class TestResolveName:
+    async def test_caches_successful_lookups(self, monkeypatch):
+        client = MagicMock()
+        client.address = AsyncMock(return_value=ALICE)
+        monkeypatch.setattr(ens, "_client", lambda: client)
+        assert await ens.resolve_name("alice.eth") == ALICE
+        assert await ens.resolve_name("alice.eth") == ALICE
+        client.address.assert_awaited_once_with("alice.eth")
+
+    async def test_failures_are_not_cached(self, monkeypatch):
+        client = MagicMock()
+        client.address = AsyncMock(side_effect=[RuntimeError("rpc down"), ALICE])
+        monkeypatch.setattr(ens, "_client", lambda: client)
+        assert await ens.resolve_name("alice.eth") is None
+        assert await ens.resolve_name("alice.eth") == ALICE
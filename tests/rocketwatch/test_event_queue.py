@@ -0,0 +1,115 @@
+import pickle
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from eth_typing import BlockNumber
+from PIL import Image as PillowImage
+
+from rocketwatch.utils.embeds import Embed
+from rocketwatch.utils.event import Event
+from rocketwatch.utils.event_queue import (
+    SCHEMA_VERSION,
+    decode_embed,
+    decode_image,
+    encode_event,
+    load_images,
+    store_images,
+)
+from rocketwatch.utils.image import Image
+
+
+def _image(color: tuple[int, int, int] = (255, 0, 0)) -> Image:
+    return Image(PillowImage.new("RGB", (4, 4), color=color))
+
+
+def _event(**overrides: object) -> Event:
+    embed = Embed(title="Deposit", description="32 ETH")
+    embed.add_field(name="Node", value="0xabc", inline=False)
+    fields: dict[str, object] = {
+        "embed": embed,
+        "topic": "topic",
+        "event_name": "deposit_event",
+        "unique_id": "id-1",
+        "block_number": cast(BlockNumber, 100),
+    }
+    fields.update(overrides)
+    return Event(**fields)  # type: ignore[arg-type]
+
+
+class TestEncodeEvent:
+    def test_document_is_versioned_and_pickle_free(self) -> None:
+        document, images = encode_event(_event(), channel_id=7)
+        assert document["schema"] == SCHEMA_VERSION
+        assert document["embed"]["title"] == "Deposit"
+        assert document["channel_id"] == 7
+        assert document["image"] is None
+        assert images == {}
+
+    def test_identical_images_are_stored_once(self) -> None:
+        document, images = encode_event(
+            _event(image=_image(), thumbnail=_image()), channel_id=7
+        )
+        assert document["image"] == document["thumbnail"]
+        assert list(images) == [document["image"]]
+
+    def test_embed_round_trip(self) -> None:
+        event = _event()
+        document, _ = encode_event(event, channel_id=7)
+        embed = decode_embed(document)
+        assert isinstance(embed, Embed)
+        assert embed.to_dict() == event.embed.to_dict()
+
+
+class TestDecode:
+    def test_legacy_pickled_rows_still_load(self) -> None:
+        event = _event()
+        image = _image()
+        entry = {
+            "_id": "id-1",
+            "embed": pickle.dumps(event.embed),
+            "image": pickle.dumps(image),
+            "thumbnail": None,
+        }
+        embed = decode_embed(entry)
+        assert embed is not None
+        assert embed.title == "Deposit"
+        assert decode_image(entry, "image", {}) == image.to_png()
+        assert decode_image(entry, "thumbnail", {}) is None
+
+    def test_versioned_image_resolves_from_store(self) -> None:
+        document, images = encode_event(_event(image=_image()), channel_id=7)
+        assert decode_image(document, "image", images) == images[document["image"]]
+
+    def test_missing_image_raises(self) -> None:
+        document, _ = encode_event(_event(image=_image()), channel_id=7)
+        with pytest.raises(KeyError):
+            decode_image(document, "image", {})
+
+
+class TestImageStore:
+    async def test_store_upserts_by_digest(self) -> None:
+        db = MagicMock()
+        db.event_images.bulk_write = AsyncMock()
+        await store_images(db, {"abc": b"png"})
+        requests = db.event_images.bulk_write.await_args.args[0]
+        assert len(requests) == 1
+        assert db.event_images.bulk_write.await_args.kwargs == {"ordered": False}
+
+    async def test_store_nothing_skips_db(self) -> None:
+        db = MagicMock()
+        db.event_images.bulk_write = AsyncMock()
+        await store_images(db, {})
+        db.event_images.bulk_write.assert_not_awaited()
+
+    async def test_load_fetches_referenced_images_in_one_query(self) -> None:
+        db = MagicMock()
+        db.event_images.find.return_value.to_list = AsyncMock(
+            return_value=[{"_id": "a", "data": b"png-a"}]
+        )
+        entries = [
+            {"_id": "1", "schema": SCHEMA_VERSION, "image": "a", "thumbnail": "a"},
+            {"_id": "2", "embed": b"legacy", "image": b"pickled"},
+        ]
+        assert await load_images(db, entries) == {"a": b"png-a"}
+        db.event_images.find.assert_called_once_with({"_id": {"$in": ["a"]}})
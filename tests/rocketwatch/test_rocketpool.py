@@ -1,8 +1,14 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from eth_abi import abi
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError
 
+from rocketwatch.utils import rocketpool
+from rocketwatch.utils.config import cfg
 from rocketwatch.utils.rocketpool import RocketPool
 
 
@@ -144,6 +150,185 @@ class TestMulticallShortCircuits:
         assert await rp_instance.multicall([]) == []
 
 
+class TestMulticallCache:
+    def _fn(self, address: str, data: bytes) -> MagicMock:
+        fn = MagicMock()
+        fn.address = address
+        fn._encode_transaction_data.return_value = data
+        fn.abi = {"outputs": [{"type": "uint256"}]}
+        return fn
+
+    def _rp(self, results: list[list[tuple[bool, bytes]]]) -> RocketPool:
+        rp_instance = RocketPool()
+        aggregate3 = MagicMock()
+        aggregate3.return_value.call = AsyncMock(side_effect=results)
+        rp_instance._multicall = MagicMock()
+        rp_instance._multicall.functions.aggregate3 = aggregate3
+        return rp_instance
+
+    async def test_only_uncached_calls_are_sent(self):
+        one, two = abi.encode(["uint256"], [1]), abi.encode(["uint256"], [2])
+        rp_instance = self._rp([[(True, one)], [(True, two)]])
+        a, b = self._fn("0xa", b"\x01"), self._fn("0xb", b"\x02")
+
+        assert await rp_instance.multicall([a], block=100) == [1]
+        assert await rp_instance.multicall([a, b], block=100) == [1, 2]
+
+        aggregate3 = rp_instance._multicall.functions.aggregate3
+        assert aggregate3.call_args_list[1].args[0] == [("0xb", False, b"\x02")]
+
+    async def test_fully_cached_multicall_skips_node(self):
+        one = abi.encode(["uint256"], [1])
+        rp_instance = self._rp([[(True, one)]])
+        a = self._fn("0xa", b"\x01")
+
+        await rp_instance.multicall([a], block=100)
+        assert await rp_instance.multicall([a], block=100) == [1]
+
+        rp_instance._multicall.functions.aggregate3.assert_called_once()
+
+    async def test_failed_calls_are_not_cached(self):
+        one = abi.encode(["uint256"], [1])
+        rp_instance = self._rp([[(False, b"")], [(True, one)]])
+        a = self._fn("0xa", b"\x01")
+
+        assert await rp_instance.multicall([a], require_success=False) == [None]
+        assert await rp_instance.multicall([a]) == [1]
+
+
+_ABI = [
+    {
+        "type": "function",
+        "name": "getAddress",
+        "stateMutability": "view",
+        "inputs": [{"name": "key", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "address"}],
+    }
+]
+_OWNER = "0x" + "ab" * 20
+
+
+def _contract():
+    return AsyncWeb3().eth.contract(
+        address=AsyncWeb3.to_checksum_address("0x" + "11" * 20), abi=_ABI
+    )
+
+
+def _contract_fn(key: int = 1):
+    return _contract().functions.getAddress(key)
+
+
+def _revert(reason: str) -> bytes:
+    return bytes.fromhex("08c379a0") + abi.encode(["string"], [reason])
+
+
+class TestCoalescedCalls:
+    @pytest.fixture
+    def coalescing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(cfg._instance.rocketpool, "coalesce_calls", True)
+
+    def _rp(self, monkeypatch: pytest.MonkeyPatch, results) -> RocketPool:
+        rp_instance = RocketPool()
+        aggregate3 = MagicMock()
+        aggregate3.return_value.call = AsyncMock(side_effect=results)
+        rp_instance._multicall = MagicMock()
+        rp_instance._multicall.functions.aggregate3 = aggregate3
+
+        async def resolve_function(path, args, address, mainnet):
+            return _contract(), path.rsplit(".", 1)[1], args
+
+        monkeypatch.setattr(rp_instance, "_resolve_function", resolve_function)
+        return rp_instance
+
+    def test_decodes_like_web3(self):
+        result = RocketPool._decode_call_result(
+            _contract_fn(), True, abi.encode(["address"], [_OWNER])
+        )
+        assert result == AsyncWeb3.to_checksum_address(_OWNER)
+
+    def test_revert_raises_contract_logic_error(self):
+        with pytest.raises(ContractLogicError, match="not allowed"):
+            RocketPool._decode_call_result(
+                _contract_fn(), False, _revert("not allowed")
+            )
+
+    async def test_concurrent_calls_share_one_multicall(
+        self, coalescing, monkeypatch: pytest.MonkeyPatch
+    ):
+        encoded = abi.encode(["address"], [_OWNER])
+        rp_instance = self._rp(
+            monkeypatch, [[(True, encoded), (False, _revert("nope"))]]
+        )
+
+        ok, failed = await asyncio.gather(
+            rp_instance.call("c.getAddress", 1),
+            rp_instance.call("c.getAddress", 2),
+            return_exceptions=True,
+        )
+
+        assert ok == AsyncWeb3.to_checksum_address(_OWNER)
+        assert isinstance(failed, ContractLogicError)
+        rp_instance._multicall.functions.aggregate3.assert_called_once()
+
+    async def test_failed_multicall_falls_back_to_single_calls(
+        self, coalescing, monkeypatch: pytest.MonkeyPatch
+    ):
+        rp_instance = self._rp(monkeypatch, RuntimeError("out of gas"))
+        single = AsyncMock(return_value="0xsingle")
+        monkeypatch.setattr(
+            "web3.contract.async_contract.AsyncContractFunction.call", single
+        )
+
+        results = await asyncio.gather(
+            rp_instance.call("c.getAddress", 1), rp_instance.call("c.getAddress", 2)
+        )
+
+        assert results == ["0xsingle", "0xsingle"]
+        assert single.await_count == 2
+
+    async def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch):
+        rp_instance = self._rp(monkeypatch, [])
+        single = AsyncMock(return_value="0xsingle")
+        monkeypatch.setattr(
+            "web3.contract.async_contract.AsyncContractFunction.call", single
+        )
+
+        await asyncio.gather(
+            rp_instance.call("c.getAddress", 1), rp_instance.call("c.getAddress", 2)
+        )
+
+        rp_instance._multicall.functions.aggregate3.assert_not_called()
+
+
+class TestContractCache:
+    def _rp(self, monkeypatch: pytest.MonkeyPatch) -> tuple[RocketPool, AsyncMock]:
+        rp_instance = RocketPool()
+        get_abi = AsyncMock(return_value=json.dumps(_ABI))
+        monkeypatch.setattr(rp_instance, "get_abi_by_name", get_abi)
+        monkeypatch.setattr(rocketpool, "w3", AsyncWeb3())
+        return rp_instance, get_abi
+
+    async def test_contracts_are_assembled_once(self, monkeypatch: pytest.MonkeyPatch):
+        rp_instance, get_abi = self._rp(monkeypatch)
+        address = AsyncWeb3.to_checksum_address("0x" + "11" * 20)
+
+        first = await rp_instance.assemble_contract("c", address)
+        second = await rp_instance.assemble_contract("c", address)
+
+        assert first is second
+        assert first.abi == _ABI
+        get_abi.assert_awaited_once()
+
+    async def test_abi_is_parsed_once_per_name(self, monkeypatch: pytest.MonkeyPatch):
+        rp_instance, get_abi = self._rp(monkeypatch)
+
+        a = await rp_instance.assemble_contract("c", "0x" + "11" * 20)
+        b = await rp_instance.assemble_contract("c", "0x" + "22" * 20)
+
+        assert a is not b
+        get_abi.assert_awaited_once()
+
+
 class TestGetRevertReason:
     async def test_joins_contract_logic_error_args(
         self, monkeypatch: pytest.MonkeyPatch
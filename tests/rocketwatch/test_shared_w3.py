@@ -4,17 +4,130 @@ Everything chain-touching is mocked: we exercise the fallback iteration logic,
 endpoint formatting, and the proxies' lazy-build-and-delegate behaviour.
 """
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from aiohttp import ClientResponseError, RequestInfo
 from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
 from web3.types import RPCEndpoint
+from yarl import URL
 
 from rocketwatch.utils import shared_w3 as sw
 from rocketwatch.utils.config import cfg
 
 
+def _http_error(status: int) -> ClientResponseError:
+    return ClientResponseError(
+        request_info=RequestInfo(
+            url=URL("http://x"),
+            method="GET",
+            headers={},  # type: ignore[arg-type]
+            real_url=URL("http://x"),
+        ),
+        history=(),
+        status=status,
+    )
+
+
+class TestEndpointPool:
+    async def test_routes_to_fastest_endpoint(self) -> None:
+        pool = sw.EndpointPool(["a", "b"], ["a", "b"])
+        pool.health[0].record_success(0.5)
+        pool.health[1].record_success(0.1)
+        called: list[str] = []
+
+        async def call(endpoint: str) -> str:
+            called.append(endpoint)
+            return endpoint
+
+        assert await pool.run(call) == "b"
+        assert called == ["b"]
+
+    async def test_repeated_failures_open_circuit(self) -> None:
+        pool = sw.EndpointPool(["a", "b"], ["a", "b"])
+        called: list[str] = []
+
+        async def call(endpoint: str) -> str:
+            called.append(endpoint)
+            if endpoint == "a":
+                raise RuntimeError("down")
+            return endpoint
+
+        for _ in range(sw.EndpointHealth.FAILURE_THRESHOLD):
+            await pool.run(call)
+        called.clear()
+
+        assert await pool.run(call) == "b"
+        assert called == ["b"]
+        assert not pool.health[0].healthy
+        assert pool.health[0].failures == sw.EndpointHealth.FAILURE_THRESHOLD
+
+    async def test_open_endpoints_still_tried_as_last_resort(self) -> None:
+        pool = sw.EndpointPool(["a"], ["a"])
+        pool.health[0].open_until = float("inf")
+
+        async def call(endpoint: str) -> str:
+            return endpoint
+
+        assert await pool.run(call) == "a"
+
+    async def test_success_after_cooldown_resets_failures(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        health = sw.EndpointHealth("a")
+        for _ in range(sw.EndpointHealth.FAILURE_THRESHOLD):
+            health.record_failure()
+        assert not health.healthy
+
+        monkeypatch.setattr(sw.time, "monotonic", lambda: health.open_until)
+        assert health.healthy
+        health.record_success(0.1)
+        assert health.consecutive_failures == 0
+
+    async def test_client_errors_are_raised_without_failover(self) -> None:
+        pool = sw.EndpointPool(["a", "b"], ["a", "b"])
+        called: list[str] = []
+
+        async def call(endpoint: str) -> str:
+            called.append(endpoint)
+            raise _http_error(404)
+
+        with pytest.raises(ClientResponseError):
+            await pool.run(call)
+        assert called == ["a"]
+        assert pool.health[0].failures == 0
+        assert pool.health[0].latency is not None
+
+    async def test_rpc_errors_are_raised_without_failover(self) -> None:
+        pool = sw.EndpointPool(["a", "b"], ["a", "b"])
+
+        async def call(endpoint: str) -> str:
+            raise Web3RPCError("execution reverted")
+
+        with pytest.raises(Web3RPCError):
+            await pool.run(call)
+        assert pool.health[0].failures == 0
+
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    async def test_throttling_and_server_errors_fail_over(self, status: int) -> None:
+        pool = sw.EndpointPool(["a", "b"], ["a", "b"])
+
+        async def call(endpoint: str) -> str:
+            if endpoint == "a":
+                raise _http_error(status)
+            return endpoint
+
+        assert await pool.run(call) == "b"
+        assert pool.health[0].failures == 1
+
+    def test_names_hide_url_paths(self) -> None:
+        bacon = sw.Bacon(["https://node.example/key123"])
+        assert bacon.pool.health[0].name == "node.example"
+
+
 class TestBacon:
     async def test_fallback_tries_next_url_on_failure(self) -> None:
         bacon = sw.Bacon(["http://a", "http://b"])
@@ -105,6 +218,93 @@ class TestAsyncFallbackProvider:
         assert await sw.AsyncFallbackProvider(providers).is_connected() is False
 
 
+class TestBatching:
+    def _provider(self, batch: Any) -> MagicMock:
+        provider = MagicMock()
+        provider.make_request = AsyncMock(return_value={"id": 0, "result": "single"})
+        provider.make_batch_request = (
+            AsyncMock(side_effect=batch)
+            if isinstance(batch, Exception)
+            else AsyncMock(side_effect=lambda reqs: batch(reqs))
+        )
+        return provider
+
+    @staticmethod
+    def _echo(requests: list[tuple[str, Any]]) -> list[dict[str, Any]]:
+        return [{"id": i, "result": m} for i, (m, _) in enumerate(requests)]
+
+    async def test_concurrent_calls_share_one_batch(self) -> None:
+        p1 = self._provider(self._echo)
+        fp = sw.AsyncFallbackProvider([p1], batch_window=0.01)
+
+        results = await asyncio.gather(
+            fp.make_request(RPCEndpoint("eth_chainId"), []),
+            fp.make_request(RPCEndpoint("eth_blockNumber"), []),
+        )
+
+        assert [r["result"] for r in results] == ["eth_chainId", "eth_blockNumber"]
+        p1.make_batch_request.assert_awaited_once()
+        p1.make_request.assert_not_awaited()
+
+    async def test_item_errors_stay_with_their_caller(self) -> None:
+        p1 = self._provider(
+            lambda reqs: [{"id": 0, "result": 1}, {"id": 1, "error": {"code": -1}}]
+        )
+        fp = sw.AsyncFallbackProvider([p1], batch_window=0.01)
+
+        ok, failed = await asyncio.gather(
+            fp.make_request(RPCEndpoint("eth_call"), []),
+            fp.make_request(RPCEndpoint("eth_call"), []),
+        )
+
+        assert ok == {"id": 0, "result": 1}
+        assert failed["error"] == {"code": -1}
+
+    async def test_failed_batch_moves_to_next_provider(self) -> None:
+        p1 = self._provider(RuntimeError("down"))
+        p2 = self._provider(self._echo)
+        fp = sw.AsyncFallbackProvider([p1, p2], batch_window=0.01)
+
+        results = await asyncio.gather(
+            *[fp.make_request(RPCEndpoint("eth_call"), []) for _ in range(3)]
+        )
+
+        assert len(results) == 3
+        p2.make_batch_request.assert_awaited_once()
+
+    async def test_rejected_batch_fails_every_caller(self) -> None:
+        p1 = self._provider(lambda reqs: {"error": {"message": "batch too large"}})
+        fp = sw.AsyncFallbackProvider([p1], batch_window=0.01)
+
+        results = await asyncio.gather(
+            fp.make_request(RPCEndpoint("eth_call"), []),
+            fp.make_request(RPCEndpoint("eth_call"), []),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_full_batch_is_sent_without_waiting(self) -> None:
+        p1 = self._provider(self._echo)
+        fp = sw.AsyncFallbackProvider([p1], batch_window=60, max_batch_size=2)
+
+        async with asyncio.timeout(1):
+            await asyncio.gather(
+                fp.make_request(RPCEndpoint("eth_call"), []),
+                fp.make_request(RPCEndpoint("eth_call"), []),
+            )
+
+    async def test_lone_call_uses_plain_request(self) -> None:
+        p1 = self._provider(self._echo)
+        fp = sw.AsyncFallbackProvider([p1], batch_window=0.01)
+
+        assert await fp.make_request(RPCEndpoint("eth_call"), []) == {
+            "id": 0,
+            "result": "single",
+        }
+        p1.make_batch_request.assert_not_awaited()
+
+
 class TestGetWeb3:
     def test_builds_async_web3(self) -> None:
         assert isinstance(sw._get_web3(["http://localhost"]), AsyncWeb3)
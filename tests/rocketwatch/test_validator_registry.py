@@ -0,0 +1,81 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from rocketwatch.utils.validator_registry import ValidatorRegistry
+
+NODE_A = "0x" + "a" * 40
+NODE_B = "0x" + "b" * 40
+
+
+def _db(
+    minipools: list[dict[str, Any]], megapool_validators: list[dict[str, Any]]
+) -> Any:
+    db = MagicMock()
+    for name, docs in (
+        ("minipools", minipools),
+        ("megapool_validators", megapool_validators),
+    ):
+        collection = getattr(db, name)
+        collection.find.return_value.to_list = AsyncMock(return_value=docs)
+    return db
+
+
+class TestValidatorRegistry:
+    async def test_maps_indices_from_both_collections(self) -> None:
+        registry = ValidatorRegistry()
+        await registry.refresh(
+            _db(
+                [{"validator_index": 1, "node_operator": NODE_A}],
+                [{"validator_index": 2, "node_operator": NODE_B}],
+            )
+        )
+        assert 1 in registry and 2 in registry
+        assert 3 not in registry
+        assert registry.get_node_operator(1) == NODE_A
+        assert registry.get_node_operator(2) == NODE_B
+        assert registry.get_node_operator(3) is None
+        assert len(registry) == 2
+
+    async def test_minipool_wins_on_duplicate_index(self) -> None:
+        registry = ValidatorRegistry()
+        await registry.refresh(
+            _db(
+                [{"validator_index": 7, "node_operator": NODE_A}],
+                [{"validator_index": 7, "node_operator": NODE_B}],
+            )
+        )
+        assert registry.get_node_operator(7) == NODE_A
+
+    async def test_membership_without_node_operator(self) -> None:
+        registry = ValidatorRegistry()
+        await registry.refresh(_db([{"validator_index": 5}], []))
+        assert 5 in registry
+        assert registry.get_node_operator(5) is None
+
+    async def test_ensure_loaded_only_queries_once(self) -> None:
+        registry = ValidatorRegistry()
+        db = _db([{"validator_index": 1, "node_operator": NODE_A}], [])
+        await registry.ensure_loaded(db)
+        await registry.ensure_loaded(db)
+        assert db.minipools.find.call_count == 1
+
+    async def test_refresh_replaces_previous_state(self) -> None:
+        registry = ValidatorRegistry()
+        await registry.refresh(
+            _db([{"validator_index": 1, "node_operator": NODE_A}], [])
+        )
+        await registry.refresh(
+            _db([{"validator_index": 2, "node_operator": NODE_A}], [])
+        )
+        assert 1 not in registry
+        assert 2 in registry
+
+    async def test_clear_forces_reload(self) -> None:
+        registry = ValidatorRegistry()
+        db = _db([{"validator_index": 1, "node_operator": NODE_A}], [])
+        await registry.ensure_loaded(db)
+        registry.clear()
+        assert 1 not in registry
+        await registry.ensure_loaded(db)
+        assert db.minipools.find.call_count == 2
+        assert 1 in registry
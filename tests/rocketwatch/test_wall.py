@@ -10,6 +10,7 @@ import pytest
 from matplotlib import figure
 from matplotlib import pyplot as plt
 
+from rocketwatch.plugins.wall.charts import plot_market_depth
 from rocketwatch.plugins.wall.wall import MarketConfig, Wall
 from tests.lib.discord_harness import make_bot, make_interaction
 
@@ -297,7 +298,7 @@ class TestGetDexData:
         assert [str(e) for e in result] == ["Has"]
 
 
-# --- _plot_data ------------------------------------------------------------
+# --- plot_market_depth -----------------------------------------------------
 
 
 def _exchange_series(name: str, color: str, n: int = 5) -> tuple[Any, np.ndarray]:
@@ -310,7 +311,15 @@ class TestPlotData:
     ) -> figure.Figure:
         x = np.linspace(1.0, 2.0, 5)
         fmt = Wall._get_formatter(".2f", prefix="$")
-        return Wall._plot_data(x, 1.5, cex, dex, _config(), fmt, fmt, fmt)
+        return plot_market_depth(
+            x,
+            1.5,
+            *Wall._label_depth_data(cex, dex),
+            _config().primary_prefix,
+            fmt,
+            fmt,
+            fmt,
+        )
 
     def test_renders_with_both_dex_and_cex(self) -> None:
         e1, y1 = _exchange_series("CexA", "#111")